@@ -0,0 +1,226 @@
+// Records every message under a topic filter into an append-only binary capture
+// (.mqcap) that python-try/mqtt_capture.py can memory-map and replay.
+//
+//   node mqtt-recorder.js [--url wss://...] [--filter v1/FY-Fab/#] [--out file.mqcap] [--duration 3600]
+//
+// Layout (little-endian):
+//   header   'MQCAP\0' u16 version, u64 created (µs since epoch)
+//   topic    u8 2, u32 id, u16 length, utf-8 name        (first time a topic is seen)
+//   message  u8 1, u64 timestamp µs, u32 topic id, u32 length, raw payload
+//   index    u8 3, u32 body length, body: u64 previous index offset (0 = none),
+//            u64 chunk start, u64 first ts, u64 last ts, u32 messages,
+//            u32 n, n x (u32 id, u16 length, name)        topics first seen in the chunk
+//            u32 m, m x (u32 id, u32 count)               messages per topic in the chunk
+//   trailer  'MQCAPEND' u64 last index offset, u64 total messages (clean shutdown only)
+// An index follows every chunk of messages; the trailer lets a reader walk the
+// index chain backwards without scanning. A capture cut short by a crash is
+// still readable record by record up to the last complete message.
+
+const fs = require('fs');
+
+const BROKER_URL = 'wss://broker.hivemq.com:8884/mqtt';
+const TOPIC_FILTER = 'v1/FY-Fab/#';
+
+const MAGIC = Buffer.from('MQCAP\0', 'latin1');
+const TRAILER_MAGIC = Buffer.from('MQCAPEND', 'latin1');
+const VERSION = 1;
+const RECORD_MESSAGE = 1;
+const RECORD_TOPIC = 2;
+const RECORD_INDEX = 3;
+
+const CHUNK_MESSAGES = 4096;       // index at least this often...
+const CHUNK_MS = 10000;            // ...and at least every 10 seconds
+const FLUSH_BYTES = 1024 * 1024;   // write to disk in ~1MB batches
+const FLUSH_MS = 1000;
+
+const nowMicros = () => Math.round((performance.timeOrigin + performance.now()) * 1000);
+
+class CaptureWriter {
+  constructor(path) {
+    this.fd = fs.openSync(path, 'wx');
+    this.position = 0;
+    this.pending = [];
+    this.pendingBytes = 0;
+    this.topics = new Map();
+    this.total = 0;
+    this.lastIndex = 0;
+    this.startChunk();
+
+    const header = Buffer.alloc(16);
+    MAGIC.copy(header, 0);
+    header.writeUInt16LE(VERSION, 6);
+    header.writeBigUInt64LE(BigInt(nowMicros()), 8);
+    this.append(header);
+    this.chunkStart = this.position;
+  }
+
+  startChunk() {
+    this.chunkStart = this.position;
+    this.chunkCount = 0;
+    this.chunkFirst = 0;
+    this.chunkLast = 0;
+    this.chunkOpened = Date.now();
+    this.chunkTopics = [];
+    this.chunkCounts = new Map();
+  }
+
+  append(buffer) {
+    this.pending.push(buffer);
+    this.pendingBytes += buffer.length;
+    this.position += buffer.length;
+    if (this.pendingBytes >= FLUSH_BYTES) this.flush();
+  }
+
+  flush() {
+    if (this.pendingBytes === 0) return;
+    fs.writeSync(this.fd, Buffer.concat(this.pending, this.pendingBytes));
+    this.pending = [];
+    this.pendingBytes = 0;
+  }
+
+  topicId(topic) {
+    let id = this.topics.get(topic);
+    if (id !== undefined) return id;
+
+    id = this.topics.size;
+    this.topics.set(topic, id);
+    this.chunkTopics.push(topic);
+    const name = Buffer.from(topic, 'utf8');
+    const record = Buffer.alloc(7);
+    record.writeUInt8(RECORD_TOPIC, 0);
+    record.writeUInt32LE(id, 1);
+    record.writeUInt16LE(name.length, 5);
+    this.append(record);
+    this.append(name);
+    return id;
+  }
+
+  write(topic, payload, timestamp = nowMicros()) {
+    const id = this.topicId(topic);
+    const header = Buffer.alloc(17);
+    header.writeUInt8(RECORD_MESSAGE, 0);
+    header.writeBigUInt64LE(BigInt(timestamp), 1);
+    header.writeUInt32LE(id, 9);
+    header.writeUInt32LE(payload.length, 13);
+    this.append(header);
+    this.append(payload);
+
+    if (this.chunkCount === 0) this.chunkFirst = timestamp;
+    this.chunkLast = timestamp;
+    this.chunkCount++;
+    this.chunkCounts.set(id, (this.chunkCounts.get(id) || 0) + 1);
+    this.total++;
+
+    if (this.chunkCount >= CHUNK_MESSAGES || Date.now() - this.chunkOpened >= CHUNK_MS) {
+      this.writeIndex();
+    }
+  }
+
+  writeIndex() {
+    if (this.chunkCount === 0) return;
+
+    const names = this.chunkTopics.map((topic) => [this.topics.get(topic), Buffer.from(topic, 'utf8')]);
+    let length = 36 + 4 + 4 + this.chunkCounts.size * 8;
+    for (const [, name] of names) length += 6 + name.length;
+
+    const body = Buffer.alloc(length);
+    let offset = 0;
+    offset = body.writeBigUInt64LE(BigInt(this.lastIndex), offset);
+    offset = body.writeBigUInt64LE(BigInt(this.chunkStart), offset);
+    offset = body.writeBigUInt64LE(BigInt(this.chunkFirst), offset);
+    offset = body.writeBigUInt64LE(BigInt(this.chunkLast), offset);
+    offset = body.writeUInt32LE(this.chunkCount, offset);
+    offset = body.writeUInt32LE(names.length, offset);
+    for (const [id, name] of names) {
+      offset = body.writeUInt32LE(id, offset);
+      offset = body.writeUInt16LE(name.length, offset);
+      offset += name.copy(body, offset);
+    }
+    offset = body.writeUInt32LE(this.chunkCounts.size, offset);
+    for (const [id, count] of this.chunkCounts) {
+      offset = body.writeUInt32LE(id, offset);
+      offset = body.writeUInt32LE(count, offset);
+    }
+
+    const header = Buffer.alloc(5);
+    header.writeUInt8(RECORD_INDEX, 0);
+    header.writeUInt32LE(body.length, 1);
+    this.lastIndex = this.position;
+    this.append(header);
+    this.append(body);
+    this.startChunk();
+  }
+
+  close() {
+    this.writeIndex();
+    const trailer = Buffer.alloc(24);
+    TRAILER_MAGIC.copy(trailer, 0);
+    trailer.writeBigUInt64LE(BigInt(this.lastIndex), 8);
+    trailer.writeBigUInt64LE(BigInt(this.total), 16);
+    this.append(trailer);
+    this.flush();
+    fs.closeSync(this.fd);
+  }
+}
+
+function parseArgs(argv) {
+  const stamp = new Date().toISOString().replace(/[-:]/g, '').replace(/\..*/, '');
+  const args = { url: BROKER_URL, filter: TOPIC_FILTER, out: `capture-${stamp}.mqcap`, duration: 0 };
+  for (let i = 0; i < argv.length; i += 2) {
+    const key = argv[i].replace(/^--/, '');
+    if (!(key in args)) throw new Error(`Unknown option ${argv[i]}`);
+    args[key] = key === 'duration' ? Number(argv[i + 1]) : argv[i + 1];
+  }
+  return args;
+}
+
+function main() {
+  const mqtt = require('mqtt');
+  const args = parseArgs(process.argv.slice(2));
+  const writer = new CaptureWriter(args.out);
+
+  console.log('Connecting to MQTT broker...');
+  const client = mqtt.connect(args.url);
+
+  client.on('connect', () => {
+    console.log('Connected to broker');
+    client.subscribe(args.filter, { qos: 0 }, (err) => {
+      if (err) {
+        console.error('Subscription error:', err);
+      } else {
+        console.log(`Recording ${args.filter} to ${args.out}` +
+          (args.duration > 0 ? ` for ${args.duration} seconds...` : ' until interrupted...'));
+      }
+    });
+  });
+
+  client.on('message', (topic, message) => {
+    writer.write(topic, message);
+  });
+
+  client.on('error', (err) => {
+    console.error('MQTT error:', err);
+  });
+
+  const flusher = setInterval(() => writer.flush(), FLUSH_MS);
+  let stopped = false;
+  const stop = () => {
+    if (stopped) return;
+    stopped = true;
+    clearInterval(flusher);
+    writer.close();
+    console.log(`\nRecorded ${writer.total} messages on ${writer.topics.size} topics to ${args.out}`);
+    client.end();
+    process.exit(0);
+  };
+
+  process.on('SIGINT', stop);
+  process.on('SIGTERM', stop);
+  if (args.duration > 0) setTimeout(stop, args.duration * 1000);
+}
+
+module.exports = { CaptureWriter };
+
+if (require.main === module) {
+  main();
+}
@@ -7,36 +7,243 @@ based on specifications in the artifacts directory.
 
 import os
 import sys
+import argparse
 import json
 import subprocess
 import time
 import re
+import hashlib
+import errno
+import threading
+import platform
+import tempfile
+from collections import Counter, deque
+from urllib.parse import urlsplit
+import queue
+import atexit
+import signal
+import functools
+import inspect
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import (ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED,
+                                as_completed, wait)
 from typing import Dict, List, Any
 from datetime import datetime
 from pathlib import Path
 import shutil
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+def cache_home() -> str:
+    """Root of the persistent caches; read at use so GEN_APP_CACHE can change after import"""
+    return os.environ.get('GEN_APP_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'gen-app'))
+
+TEMPLATE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class LogSink:
+    """Log file kept open across writes, rotated by size"""
+
+    def __init__(self, path: str, formatter, max_bytes: int = 0, backup_count: int = 3):
+        self.path = path
+        self.formatter = formatter
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.file = open(path, 'a', encoding='utf-8')
+        self.size = self.file.tell()
+
+    def _rotate(self):
+        self.file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.size = 0
+
+    def write(self, text: str):
+        size = len(text.encode('utf-8'))
+        if self.max_bytes and self.size and self.size + size > self.max_bytes:
+            self._rotate()
+        self.file.write(text)
+        self.size += size
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
 class Logger:
-    """Enhanced logger for detailed workflow tracking"""
+    """Enhanced logger for detailed workflow tracking
+
+    Records are level-gated in the caller and formatted, printed and written by a
+    background thread, so payloads are only serialized when the level is enabled.
+    """
 
-    def __init__(self, log_file: str = "workflow.log"):
+    LEVELS = {'DEBUG': 10, 'INFO': 20, 'STEP': 20, 'SUCCESS': 20, 'WARNING': 30, 'ERROR': 40}
+    LEVEL_ALIASES = {'WARN': 'WARNING'}
+
+    def __init__(self, log_file: str = "workflow.log", level: str = 'INFO',
+                 json_file: str = None, max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 3, console: bool = True):
         self.log_file = log_file
         self.start_time = time.time()
+        self.level = self.level_value(level)
+        self.console = console
+
+        self._sinks = [LogSink(log_file, self._format_text, max_bytes, backup_count)]
+        if json_file:
+            self._sinks.append(LogSink(json_file, self._format_json, max_bytes, backup_count))
+
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._drain, name='log-writer', daemon=True)
+        self._writer.start()
+        # Unregistered in close(), so closed per-job loggers are not kept alive until exit
+        atexit.register(self.close)
+
+    @classmethod
+    def level_value(cls, level: str) -> int:
+        """Threshold for a level name, case-insensitive; ValueError naming the choices otherwise"""
+        name = level.strip().upper()
+        name = cls.LEVEL_ALIASES.get(name, name)
+        if name not in cls.LEVELS:
+            raise ValueError(f"Unknown log level {level!r}, expected one of "
+                             f"{', '.join(list(cls.LEVELS) + list(cls.LEVEL_ALIASES))}")
+        return cls.LEVELS[name]
+
+    def enabled(self, level: str) -> bool:
+        return self.LEVELS[level] >= self.level
 
     def log(self, level: str, message: str, data: Any = None):
-        """Log message with timestamp and optional data"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        elapsed = f"{time.time() - self.start_time:.2f}s"
+        """Log message with timestamp and optional data
+
+        data may be a callable, evaluated only if the level is enabled.
+        """
+        if self.LEVELS[level] < self.level or self._closed:
+            return
+        if callable(data):
+            data = data()
+        self._queue.put((time.time(), level, message, data))
+
+    @staticmethod
+    def _data_text(data: Any) -> str:
+        return json.dumps(data, indent=2, default=str)
+
+    def _format_text(self, record) -> str:
+        created, level, message, data = record
+        timestamp = datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S")
+        elapsed = f"{created - self.start_time:.2f}s"
 
         log_entry = f"[{timestamp}] [{elapsed}] [{level}] {message}"
 
         if data:
-            log_entry += f"\n    Data: {json.dumps(data, indent=2, default=str)}"
+            log_entry += f"\n    Data: {self._data_text(data)}"
+
+        return log_entry + "\n"
+
+    def _format_json(self, record) -> str:
+        created, level, message, data = record
+        return json.dumps({
+            'timestamp': datetime.fromtimestamp(created).isoformat(),
+            'elapsed': round(created - self.start_time, 3),
+            'level': level,
+            'message': message,
+            'data': data
+        }, ensure_ascii=False, default=str) + "\n"
+
+    def _drain(self):
+        """Writer thread: handle everything queued, then flush once per batch"""
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            waiters = []
+            try:
+                for item in batch:
+                    if item is None:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        for sink in self._sinks:
+                            self._write(sink, item)
+
+                for sink in self._sinks:
+                    self._guarded(sink.flush)
+                if self.console:
+                    self._guarded(sys.stdout.flush)
+            finally:
+                # Whatever failed above, nobody stays blocked in flush() or close()
+                for waiter in waiters:
+                    waiter.set()
+            if stop:
+                return
+
+    def _write(self, sink: 'LogSink', record):
+        """One record to one sink; a failure loses that record, not the writer thread"""
+        try:
+            text = sink.formatter(record)
+            sink.write(text)
+            if self.console and sink is self._sinks[0]:
+                sys.stdout.write(text)
+        except Exception as e:
+            self._report(e, record)
 
-        print(log_entry)
+    def _guarded(self, fn):
+        try:
+            fn()
+        except Exception as e:
+            self._report(e)
 
-        with open(self.log_file, 'a') as f:
-            f.write(log_entry + "\n")
+    @staticmethod
+    def _report(error: Exception, record=None):
+        try:
+            message = f" ({record[2]!r})" if record else ""
+            sys.stderr.write(f"log writer: {type(error).__name__}: {error}{message}\n")
+        except Exception:
+            pass
+
+    def flush(self):
+        """Block until every record logged so far has been written"""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(None)
+        self._writer.join()
+        for sink in self._sinks:
+            self._guarded(sink.close)
+
+    def debug(self, message: str, data: Any = None):
+        self.log("DEBUG", message, data)
 
     def info(self, message: str, data: Any = None):
         self.log("INFO", message, data)
@@ -44,21 +251,416 @@ class Logger:
     def success(self, message: str, data: Any = None):
         self.log("SUCCESS", f"✅ {message}", data)
 
+    def warning(self, message: str, data: Any = None):
+        self.log("WARNING", f"⚠️  {message}", data)
+
     def error(self, message: str, data: Any = None):
         self.log("ERROR", f"❌ {message}", data)
 
     def step(self, message: str):
         self.log("STEP", f"▶️  {message}")
 
+class Tracer:
+    """Nested spans with wall/CPU time, child rusage and tracemalloc peaks
+
+    Child-process rusage and tracemalloc are process-wide, so spans that overlap
+    on other threads see each other's subprocesses and allocations.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.t0 = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[Dict]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @staticmethod
+    def _children_cpu():
+        if resource is None:
+            return 0.0, 0
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime, usage.ru_maxrss
+
+    @contextmanager
+    def span(self, name: str, category: str = 'method', **args):
+        """Time a block; nested spans on the same thread become children"""
+        stack = self._stack()
+        child_cpu_start, _ = self._children_cpu()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+        record = {
+            'name': name,
+            'category': category,
+            'args': args,
+            'tid': threading.get_native_id(),
+            'depth': len(stack),
+            'start': time.perf_counter() - self.t0,
+            'child_peak': 0
+        }
+        cpu_start = time.thread_time()
+        stack.append(record)
+        try:
+            yield record
+        finally:
+            stack.pop()
+            record['wall'] = time.perf_counter() - self.t0 - record['start']
+            record['cpu'] = time.thread_time() - cpu_start
+            child_cpu_end, child_maxrss = self._children_cpu()
+            record['child_cpu'] = child_cpu_end - child_cpu_start
+            record['child_maxrss_kb'] = child_maxrss
+
+            # reset_peak() in a child span wipes the parent's peak, so children
+            # hand their peak up explicitly
+            peak = 0
+            if tracemalloc.is_tracing():
+                peak = max(tracemalloc.get_traced_memory()[1], record['child_peak'])
+            record['mem_peak'] = peak
+            if stack:
+                stack[-1]['child_peak'] = max(stack[-1]['child_peak'], peak)
+
+            with self._lock:
+                self.spans.append(record)
+
+    def traced(self, name: str = None, category: str = 'method'):
+        """Decorator form of span(), named after the function by default"""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def export_chrome(self, path: str):
+        """Write spans as Chrome trace-event JSON (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        events = []
+        for span in sorted(self.spans, key=lambda s: s['start']):
+            events.append({
+                'name': span['name'],
+                'cat': span['category'],
+                'ph': 'X',
+                'ts': round(span['start'] * 1e6),
+                'dur': round(span['wall'] * 1e6),
+                'pid': pid,
+                'tid': span['tid'],
+                'args': {
+                    **{k: str(v) for k, v in span['args'].items()},
+                    'cpu_ms': round(span['cpu'] * 1000, 3),
+                    'child_cpu_ms': round(span['child_cpu'] * 1000, 3),
+                    'child_maxrss_kb': span['child_maxrss_kb'],
+                    'mem_peak_kb': round(span['mem_peak'] / 1024, 1)
+                }
+            })
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def summary(self) -> str:
+        """Per-span-name totals, slowest first"""
+        totals = {}
+        for span in self.spans:
+            entry = totals.setdefault(span['name'], {
+                'category': span['category'], 'count': 0, 'wall': 0.0,
+                'cpu': 0.0, 'child_cpu': 0.0, 'mem_peak': 0
+            })
+            entry['count'] += 1
+            entry['wall'] += span['wall']
+            entry['cpu'] += span['cpu']
+            entry['child_cpu'] += span['child_cpu']
+            entry['mem_peak'] = max(entry['mem_peak'], span['mem_peak'])
+
+        lines = [f"{'span':<48} {'cat':<10} {'n':>3} {'wall':>8} {'cpu':>8} {'child':>8} {'peak':>9}"]
+        for name, t in sorted(totals.items(), key=lambda item: -item[1]['wall']):
+            lines.append(f"{name[:48]:<48} {t['category']:<10} {t['count']:>3} "
+                         f"{t['wall']:>7.2f}s {t['cpu']:>7.2f}s {t['child_cpu']:>7.2f}s "
+                         f"{t['mem_peak'] / 1024:>7.0f}KB")
+        return "\n".join(lines)
+
+tracer = Tracer()
+
+class TopicTrieNode:
+    """One path segment in the topic trie"""
+
+    __slots__ = ('children', 'topic_id')
+
+    def __init__(self):
+        self.children = {}
+        self.topic_id = None
+
+class TopicIndex:
+    """UNS topic catalogue held as a segment trie with secondary indexes
+
+    Wildcard and prefix queries walk only the matching branches of the trie;
+    site/area/station/type/field lookups are dict hits on posting sets.
+    """
+
+    STATION_SEGMENT = re.compile(r'([A-Z]+)\d+')
+
+    def __init__(self):
+        self.topics = []
+        self.root = TopicTrieNode()
+        self.by_site = {}
+        self.by_area = {}
+        self.by_station = {}
+        self.by_type = {}
+        self.by_field = {}
+
+    @classmethod
+    def load(cls, path: str) -> 'TopicIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            catalogue = json.load(f)
+        index = cls()
+        for topic in catalogue.get('topics', []):
+            index.add(topic)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.topics)
+
+    @staticmethod
+    def _post(index: Dict[str, set], key: str, topic_id: int):
+        index.setdefault(key, set()).add(topic_id)
+
+    def add(self, topic: Dict[str, Any]) -> int:
+        """Index one catalogue entry; paths look like v1/<site>/<area>/[<station>/]..."""
+        topic_id = len(self.topics)
+        self.topics.append(topic)
+        segments = topic['path'].split('/')
+
+        node = self.root
+        for segment in segments:
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = TopicTrieNode()
+            node = child
+        node.topic_id = topic_id
+
+        if len(segments) > 1:
+            self._post(self.by_site, segments[1], topic_id)
+        if len(segments) > 2:
+            self._post(self.by_area, segments[2], topic_id)
+        if len(segments) > 3 and self.STATION_SEGMENT.fullmatch(segments[3]):
+            self._post(self.by_station, segments[3], topic_id)
+        self._post(self.by_type, topic.get('type', 'unknown'), topic_id)
+        template = topic.get('template')
+        if isinstance(template, dict):
+            for field in template:
+                self._post(self.by_field, field, topic_id)
+
+        return topic_id
+
+    def _collect(self, node: TopicTrieNode, out: List[int]):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.topic_id is not None:
+                out.append(node.topic_id)
+            stack.extend(node.children.values())
+
+    def match_ids(self, pattern: str) -> List[int]:
+        """Topic ids matching an MQTT filter with + (one level) and # (rest) wildcards"""
+        segments = pattern.split('/')
+        out = []
+        frontier = [self.root]
+        for i, segment in enumerate(segments):
+            if segment == '#':
+                for node in frontier:
+                    self._collect(node, out)
+                return sorted(out)
+            if segment == '+':
+                frontier = [child for node in frontier for child in node.children.values()]
+            else:
+                frontier = [node.children[segment] for node in frontier if segment in node.children]
+            if not frontier:
+                return []
+        return sorted(node.topic_id for node in frontier if node.topic_id is not None)
+
+    def match(self, pattern: str) -> List[Dict[str, Any]]:
+        return [self.topics[i] for i in self.match_ids(pattern)]
+
+    def prefix(self, prefix: str) -> List[Dict[str, Any]]:
+        """All topics at or below a path prefix"""
+        return self.match(prefix.rstrip('/') + '/#')
+
+    def query(self, pattern: str = None, site: str = None, area: str = None,
+              station: str = None, topic_type: str = None, field: str = None) -> List[Dict[str, Any]]:
+        """Intersect any combination of filters, smallest posting set first"""
+        candidates = []
+        for index, key in ((self.by_site, site), (self.by_area, area), (self.by_station, station),
+                           (self.by_type, topic_type), (self.by_field, field)):
+            if key is not None:
+                candidates.append(index.get(key, set()))
+        if pattern is not None:
+            candidates.append(set(self.match_ids(pattern)))
+
+        if not candidates:
+            return list(self.topics)
+
+        candidates.sort(key=len)
+        ids = set(candidates[0])
+        for other in candidates[1:]:
+            ids &= other
+            if not ids:
+                break
+        return [self.topics[i] for i in sorted(ids)]
+
+    def stations(self) -> List[str]:
+        return sorted(self.by_station)
+
+    def station_prefixes(self) -> List[str]:
+        return sorted({self.STATION_SEGMENT.fullmatch(s).group(1) for s in self.by_station})
+
+    def site_prefix(self) -> str:
+        """Version/site prefix shared by most topics, e.g. v1/FY-Fab"""
+        counts = Counter('/'.join(t['path'].split('/')[:2]) for t in self.topics)
+        return counts.most_common(1)[0][0] if counts else None
+
+class SpecScanner:
+    """Single-pass, chunked entity extraction from specification files
+
+    Files are read in fixed-size chunks cut at line boundaries and matched against
+    one precompiled alternation, so memory stays bounded by the chunk size and
+    time is linear in the input.
+    """
+
+    CHUNK_SIZE = 1 << 20
+    # Longest entity we expect to straddle a chunk cut when a line has no newline
+    OVERLAP = 512
+    # Bytes an entity can contain; a cut is only safe right after some other byte
+    ENTITY_BYTES = frozenset(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-.+#*/:')
+
+    def __init__(self, station_prefixes: List[str]):
+        prefixes = sorted(set(station_prefixes), key=len, reverse=True)
+        self.equipment_pattern = re.compile(
+            rb'\b(?:' + b'|'.join(re.escape(p.encode('ascii')) for p in prefixes) + rb')\d+')
+
+        # Every entity starts with one of a few ASCII letters. Matching that lead
+        # byte first and dispatching on it with lookbehinds lets the engine skip
+        # the (mostly CJK) text in between several times faster than a plain
+        # alternation of the three patterns would.
+        first_letters = {}
+        for prefix in prefixes:
+            first_letters.setdefault(prefix[0], []).append(prefix[1:])
+        lead_chars = b''.join(re.escape(c.encode('ascii')) for c in sorted({'w', 'v'} | set(first_letters)))
+        lead = b'[' + lead_chars + b']'
+
+        station_alternatives = [
+            b'(?<=' + re.escape(first.encode('ascii')) + b')(?:'
+            + b'|'.join(re.escape(rest.encode('ascii')) for rest in rests) + b')'
+            for first, rests in sorted(first_letters.items())
+        ]
+
+        self.pattern = re.compile(
+            lead + rb'(?<![A-Za-z0-9_]' + lead + rb')(?:'
+            rb'(?<=w)(?P<broker_url>ss?://[A-Za-z0-9.\-]+(?::\d+)?/mqtt)'
+            rb'|(?<=v)(?P<topic>\d+/[A-Za-z0-9_\-]+(?:/[A-Za-z0-9_\-.+#*]+)*)'
+            rb'|(?P<equipment>(?:' + b'|'.join(station_alternatives) + rb')\d+)'
+            rb')'
+        )
+
+    def _scan_range(self, buf: bytes, end: int, found: Dict[str, set]):
+        equipment_pattern = self.equipment_pattern
+        for match in self.pattern.finditer(buf, 0, end):
+            # The lead byte sits outside the named group; take the whole match
+            kind = match.lastgroup
+            value = match.group()
+            found[kind].add(value)
+            # Topics swallow the station segment; pick equipment back out of them
+            if kind == 'topic':
+                found['equipment'].update(equipment_pattern.findall(value))
+
+    def _safe_cut(self, buf: bytes, cut: int) -> int:
+        for pos in range(cut, max(cut - self.OVERLAP, 0), -1):
+            if buf[pos - 1] not in self.ENTITY_BYTES:
+                return pos
+        # No separator nearby: an entity longer than OVERLAP, which we don't expect
+        return cut
+
+    def scan(self, file_path: str) -> Dict[str, Any]:
+        """Scan one file, returning line/byte counts and sorted unique entities"""
+        found = {'broker_url': set(), 'topic': set(), 'equipment': set()}
+        lines = 1
+        size = 0
+        carry = b''
+
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(self.CHUNK_SIZE)
+                size += len(chunk)
+                buf = carry + chunk if carry else chunk
+                if not chunk:
+                    self._scan_range(buf, len(buf), found)
+                    break
+
+                lines += chunk.count(b'\n')
+                cut = buf.rfind(b'\n') + 1
+                if cut == 0:
+                    # One very long line: cut before the last OVERLAP bytes, backed up
+                    # to a byte no entity contains so no match is split. The rest is
+                    # scanned with the next chunk.
+                    cut = self._safe_cut(buf, max(len(buf) - self.OVERLAP, 0))
+                self._scan_range(buf, cut, found)
+                carry = buf[cut:]
+
+        return {
+            'lines': lines,
+            'bytes': size,
+            'equipment': sorted(v.decode('ascii') for v in found['equipment']),
+            'broker_urls': sorted(v.decode('ascii') for v in found['broker_url']),
+            'topics': sorted(v.decode('ascii') for v in found['topic'])
+        }
+
 class ArtifactsAnalyzer:
     """Analyzes markdown specifications to extract dashboard requirements"""
 
-    def __init__(self, logger: Logger):
+    # Used only when the artifacts carry no UNS catalogue
+    DEFAULT_STATION_PREFIXES = ['LASER', 'BEND', 'COAT', 'ASSY', 'CUT', 'CH', 'TR', 'HT']
+
+    # Topic filters (below the site prefix) each generated component consumes
+    COMPONENT_TOPICS = {
+        'KPICards': ['sched/state/queue-snapshot'],
+        'EquipmentGrid': ['+/+/state/current-job', '+/+/state/queue', '+/+/state/batch-status'],
+        'AlertsPanel': ['+/+/state/clean-status', '+/+/state/current-mold'],
+        'ScheduleView': ['sched/state/plan-draft', 'erp/state/order-registry'],
+        'ControlPanel': ['+/+/action/#'],
+        'MetricTrends': ['+/+/metrics/#']
+    }
+
+    def __init__(self, logger: Logger, cache: 'AnalysisCache' = None):
         self.logger = logger
         self.specs = {}
+        self.cache = cache
+        self.cache_key = None
+        self.uns_path = None
+        self._topic_index = None
+        self._cached_result = None
+        self.station_prefixes = list(self.DEFAULT_STATION_PREFIXES)
+
+    @property
+    def topic_index(self) -> TopicIndex:
+        """UNS catalogue index, loaded on first use; cache hits may never need it"""
+        if self._topic_index is None:
+            self._topic_index = TopicIndex()
+            if self.uns_path:
+                self._topic_index = TopicIndex.load(self.uns_path)
+                self.station_prefixes = (self._topic_index.station_prefixes()
+                                         or list(self.DEFAULT_STATION_PREFIXES))
+                self.logger.info("Loaded UNS catalogue", {
+                    "topics": len(self._topic_index),
+                    "stations": len(self._topic_index.by_station)
+                })
+        return self._topic_index
 
+    @tracer.traced()
     def read_artifacts(self, artifacts_dir: str) -> Dict[str, Any]:
-        """Read and parse all specification files"""
+        """Scan all specification files in one streaming pass each"""
         self.logger.step("Reading artifacts from directory")
 
         spec_files = {
@@ -67,22 +669,67 @@ class ArtifactsAnalyzer:
             'product_config': 'product_config_spec.md'
         }
 
+        uns_path = os.path.join(artifacts_dir, 'uns.json')
+        self.uns_path = uns_path if os.path.exists(uns_path) else None
+        self._topic_index = None
+        if not self.uns_path:
+            self.logger.info("No uns.json in artifacts, using default station prefixes")
+
+        # Content hashes of every input; scans depend on uns.json via station prefixes
+        hashes = {}
+        if self.cache:
+            for filename in list(spec_files.values()) + ['uns.json']:
+                path = os.path.join(artifacts_dir, filename)
+                hashes[filename] = file_sha256(path) if os.path.exists(path) else None
+            self.cache_key = self.cache.digest(*(f"{name}={h}" for name, h in sorted(hashes.items())))
+            self._cached_result = self.cache.get('result', self.cache_key)
+
+        scanner = None
+        cache_hits = []
         for key, filename in spec_files.items():
             filepath = os.path.join(artifacts_dir, filename)
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    self.specs[key] = content
-                    self.logger.info(f"Read {filename}", {"lines": len(content.split('\n'))})
-            else:
+            if not os.path.exists(filepath):
                 self.logger.error(f"File not found: {filename}")
+                continue
+
+            scan_key = self.cache.digest(hashes[filename], hashes['uns.json']) if self.cache else None
+            scan = self.cache.get('scan', scan_key) if self.cache else None
+            if scan is not None:
+                cache_hits.append(filename)
+            else:
+                if scanner is None:
+                    self.topic_index  # station prefixes come from the catalogue
+                    scanner = SpecScanner(self.station_prefixes)
+                scan = scanner.scan(filepath)
+                if self.cache:
+                    self.cache.put('scan', scan_key, scan)
+
+            self.specs[key] = {'file': filename, **scan}
+            self.logger.info(f"Read {filename}", {
+                "lines": self.specs[key]['lines'],
+                "bytes": self.specs[key]['bytes']
+            })
+
+        if self.cache:
+            self.logger.info("Spec scan cache", {"hits": cache_hits, "version": self.cache.version})
 
         return self.specs
 
+    @staticmethod
+    def _topic_prefix(topics: List[str], default: str = 'v1/FY-Fab') -> str:
+        """Most common version/site prefix among topics mentioned in a spec"""
+        counts = Counter('/'.join(t.split('/')[:2]) for t in topics if t.count('/') >= 1)
+        return counts.most_common(1)[0][0] if counts else default
+
+    @tracer.traced()
     def analyze_requirements(self) -> Dict[str, Any]:
         """Extract key requirements from specifications"""
         self.logger.step("Analyzing requirements from specifications")
 
+        if self._cached_result and 'requirements' in self._cached_result:
+            self.logger.success("Requirements loaded from analysis cache", {"key": self.cache_key})
+            return self._cached_result['requirements']
+
         requirements = {
             'components': [],
             'data_sources': [],
@@ -108,22 +755,21 @@ class ArtifactsAnalyzer:
             requirements['components'] = components
 
             # Extract MQTT configuration
-            mqtt_match = re.search(r'ws://([^/]+)/mqtt', prd)
-            if mqtt_match:
+            ws_urls = [u for u in prd['broker_urls'] if u.startswith('ws')]
+            if ws_urls:
+                url = urlsplit(ws_urls[0])
                 requirements['mqtt_config'] = {
-                    'broker': 'broker.hivemq.com',
-                    'port': 8884,
-                    'protocol': 'ws',
-                    'topic_prefix': 'v1/FY-Fab'
+                    'url': ws_urls[0],
+                    'broker': url.hostname,
+                    'port': url.port or (443 if url.scheme == 'wss' else 80),
+                    'protocol': url.scheme,
+                    'topic_prefix': self._topic_prefix(prd['topics'])
                 }
 
         # Extract dashboard specific requirements
         if 'dashboard' in self.specs:
-            dashboard = self.specs['dashboard']
-
-            # Extract equipment list
-            equipment_match = re.findall(r'(LASER\d+|BEND\d+|COAT\d+|ASSY\d+|CUT\d+|CH\d+|TR\d+|HT\d+)', dashboard)
-            requirements['equipment'] = list(set(equipment_match))
+            # Equipment IDs were collected during the scan
+            requirements['equipment'] = self.specs['dashboard']['equipment']
 
             # Extract features
             features = [
@@ -134,13 +780,47 @@ class ArtifactsAnalyzer:
             ]
             requirements['features'] = features
 
+        # Decide subscriptions from the catalogue instead of one blanket filter
+        if len(self.topic_index):
+            site_prefix = (requirements['mqtt_config'].get('topic_prefix')
+                           or self.topic_index.site_prefix())
+            requirements['subscriptions'] = {}
+            routed = set()
+            for component, filters in self.COMPONENT_TOPICS.items():
+                for topic_filter in filters:
+                    pattern = f"{site_prefix}/{topic_filter}"
+                    matched = self.topic_index.match(pattern)
+                    if not matched:
+                        continue
+                    routed.update(t['path'] for t in matched)
+                    requirements['subscriptions'].setdefault(component, []).append(pattern)
+                    requirements['data_sources'].append({
+                        'component': component,
+                        'pattern': pattern,
+                        'topics': len(matched),
+                        'est_mps': round(sum(t.get('estMps', 0) for t in matched), 3)
+                    })
+            requirements['stations'] = self.topic_index.stations()
+            # Catalogue topics some component reads; AppGenerator compiles them into slots
+            requirements['routed_topics'] = sorted(routed)
+
+        if self.cache and self.cache_key:
+            self._cached_result = {'requirements': requirements}
+            self.cache.put('result', self.cache_key, self._cached_result)
+
         self.logger.success("Requirements analysis complete", requirements)
         return requirements
 
+    @tracer.traced()
     def generate_implementation_plan(self, requirements: Dict) -> List[Dict]:
         """Generate step-by-step implementation plan"""
         self.logger.step("Generating implementation plan")
 
+        cached = self._cached_result
+        if cached and 'plan' in cached and cached.get('requirements') == requirements:
+            self.logger.success("Implementation plan loaded from analysis cache", {"steps": len(cached['plan'])})
+            return cached['plan']
+
         plan = [
             {
                 'step': 1,
@@ -209,37 +889,963 @@ class ArtifactsAnalyzer:
             }
         ]
 
+        if self.cache and self.cache_key and cached and cached.get('requirements') == requirements:
+            self.cache.put('result', self.cache_key, {**cached, 'plan': plan})
+
         self.logger.success("Implementation plan generated", {"steps": len(plan)})
         return plan
 
+@functools.lru_cache(maxsize=None)
+def analyzer_version() -> str:
+    """Hash of the analysis code, so cached results die with any change to it"""
+    digest = hashlib.sha256()
+    try:
+        for cls in (TopicTrieNode, TopicIndex, SpecScanner, ArtifactsAnalyzer):
+            digest.update(inspect.getsource(cls).encode('utf-8'))
+    except (OSError, TypeError):
+        # No source available (frozen build); fall back to the whole module
+        with open(__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+class AnalysisCache:
+    """On-disk cache of spec scans and analysis results keyed by content hash
+
+    Entries live under a directory named after analyzer_version(), so editing the
+    analyzer invalidates everything it produced and nothing else.
+    """
+
+    def __init__(self, root: str = None):
+        self.version = analyzer_version()
+        self.root = os.path.join(root or os.path.join(cache_home(), 'analyzer'), self.version)
+
+    @staticmethod
+    def digest(*parts) -> str:
+        return hashlib.sha256('\0'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.root, f"{kind}-{key}.json")
+
+    def get(self, kind: str, key: str) -> Any:
+        try:
+            with open(self._path(kind, key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, kind: str, key: str, value: Any):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(kind, key)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+class FileManifest:
+    """Content-hash manifest of generated files, used for incremental writes"""
+
+    FILENAME = '.generated-manifest.json'
+    VERSION = 1
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self.path = os.path.join(root_dir, self.FILENAME)
+        self.entries = self._load()
+        self.written = []
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load previous manifest entries, ignoring missing or foreign manifests"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != self.VERSION:
+            return {}
+        return data.get('files', {})
+
+    def _save(self):
+        data = {'version': self.VERSION, 'files': self.entries}
+        self._atomic_write(self.path, json.dumps(data, indent=2, sort_keys=True).encode('utf-8'))
+
+    @staticmethod
+    def _atomic_write(file_path: str, data: bytes):
+        """Write via a temp file and rename so readers never see partial content"""
+        tmp_path = f"{file_path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+
+    def _is_current(self, rel_path: str, full_path: str, digest: str, size: int) -> bool:
+        """Check whether the file on disk already holds the rendered content"""
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            return False
+
+        if st.st_size != size:
+            return False
+
+        entry = self.entries.get(rel_path)
+        if entry and entry['sha256'] == digest and entry['mtime_ns'] == st.st_mtime_ns:
+            return True
+
+        # Unknown or touched file - fall back to comparing actual contents
+        return file_sha256(full_path) == digest
+
+    def sync(self, files: Dict[str, str]) -> Dict[str, int]:
+        """Write changed files, remove files no longer generated, and persist the manifest"""
+        stats = {
+            'written': 0, 'skipped': 0, 'removed': 0,
+            'bytes_written': 0, 'bytes_skipped': 0, 'bytes_removed': 0
+        }
+        entries = {}
+        self.written = []
+
+        for rel_path, content in files.items():
+            data = content.encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()
+            full_path = os.path.join(self.root_dir, rel_path)
+
+            if self._is_current(rel_path, full_path, digest, len(data)):
+                stats['skipped'] += 1
+                stats['bytes_skipped'] += len(data)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                self._atomic_write(full_path, data)
+                self.written.append(rel_path)
+                stats['written'] += 1
+                stats['bytes_written'] += len(data)
+
+            entries[rel_path] = {
+                'sha256': digest,
+                'size': len(data),
+                'mtime_ns': os.stat(full_path).st_mtime_ns
+            }
+
+        # Only files this manifest produced are ever deleted, never template files
+        for rel_path, entry in self.entries.items():
+            if rel_path in entries:
+                continue
+            full_path = os.path.join(self.root_dir, rel_path)
+            if os.path.exists(full_path):
+                os.remove(full_path)
+                stats['removed'] += 1
+                stats['bytes_removed'] += entry['size']
+
+        self.entries = entries
+        self._save()
+        return stats
+
+class TemplateCloner:
+    """Clones the app template with reflinks (or plain copies) and swaps it into place atomically
+
+    Hardlinks are never used: every file under the template is an ordinary
+    source file that an editor, formatter or npm script may rewrite in place,
+    and a hardlinked copy would carry that edit back into the template.
+    node_modules is not cloned at all; DependencyStore links it in.
+    """
+
+    # Linux FICLONE ioctl: share extents copy-on-write (btrfs, xfs, overlay on those)
+    FICLONE = 0x40049409
+    RENAME_EXCHANGE = 2
+    AT_FDCWD = -100
+    SKIP_DIRS = {'node_modules', 'dist', '.vite'}
+
+    def __init__(self, template_dir: str, reflink: bool = True):
+        self.template_dir = template_dir
+        self.reflink_supported = reflink and sys.platform.startswith('linux')
+        self.stats = {}
+
+    def _reflink(self, src: str, dst: str) -> bool:
+        """Try a copy-on-write clone; remember when the filesystem can't do it"""
+        if not self.reflink_supported:
+            return False
+
+        import fcntl
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), self.FICLONE, fsrc.fileno())
+            except OSError as e:
+                if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS):
+                    self.reflink_supported = False
+                    os.remove(dst)
+                    return False
+                raise
+        shutil.copystat(src, dst)
+        return True
+
+    def _clone_file(self, src: str, dst: str):
+        size = os.path.getsize(src)
+
+        if self._reflink(src, dst):
+            self.stats['reflinked'] += 1
+            return
+
+        shutil.copy2(src, dst)
+        self.stats['copied'] += 1
+        self.stats['bytes_copied'] += size
+
+    def _clone_tree(self, staging_dir: str):
+        for root, dirs, files in os.walk(self.template_dir):
+            dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
+            rel_root = os.path.relpath(root, self.template_dir)
+            dst_root = os.path.normpath(os.path.join(staging_dir, rel_root))
+            os.makedirs(dst_root, exist_ok=True)
+
+            for name in files:
+                src = os.path.join(root, name)
+                dst = os.path.join(dst_root, name)
+
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), dst)
+                    continue
+
+                self._clone_file(src, dst)
+
+    def _carry_over(self, previous_dir: str, staging_dir: str):
+        """Keep the previous run's generated files so unchanged ones keep their mtimes"""
+        manifest_path = os.path.join(previous_dir, FileManifest.FILENAME)
+        if not os.path.exists(manifest_path):
+            return
+
+        for rel_path in list(FileManifest(previous_dir).entries) + [FileManifest.FILENAME]:
+            src = os.path.join(previous_dir, rel_path)
+            dst = os.path.join(staging_dir, rel_path)
+            if not os.path.isfile(src):
+                continue
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if os.path.lexists(dst):
+                os.remove(dst)
+            self._clone_file(src, dst)
+            self.stats['carried_over'] += 1
+
+    def _exchange(self, staging_dir: str, target_dir: str) -> bool:
+        """Atomically exchange two directories with renameat2 where available"""
+        if not sys.platform.startswith('linux'):
+            return False
+
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        renameat2 = getattr(libc, 'renameat2', None)
+        if renameat2 is None:
+            return False
+
+        ret = renameat2(self.AT_FDCWD, os.fsencode(staging_dir),
+                        self.AT_FDCWD, os.fsencode(target_dir), self.RENAME_EXCHANGE)
+        return ret == 0
+
+    @staticmethod
+    def _sibling_path(target_dir: str, label: str) -> str:
+        """Unique path next to target_dir, so renames stay on one filesystem"""
+        parent = os.path.dirname(os.path.abspath(target_dir))
+        name = os.path.basename(os.path.normpath(target_dir))
+        path = tempfile.mkdtemp(prefix=f"{name}.{label}-", dir=parent)
+        os.rmdir(path)
+        return path
+
+    def _swap_in(self, staging_dir: str, target_dir: str) -> str:
+        """Swap the staged tree into target_dir; return the path holding the old tree"""
+        if not os.path.exists(target_dir):
+            os.rename(staging_dir, target_dir)
+            return None
+
+        if self._exchange(staging_dir, target_dir):
+            return staging_dir
+
+        old_dir = self._sibling_path(target_dir, 'old')
+        os.rename(target_dir, old_dir)
+        os.rename(staging_dir, target_dir)
+        return old_dir
+
+    def clone(self, target_dir: str) -> Dict[str, int]:
+        """Build a fresh copy of the template next to target_dir and swap it in"""
+        self.stats = {'reflinked': 0, 'copied': 0,
+                      'bytes_copied': 0, 'carried_over': 0}
+        staging_dir = self._sibling_path(target_dir, 'staging')
+
+        try:
+            self._clone_tree(staging_dir)
+
+            env_example = os.path.join(staging_dir, '.env.example')
+            if os.path.exists(env_example):
+                shutil.copyfile(env_example, os.path.join(staging_dir, '.env'))
+
+            if os.path.isdir(target_dir):
+                self._carry_over(target_dir, staging_dir)
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        old_dir = self._swap_in(staging_dir, target_dir)
+
+        # The old tree may hold node_modules; delete it without blocking the workflow
+        if old_dir:
+            threading.Thread(target=shutil.rmtree, args=(old_dir, True)).start()
+
+        return self.stats
+
+class DependencyStore:
+    """Shared node_modules store keyed by the lockfile and the extra dependency list
+
+    Entries are world-readable so one store can serve several users or CI jobs.
+    In symlink mode the app gets a real node_modules directory whose packages
+    are links into the entry, so tool caches such as node_modules/.vite are
+    written inside the app and never into the shared entry.
+    """
+
+    LOCK_FILES = ['package.json', 'package-lock.json']
+    LINK_MODES = ('hardlink', 'symlink')
+    ENTRY_MODE = 0o755
+
+    def __init__(self, root: str = None, link_mode: str = 'hardlink', offline: bool = False):
+        if link_mode not in self.LINK_MODES:
+            raise ValueError(f"Unknown link mode: {link_mode}")
+        self.root = root or os.path.join(cache_home(), 'deps')
+        self.link_mode = link_mode
+        self.offline = offline
+        self.npm_cache = os.path.join(self.root, 'npm-cache')
+
+    @staticmethod
+    def _node_version() -> str:
+        try:
+            return subprocess.run(['node', '--version'], capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return 'unknown'
+
+    def key(self, app_dir: str, dependencies: List[str]) -> str:
+        """Content address for an install: lockfile, manifest, extras and platform"""
+        digest = hashlib.sha256()
+        for name in self.LOCK_FILES:
+            path = os.path.join(app_dir, name)
+            digest.update(name.encode('utf-8') + b'\0')
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+            digest.update(b'\0')
+        digest.update('\n'.join(sorted(dependencies)).encode('utf-8'))
+        # Native packages (esbuild, rollup) ship per-platform binaries
+        digest.update(f"{sys.platform}-{platform.machine()}-{self._node_version()}".encode('utf-8'))
+        return digest.hexdigest()[:32]
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def lookup(self, key: str) -> Dict[str, Any]:
+        """Return entry metadata for a complete store entry, or None"""
+        meta_path = os.path.join(self._entry_dir(key), 'meta.json')
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def npm_args(self) -> List[str]:
+        """Route npm through the store's tarball cache so later installs can run offline"""
+        args = ['--cache', self.npm_cache, '--prefer-offline', '--no-audit', '--no-fund']
+        if self.offline:
+            args.append('--offline')
+        return args
+
+    @staticmethod
+    def _link_tree(src_dir: str, dst_dir: str):
+        """Recreate src_dir at dst_dir with every file hardlinked"""
+        for root, dirs, files in os.walk(src_dir):
+            rel_root = os.path.relpath(root, src_dir)
+            dst_root = os.path.normpath(os.path.join(dst_dir, rel_root))
+            os.makedirs(dst_root, exist_ok=True)
+
+            # os.walk does not descend into symlinked dirs; recreate them as links
+            for name in dirs + files:
+                src = os.path.join(root, name)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), os.path.join(dst_root, name))
+            for name in files:
+                src = os.path.join(root, name)
+                if not os.path.islink(src):
+                    try:
+                        os.link(src, os.path.join(dst_root, name))
+                    except OSError:
+                        shutil.copy2(src, os.path.join(dst_root, name))
+
+    @staticmethod
+    def _link_packages(src_dir: str, dst_dir: str):
+        """Real dst_dir with each package symlinked; top-level files (.package-lock.json) copied"""
+        os.makedirs(dst_dir)
+        for name in os.listdir(src_dir):
+            src = os.path.join(src_dir, name)
+            dst = os.path.join(dst_dir, name)
+            if os.path.isdir(src):
+                os.symlink(os.path.abspath(src), dst)
+            else:
+                shutil.copy2(src, dst)
+
+    def materialize(self, key: str, app_dir: str) -> float:
+        """Install a stored node_modules into app_dir; return seconds taken"""
+        started = time.time()
+        entry_dir = self._entry_dir(key)
+        target = os.path.join(app_dir, 'node_modules')
+
+        if os.path.islink(target):
+            os.remove(target)
+        elif os.path.isdir(target):
+            shutil.rmtree(target)
+
+        if self.link_mode == 'symlink':
+            self._link_packages(os.path.join(entry_dir, 'node_modules'), target)
+        else:
+            self._link_tree(os.path.join(entry_dir, 'node_modules'), target)
+
+        # npm install <extras> rewrites both manifests; restore the stored versions
+        for name in self.LOCK_FILES:
+            stored = os.path.join(entry_dir, name)
+            if os.path.exists(stored):
+                shutil.copyfile(stored, os.path.join(app_dir, name))
+
+        return time.time() - started
+
+    def populate(self, key: str, app_dir: str, install_seconds: float):
+        """Move a fresh install into the store and link it back into app_dir"""
+        entry_dir = self._entry_dir(key)
+        os.makedirs(self.root, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix=f"{key}.staging-", dir=self.root)
+
+        try:
+            source = os.path.join(app_dir, 'node_modules')
+            try:
+                os.rename(source, os.path.join(staging_dir, 'node_modules'))
+            except OSError:
+                # Store on another filesystem: fall back to a real copy
+                shutil.copytree(source, os.path.join(staging_dir, 'node_modules'), symlinks=True)
+                shutil.rmtree(source)
+
+            for name in self.LOCK_FILES:
+                path = os.path.join(app_dir, name)
+                if os.path.exists(path):
+                    shutil.copyfile(path, os.path.join(staging_dir, name))
+
+            with open(os.path.join(staging_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'install_seconds': install_seconds,
+                           'created': datetime.now().isoformat()}, f, indent=2)
+            # mkdtemp creates 0700; readable by other users once it is published
+            os.chmod(staging_dir, self.ENTRY_MODE)
+
+            try:
+                os.rename(staging_dir, entry_dir)
+            except OSError:
+                # Another run populated the same key first; theirs is equivalent
+                shutil.rmtree(staging_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        self.materialize(key, app_dir)
+
+    def record(self, stats: Dict[str, Any]):
+        """Append one install outcome to the store's history for cross-run tracking"""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, 'stats.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'timestamp': datetime.now().isoformat(), **stats}) + "\n")
+
+class StreamingProcess:
+    """Runs a command with bounded output capture, live forwarding and an idle watchdog
+
+    Each output line goes to the logger at DEBUG level as it arrives. Only the last
+    tail_lines lines of each stream are kept, so memory stays flat however chatty the
+    tool is. Instead of a fixed deadline, the process is killed when it has printed
+    nothing for idle_timeout seconds.
+    """
+
+    # (progress key, pattern, mode): 'set' keeps the captured number, 'count' counts matches
+    PROGRESS_PATTERNS = [
+        ('packages_added', re.compile(r'\badded (\d+) packages?'), 'set'),
+        ('packages_fetched', re.compile(r'^npm (?:http|verbose) fetch GET 200\b'), 'count'),
+        ('modules_transformed', re.compile(r'(\d+) modules? transformed'), 'set'),
+        ('modules_transforming', re.compile(r'transforming \((\d+)\)'), 'set'),
+    ]
+    MAX_LINE = 8192
+    POLL_INTERVAL = 0.5
+    PROGRESS_INTERVAL = 2.0
+
+    def __init__(self, logger: Logger, cmd: List[str], cwd: str = None, label: str = None,
+                 idle_timeout: float = 120, tail_lines: int = 200, on_line=None):
+        self.logger = logger
+        self.cmd = cmd
+        self.cwd = cwd
+        self.label = label or os.path.basename(cmd[0])
+        self.idle_timeout = idle_timeout
+        self.on_line = on_line
+        self.stdout_tail = deque(maxlen=tail_lines)
+        self.stderr_tail = deque(maxlen=tail_lines)
+        self.progress = {}
+        self.last_output = time.monotonic()
+        self._last_report = 0.0
+        self._reported = {}
+        self._lock = threading.Lock()
+
+    def _parse_progress(self, line: str):
+        changed = False
+        for key, pattern, mode in self.PROGRESS_PATTERNS:
+            match = pattern.search(line)
+            if not match:
+                continue
+            value = self.progress.get(key, 0) + 1 if mode == 'count' else int(match.group(1))
+            if self.progress.get(key) != value:
+                self.progress[key] = value
+                changed = True
+
+        now = time.monotonic()
+        if changed and now - self._last_report >= self.PROGRESS_INTERVAL:
+            self._last_report = now
+            self._reported = dict(self.progress)
+            self.logger.info(f"{self.label} progress", self._reported)
+
+    def _pump(self, stream, tail: deque):
+        """Reader thread: one per pipe, so neither can fill up and stall the child"""
+        for line in iter(lambda: stream.readline(self.MAX_LINE), ''):
+            line = line.rstrip('\n')
+            tail.append(line)
+            with self._lock:
+                self.last_output = time.monotonic()
+                self._parse_progress(line)
+            self.logger.debug(f"[{self.label}] {line}")
+            if self.on_line:
+                self.on_line(line)
+        stream.close()
+
+    def _kill(self, proc: subprocess.Popen):
+        # npm and vite spawn helpers that inherit our pipes; take the whole group down
+        if os.name == 'posix':
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        else:
+            proc.kill()
+        proc.wait()
+
+    def run(self, check: bool = False) -> subprocess.CompletedProcess:
+        proc = subprocess.Popen(self.cmd, cwd=self.cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, errors='replace', start_new_session=(os.name == 'posix'))
+        readers = [
+            threading.Thread(target=self._pump, args=(proc.stdout, self.stdout_tail), daemon=True),
+            threading.Thread(target=self._pump, args=(proc.stderr, self.stderr_tail), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+
+        idle = False
+        while True:
+            try:
+                proc.wait(timeout=self.POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                with self._lock:
+                    idle = time.monotonic() - self.last_output > self.idle_timeout
+                if idle:
+                    self._kill(proc)
+                    break
+
+        for reader in readers:
+            reader.join(timeout=5)
+
+        stdout = '\n'.join(self.stdout_tail)
+        stderr = '\n'.join(self.stderr_tail)
+        if idle:
+            raise subprocess.TimeoutExpired(self.cmd, self.idle_timeout, output=stdout, stderr=stderr)
+        if self.progress != self._reported:
+            self.logger.info(f"{self.label} progress", dict(self.progress))
+
+        result = subprocess.CompletedProcess(self.cmd, proc.returncode, stdout, stderr)
+        result.progress = dict(self.progress)
+        if check and proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, self.cmd, stdout, stderr)
+        return result
+
+class BuildValidator:
+    """Tiered checks of a generated app, cheapest first
+
+    Tier 1 transforms each changed .tsx file on its own with esbuild, in parallel.
+    Tier 2 runs tsc --noEmit incrementally, keeping tsbuildinfo in the cache so
+    unchanged files are not re-checked on the next run. Type errors only fail
+    tier 2 when they are in generated_files (when given): the template's own
+    build is plain vite with no tsc, so errors elsewhere are reported as a
+    warning. Tier 3 is the production build, run only once the earlier tiers
+    pass unless forced. A tier whose tool is not installed in the app is
+    reported as skipped.
+    """
+
+    TIERS = ('syntax', 'typecheck', 'build')
+    TSC_ERROR = re.compile(r'^(.+?)\((\d+),(\d+)\): error (TS\d+): (.*)$')
+    MAX_ERRORS = 20
+
+    def __init__(self, logger: Logger, app_dir: str, cache_root: str = None,
+                 max_workers: int = None, idle_timeout: int = 120, generated_files: List[str] = None):
+        self.logger = logger
+        self.app_dir = app_dir
+        self.generated_files = None if generated_files is None else {os.path.normpath(f) for f in generated_files}
+        self.cache_root = cache_root or os.path.join(cache_home(), 'tsbuildinfo')
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.idle_timeout = idle_timeout
+        self.results = {}
+
+    def _bin(self, name: str) -> str:
+        # Absolute: the tools run with cwd=app_dir, where a relative path would not resolve
+        path = os.path.abspath(os.path.join(self.app_dir, 'node_modules', '.bin', name))
+        return path if os.path.exists(path) else None
+
+    def _build_info_path(self) -> str:
+        """One tsbuildinfo per app directory, outside it so clones and swaps keep it"""
+        digest = hashlib.sha256(os.path.abspath(self.app_dir).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_root, f"{digest}.tsbuildinfo")
+
+    def _record(self, tier: str, status: str, started: float, errors: List[str] = None, **extra):
+        self.results[tier] = {
+            'status': status,
+            'seconds': round(time.time() - started, 3),
+            'errors': (errors or [])[:self.MAX_ERRORS],
+            **extra
+        }
+        return status != 'failed'
+
+    def check_syntax(self, changed_files: List[str]) -> bool:
+        """Tier 1: transform-only esbuild pass over each changed .tsx file"""
+        started = time.time()
+        files = [f for f in changed_files if f.endswith('.tsx')]
+        esbuild = self._bin('esbuild')
+        if not esbuild:
+            return self._record('syntax', 'skipped', started, files=len(files))
+
+        def transform(rel_path):
+            result = subprocess.run([esbuild, rel_path, '--loader:.tsx=tsx', '--log-level=error'],
+                                    cwd=self.app_dir, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE, text=True, timeout=self.idle_timeout)
+            return rel_path, result.returncode, result.stderr.strip()
+
+        errors = []
+        if files:
+            with tracer.span('esbuild syntax', 'subprocess', files=len(files)):
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(files))) as pool:
+                    for rel_path, returncode, stderr in pool.map(transform, files):
+                        if returncode != 0:
+                            errors.append(f"{rel_path}: {stderr[-500:]}")
+
+        return self._record('syntax', 'failed' if errors else 'ok', started, errors, files=len(files))
+
+    def typecheck(self) -> bool:
+        """Tier 2: incremental tsc --noEmit with persisted build info"""
+        started = time.time()
+        tsc = self._bin('tsc')
+        if not tsc:
+            return self._record('typecheck', 'skipped', started)
+
+        build_info = self._build_info_path()
+        os.makedirs(self.cache_root, exist_ok=True)
+        incremental = os.path.exists(build_info)
+        cmd = [tsc, '--noEmit', '--incremental', '--tsBuildInfoFile', build_info, '-p', 'tsconfig.json']
+        errors = []
+        elsewhere = []
+
+        def collect(line):
+            match = self.TSC_ERROR.match(line)
+            if not match:
+                return
+            ours = self.generated_files is None or os.path.normpath(match.group(1)) in self.generated_files
+            bucket = errors if ours else elsewhere
+            if len(bucket) < self.MAX_ERRORS:
+                bucket.append(line)
+
+        with tracer.span('tsc --noEmit', 'subprocess', incremental=incremental):
+            result = StreamingProcess(self.logger, cmd, cwd=self.app_dir, label='tsc',
+                                      idle_timeout=self.idle_timeout, on_line=collect).run()
+
+        if result.returncode == 0:
+            status = 'ok'
+        elif errors or not elsewhere:
+            status = 'failed'
+            errors = errors or [(result.stdout + result.stderr)[-1000:]]
+        else:
+            # Only template files have type errors; vite builds them anyway
+            status = 'warning'
+            errors = elsewhere
+            self.logger.info("Type errors outside the generated files; not failing", {"errors": elsewhere})
+        return self._record('typecheck', status, started, errors, incremental=incremental)
+
+    def build(self) -> bool:
+        """Tier 3: full production build"""
+        started = time.time()
+        with tracer.span('npm run build', 'subprocess'):
+            result = StreamingProcess(self.logger, ['npm', 'run', 'build'], cwd=self.app_dir,
+                                      label='vite build', idle_timeout=self.idle_timeout).run()
+        errors = [] if result.returncode == 0 else [result.stdout[-1000:], result.stderr[-1000:]]
+        return self._record('build', 'failed' if errors else 'ok', started, errors, **result.progress)
+
+    def run(self, changed_files: List[str], force_build: bool = False) -> bool:
+        passed = self.check_syntax(changed_files)
+        passed = self.typecheck() and passed
+        if passed or force_build:
+            passed = self.build() and passed
+        else:
+            self.results['build'] = {'status': 'skipped', 'seconds': 0.0, 'errors': []}
+        return passed
+
+    def report(self):
+        lines = [f"  {'tier':<10} {'status':<8} {'seconds':>8}  errors"]
+        for tier in self.TIERS:
+            result = self.results.get(tier)
+            if result:
+                lines.append(f"  {tier:<10} {result['status']:<8} {result['seconds']:>8.2f}  "
+                             f"{len(result['errors'])}")
+        self.logger.info("Validation tiers\n" + "\n".join(lines), self.results)
+
+class TemplateEngine:
+    """Renders the .ts/.tsx sources under templates/ with {{ name }} placeholders
+
+    Templates are split into literal text and placeholders once, when the engine
+    is built. Renders are memoized on the template and the parameters it actually
+    uses, so site variants that differ only elsewhere share a render.
+    {{ name|ts }} writes the value as a TypeScript literal, indented to its line
+    and wrapped one item per line when it contains objects or runs long.
+    """
+
+    PLACEHOLDER = re.compile(r'\{\{\s*(\w+)\s*(?:\|\s*(\w+)\s*)?\}\}')
+    IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+    FILTERS = {'ts'}
+    LINE_WIDTH = 100
+    MEMO_SIZE = 1024
+
+    def __init__(self, root: str):
+        self.root = root
+        self.compiled = {}
+        self.params = {}
+        for path in sorted(Path(root).rglob('*.ts*')):
+            name = path.relative_to(root).as_posix()
+            self.compiled[name] = self._compile(name, path.read_text(encoding='utf-8'))
+            self.params[name] = {part[0] for part in self.compiled[name] if isinstance(part, tuple)}
+        self._render = functools.lru_cache(maxsize=self.MEMO_SIZE)(self._render_uncached)
+
+    def _compile(self, name: str, source: str) -> List[Any]:
+        """Literal strings interleaved with (param, filter, indent) placeholders"""
+        parts = []
+        pos = 0
+        for match in self.PLACEHOLDER.finditer(source):
+            param, filter_name = match.groups()
+            if filter_name and filter_name not in self.FILTERS:
+                raise ValueError(f"Unknown filter '{filter_name}' in template {name}")
+            line_start = source.rfind('\n', 0, match.start()) + 1
+            indent = source[line_start:match.start()]
+            indent = indent[:len(indent) - len(indent.lstrip())]
+            parts.append(source[pos:match.start()])
+            parts.append((param, filter_name, indent))
+            pos = match.end()
+        parts.append(source[pos:])
+        return parts
+
+    @classmethod
+    def ts_literal(cls, value: Any, indent: str = '') -> str:
+        """TypeScript source for a JSON-like value; lists of objects go one per line"""
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        if value is None:
+            return 'null'
+        if isinstance(value, (int, float)):
+            return repr(value)
+        if isinstance(value, str):
+            escaped = value.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n')
+            return f"'{escaped}'"
+        if isinstance(value, dict):
+            if not value:
+                return '{}'
+            nested = any(isinstance(item, (dict, list, tuple)) for item in value.values())
+            inner = indent + '  ' if nested else indent
+            items = []
+            for key, item in value.items():
+                key = key if cls.IDENTIFIER.fullmatch(key) else cls.ts_literal(key)
+                items.append(f"{key}: {cls.ts_literal(item, inner)}")
+            if nested:
+                return '{\n' + ',\n'.join(inner + item for item in items) + '\n' + indent + '}'
+            return '{ ' + ', '.join(items) + ' }'
+        items = list(value)
+        if not any(isinstance(item, (dict, list, tuple)) for item in items):
+            flat = '[' + ', '.join(cls.ts_literal(item) for item in items) + ']'
+            if len(indent) + len(flat) <= cls.LINE_WIDTH:
+                return flat
+        inner = indent + '  '
+        return ('[\n' + ',\n'.join(inner + cls.ts_literal(item, inner) for item in items)
+                + '\n' + indent + ']')
+
+    def _render_uncached(self, name: str, params_key: str) -> str:
+        params = json.loads(params_key)
+        out = []
+        for part in self.compiled[name]:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            param, filter_name, indent = part
+            value = params[param]
+            out.append(self.ts_literal(value, indent) if filter_name == 'ts' else str(value))
+        return ''.join(out)
+
+    def render(self, name: str, /, **params) -> str:
+        if name not in self.compiled:
+            raise KeyError(f"No template named {name} under {self.root}")
+        missing = self.params[name] - params.keys()
+        if missing:
+            raise KeyError(f"Template {name} needs parameters: {', '.join(sorted(missing))}")
+        used = {key: params[key] for key in sorted(self.params[name])}
+        return self._render(name, json.dumps(used, ensure_ascii=False))
+
+    def stats(self) -> Dict[str, int]:
+        info = self._render.cache_info()
+        return {'templates': len(self.compiled), 'hits': info.hits, 'misses': info.misses,
+                'memoized': info.currsize}
+
+component_templates = TemplateEngine(TEMPLATE_ROOT)
+
 class AppGenerator:
     """Generates the dashboard application based on requirements"""
 
-    def __init__(self, logger: Logger):
+    COMPONENTS = [
+        ('MqttProvider', 'provider', None),
+        ('KPICards', 'metrics', 'numeric_display'),
+        ('EquipmentGrid', 'grid', 'status_grid'),
+        ('AlertsPanel', 'alerts', 'list_with_severity'),
+        ('ScheduleView', 'schedule', 'data_table'),
+        ('ControlPanel', 'controls', None),
+        ('MessageFeed', 'feed', 'scrollable_feed'),
+        ('MetricTrends', 'trends', 'line_chart'),
+        ('DiagnosticsPanel', 'diagnostics', None)
+    ]
+
+    UI_COMPONENT_FILES = ['card.tsx', 'button.tsx', 'badge.tsx', 'alert.tsx', 'table.tsx', 'scroll-area.tsx']
+
+    # Support modules rendered from templates/lib into src/lib
+    LIB_FILES = ['messageRing.ts', 'topicStore.ts', 'topicRoutes.ts', 'subscriptions.ts', 'mqttWire.ts',
+                 'mqttWorker.ts', 'metricHistory.ts', 'diagnostics.ts']
+
+    # Component name -> template under templates/; anything else gets the placeholder
+    COMPONENT_TEMPLATES = {name: f'components/{name}.tsx' for name, _, _ in COMPONENTS}
+    DEFAULT_COMPONENT_TEMPLATE = 'components/Default.tsx'
+
+    # Template inputs used when the specs do not provide them
+    DEFAULT_BROKER_URL = 'ws://broker.hivemq.com:8884/mqtt'
+    DEFAULT_TOPIC_PREFIX = 'v1/FY-Fab'
+    # The feed is virtualized, so retention is bounded by memory rather than DOM size
+    MESSAGE_RETENTION = 10000
+    FEED_MAX_BYTES = 16 * 1024 * 1024
+    # Metric history: 24 hours at one point per second per series
+    HISTORY_SECONDS = 24 * 3600
+    HISTORY_POINTS = 24 * 3600
+    # Queue-snapshot fields the KPI cards trend; MetricTrends keeps every number it sees
+    KPI_HISTORY_FIELDS = ['running_jobs', 'queued_jobs']
+    INGEST_MODES = ('simple', 'buffered', 'worker')
+    SETUP_MODES = ('clone', 'copy', 'script')
+    DEFAULT_EQUIPMENT = [
+        {'id': 'LASER01', 'name': '激光切割机1', 'status': 'running', 'currentJob': 'JOB-001', 'batchQty': 100},
+        {'id': 'BEND01', 'name': '折弯机1', 'status': 'idle'},
+        {'id': 'COAT01', 'name': '喷涂线1', 'status': 'queued', 'currentJob': 'JOB-002', 'batchQty': 50},
+        {'id': 'ASSY01', 'name': '装配线1', 'status': 'running', 'currentJob': 'JOB-003', 'batchQty': 75},
+        {'id': 'CUT01', 'name': '切线机1', 'status': 'maintenance'},
+        {'id': 'CH01', 'name': '冷镦机1', 'status': 'running', 'currentJob': 'JOB-004', 'batchQty': 200}
+    ]
+
+    DEPENDENCIES = [
+        'mqtt',
+        'recharts',
+        '@tanstack/react-query',
+        'lucide-react',
+        'date-fns',
+        'clsx',
+        'tailwind-merge'
+    ]
+
+    SETUP_SCRIPT = 'setup-new-app.sh'
+    INSTALL_IDLE_TIMEOUT = 300
+
+    def __init__(self, logger: Logger, setup_mode: str = 'clone', template_dir: str = 'template',
+                 dependency_store: DependencyStore = None, target_dir: str = 'new-app',
+                 templates: 'TemplateEngine' = None, ingest_mode: str = 'simple',
+                 flush_interval_ms: int = 0, topic_history: int = 0,
+                 message_retention: int = MESSAGE_RETENTION, feed_max_bytes: int = FEED_MAX_BYTES,
+                 history_seconds: int = HISTORY_SECONDS, history_points: int = HISTORY_POINTS,
+                 instrument: bool = False):
+        if setup_mode not in self.SETUP_MODES:
+            raise ValueError(f"Unknown setup mode: {setup_mode}")
+        if ingest_mode not in self.INGEST_MODES:
+            raise ValueError(f"Unknown ingest mode: {ingest_mode}")
         self.logger = logger
+        self.ingest_mode = ingest_mode
+        self.flush_interval_ms = flush_interval_ms
+        self.topic_history = topic_history
+        self.message_retention = message_retention
+        self.feed_max_bytes = feed_max_bytes
+        self.history_seconds = history_seconds
+        self.history_points = history_points
+        self.instrument = instrument
+        self.templates = templates or component_templates
         self.app_dir = None
-
+        self.target_dir = target_dir
+        self.changed_files = []
+        self.setup_mode = setup_mode
+        self.template_dir = template_dir
+        self.dependency_store = dependency_store
+
+    def generated_paths(self) -> List[str]:
+        """Paths (relative to the app dir) that create_app_structure writes"""
+        paths = [f'src/components/{name}.tsx' for name, _, _ in self.COMPONENTS]
+        paths.append('src/App.tsx')
+        paths.extend(f'src/components/ui/{name}' for name in self.UI_COMPONENT_FILES)
+        paths.extend(f'src/lib/{name}' for name in self.LIB_FILES)
+        return paths
+
+    @tracer.traced()
     def setup_new_app(self) -> str:
+        """Create new-app from the template"""
+        if self.setup_mode in ('clone', 'copy'):
+            return self._clone_new_app()
+        return self._run_setup_script()
+
+    def _clone_new_app(self) -> str:
+        """Clone the template natively and swap it in without deleting first"""
+        self.logger.step("Cloning template to create new application")
+
+        # 'copy' skips reflinks too, for debugging on filesystems where they misbehave
+        cloner = TemplateCloner(self.template_dir, reflink=self.setup_mode == 'clone')
+        stats = cloner.clone(self.target_dir)
+
+        self.logger.success("Template cloned", stats)
+        self.app_dir = self.target_dir
+        return self.app_dir
+
+    def _run_setup_script(self) -> str:
         """Run setup-new-app.sh script"""
         self.logger.step("Running setup-new-app.sh to create new application")
 
+        # The script lives next to the template and always writes <its dir>/new-app
+        base_dir = os.path.dirname(os.path.abspath(self.template_dir))
+        script_output = os.path.join(base_dir, 'new-app')
+
         try:
             # Remove existing new-app directory if it exists
-            if os.path.exists('new-app'):
-                shutil.rmtree('new-app')
-                self.logger.info("Removed existing new-app directory")
+            for path in {script_output, os.path.abspath(self.target_dir)}:
+                if os.path.exists(path):
+                    shutil.rmtree(path)
+                    self.logger.info(f"Removed existing {path} directory")
 
             # Run the setup script
-            result = subprocess.run(['./setup-new-app.sh'],
-                                  capture_output=True,
-                                  text=True,
-                                  check=True)
+            with tracer.span('setup-new-app.sh', 'subprocess'):
+                result = StreamingProcess(self.logger, [os.path.join(base_dir, self.SETUP_SCRIPT)],
+                                          cwd=base_dir, label='setup').run(check=True)
+
+            if os.path.abspath(self.target_dir) != script_output:
+                shutil.move(script_output, self.target_dir)
 
             self.logger.success("Setup script completed", {
                 "stdout": result.stdout[-500:] if result.stdout else None  # Last 500 chars
             })
 
-            self.app_dir = 'new-app'
+            self.app_dir = self.target_dir
             return self.app_dir
 
         except subprocess.CalledProcessError as e:
@@ -249,645 +1855,194 @@ class AppGenerator:
             })
             raise
 
+    @tracer.traced()
     def install_dependencies(self) -> bool:
-        """Install required npm packages"""
+        """Install required npm packages, reusing the shared store when possible"""
         self.logger.step("Installing dependencies")
 
-        dependencies = [
-            'mqtt',
-            'recharts',
-            '@tanstack/react-query',
-            'lucide-react',
-            'date-fns',
-            'clsx',
-            'tailwind-merge'
-        ]
+        dependencies = self.DEPENDENCIES
+        store = self.dependency_store
+        key = store.key(self.app_dir, dependencies) if store else None
+
+        if store:
+            entry = store.lookup(key)
+            if entry:
+                seconds = store.materialize(key, self.app_dir)
+                stats = {
+                    "hit": True,
+                    "key": key,
+                    "seconds": round(seconds, 3),
+                    "time_saved": round(max(entry['install_seconds'] - seconds, 0), 3)
+                }
+                store.record(stats)
+                self.logger.success("Dependencies restored from store", stats)
+                return True
 
         try:
-            os.chdir(self.app_dir)
-
-            # Install dependencies
-            cmd = ['npm', 'install'] + dependencies
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-            self.logger.success("Dependencies installed", {
-                "packages": dependencies
-            })
-
-            os.chdir('..')
-            return True
+            # cwd= rather than chdir: this stage overlaps create_app_structure
+            # http-level logging gives the watchdog and progress parser something to read
+            cmd = ['npm', 'install'] + dependencies + ['--loglevel=http']
+            if store:
+                cmd += store.npm_args()
+            started = time.time()
+            with tracer.span('npm install', 'subprocess', cmd=' '.join(cmd)):
+                result = StreamingProcess(self.logger, cmd, cwd=self.app_dir, label='npm install',
+                                          idle_timeout=self.INSTALL_IDLE_TIMEOUT).run(check=True)
+            install_seconds = time.time() - started
 
         except subprocess.CalledProcessError as e:
             self.logger.error("Failed to install dependencies", {
                 "error": str(e),
-                "stderr": e.stderr
+                "stderr": e.stderr[-1000:]
+            })
+            return False
+        except subprocess.TimeoutExpired as e:
+            self.logger.error("Dependency install stalled", {
+                "idle_seconds": e.timeout,
+                "stderr": (e.stderr or '')[-1000:]
             })
-            os.chdir('..')
             return False
 
+        stats = {"packages": dependencies, **result.progress}
+        if store:
+            try:
+                store.populate(key, self.app_dir, install_seconds)
+                stats.update({"hit": False, "key": key, "seconds": round(install_seconds, 3)})
+                store.record({"hit": False, "key": key, "seconds": round(install_seconds, 3),
+                              "time_saved": 0})
+            except OSError as e:
+                # The install itself succeeded; a store failure only costs the next run
+                self.logger.error("Failed to populate dependency store", {"error": str(e)})
+
+        self.logger.success("Dependencies installed", stats)
+        return True
+
+    def render_params(self, requirements: Dict) -> Dict[str, Any]:
+        """Site-specific template inputs taken from the analyzed requirements"""
+        mqtt_config = requirements.get('mqtt_config') or {}
+        topic_prefix = mqtt_config.get('topic_prefix') or self.DEFAULT_TOPIC_PREFIX
+
+        # Keep the demo entries for stations we know, plain idle cards for the rest
+        known = {equip['id']: equip for equip in self.DEFAULT_EQUIPMENT}
+        equipment = [known.get(equip_id, {'id': equip_id, 'name': equip_id, 'status': 'idle'})
+                     for equip_id in requirements.get('equipment', [])]
+
+        # Narrow broker subscriptions from the catalogue; the whole site only as a fallback
+        component_topics = requirements.get('subscriptions') or {}
+        broker_filters = sorted({f for filters in component_topics.values() for f in filters})
+
+        routes = self.compile_routes(component_topics, requirements.get('routed_topics', []))
+        metric_sources = (
+            [{'pattern': p, 'fields': None} for p in component_topics.get('MetricTrends', [])]
+            + [{'pattern': p, 'fields': self.KPI_HISTORY_FIELDS} for p in component_topics.get('KPICards', [])]
+        )
+
+        return {
+            'broker_url': mqtt_config.get('url') or self.DEFAULT_BROKER_URL,
+            'topic_prefix': topic_prefix,
+            'component_topics': component_topics,
+            'broker_filters': broker_filters or [f"{topic_prefix}/#"],
+            'station_level': len(topic_prefix.split('/')) + 1,
+            'topic_history': self.topic_history,
+            'site_name': topic_prefix.split('/')[-1],
+            'equipment': equipment or self.DEFAULT_EQUIPMENT,
+            'message_retention': requirements.get('message_retention', self.message_retention),
+            'feed_max_bytes': self.feed_max_bytes,
+            'ingest': {'mode': self.ingest_mode, 'flushIntervalMs': self.flush_interval_ms},
+            'route_patterns': routes['patterns'],
+            'route_groups': routes['groups'],
+            'route_trie': routes['trie'],
+            'metric_sources': metric_sources,
+            'history': {'retentionMs': self.history_seconds * 1000, 'maxPoints': self.history_points},
+            'instrument': self.instrument
+        }
+
+    @staticmethod
+    def compile_routes(component_topics: Dict[str, List[str]], topics: List[str]) -> Dict[str, Any]:
+        """Routing table for src/lib/topicRoutes.ts
+
+        Every distinct component pattern gets an id. Known topics are grouped by
+        the pattern ids they match, so the generated module can hand each one a
+        slot whose consumers are a precomputed list. Topics outside the catalogue
+        fall back to a trie of the patterns ('+' is 'any', '#' is 'rest').
+        """
+        patterns = sorted({p for filters in component_topics.values() for p in filters})
+
+        index = TopicIndex()
+        for path in topics:
+            index.add({'path': path})
+        matches = {}
+        for pattern_id, pattern in enumerate(patterns):
+            for topic_id in index.match_ids(pattern):
+                matches.setdefault(topic_id, []).append(pattern_id)
+
+        groups = {}
+        for topic_id in sorted(matches, key=lambda i: index.topics[i]['path']):
+            groups.setdefault(tuple(matches[topic_id]), []).append(index.topics[topic_id]['path'])
+
+        trie = {}
+        for pattern_id, pattern in enumerate(patterns):
+            node = trie
+            for segment in pattern.split('/'):
+                if segment == '#':
+                    node.setdefault('rest', []).append(pattern_id)
+                    break
+                if segment == '+':
+                    node = node.setdefault('any', {})
+                else:
+                    node = node.setdefault('next', {}).setdefault(segment, {})
+            else:
+                node.setdefault('end', []).append(pattern_id)
+
+        return {
+            'patterns': patterns,
+            'groups': [{'patterns': list(ids), 'topics': paths} for ids, paths in groups.items()],
+            'trie': trie
+        }
+
+    @tracer.traced()
     def generate_component(self, component_name: str, component_type: str,
-                         visualization: str = None) -> str:
+                         visualization: str = None, params: Dict[str, Any] = None) -> str:
         """Generate React component code based on type and visualization needs"""
-        self.logger.info(f"Generating component: {component_name}", {
+        self.logger.debug(f"Generating component: {component_name}", {
             "type": component_type,
             "visualization": visualization
         })
 
-        # Component templates based on type and visualization
-        if component_name == "KPICards":
-            return self._generate_kpi_cards()
-        elif component_name == "EquipmentGrid":
-            return self._generate_equipment_grid()
-        elif component_name == "AlertsPanel":
-            return self._generate_alerts_panel()
-        elif component_name == "ScheduleView":
-            return self._generate_schedule_view()
-        elif component_name == "ControlPanel":
-            return self._generate_control_panel()
-        elif component_name == "MessageFeed":
-            return self._generate_message_feed()
-        elif component_name == "MqttProvider":
-            return self._generate_mqtt_provider()
-        else:
-            return self._generate_default_component(component_name)
-
-    def _generate_kpi_cards(self) -> str:
-        """Generate KPI Cards component with chart visualization"""
-        return '''import React from 'react';
-import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
-import { TrendingUp, TrendingDown, Activity, Package } from 'lucide-react';
-
-interface KPIData {
-  activeJobs: number;
-  oee: number;
-  productionRate: number;
-  qualityRate: number;
-}
-
-export const KPICards: React.FC<{ data?: KPIData }> = ({ data }) => {
-  const kpis = [
-    {
-      title: '活跃任务',
-      value: data?.activeJobs || 0,
-      icon: Activity,
-      trend: 'up',
-      change: '+12%'
-    },
-    {
-      title: 'OEE',
-      value: `${data?.oee || 0}%`,
-      icon: TrendingUp,
-      trend: 'up',
-      change: '+3.2%'
-    },
-    {
-      title: '生产率',
-      value: `${data?.productionRate || 0}/h`,
-      icon: Package,
-      trend: 'down',
-      change: '-2.1%'
-    },
-    {
-      title: '质量率',
-      value: `${data?.qualityRate || 0}%`,
-      icon: TrendingUp,
-      trend: 'up',
-      change: '+1.5%'
-    }
-  ];
-
-  return (
-    <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-4">
-      {kpis.map((kpi, index) => (
-        <Card key={index}>
-          <CardHeader className="flex flex-row items-center justify-between pb-2 space-y-0">
-            <CardTitle className="text-sm font-medium">
-              {kpi.title}
-            </CardTitle>
-            <kpi.icon className="w-4 h-4 text-muted-foreground" />
-          </CardHeader>
-          <CardContent>
-            <div className="text-2xl font-bold">{kpi.value}</div>
-            <p className={`text-xs ${kpi.trend === 'up' ? 'text-green-600' : 'text-red-600'}`}>
-              {kpi.change} 较昨日
-            </p>
-          </CardContent>
-        </Card>
-      ))}
-    </div>
-  );
-};'''
-
-    def _generate_equipment_grid(self) -> str:
-        """Generate Equipment Grid component"""
-        return '''import React from 'react';
-import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
-import { Badge } from './ui/badge';
-
-interface Equipment {
-  id: string;
-  name: string;
-  status: 'idle' | 'running' | 'queued' | 'maintenance' | 'error';
-  currentJob?: string;
-  batchQty?: number;
-  operator?: string;
-}
-
-const statusColors = {
-  idle: 'bg-gray-200',
-  running: 'bg-green-500',
-  queued: 'bg-yellow-500',
-  maintenance: 'bg-orange-500',
-  error: 'bg-red-500'
-};
-
-const statusLabels = {
-  idle: '空闲',
-  running: '运行中',
-  queued: '排队中',
-  maintenance: '维护中',
-  error: '故障'
-};
-
-export const EquipmentGrid: React.FC<{ equipment?: Equipment[] }> = ({ equipment = [] }) => {
-  const defaultEquipment: Equipment[] = [
-    { id: 'LASER01', name: '激光切割机1', status: 'running', currentJob: 'JOB-001', batchQty: 100 },
-    { id: 'BEND01', name: '折弯机1', status: 'idle' },
-    { id: 'COAT01', name: '喷涂线1', status: 'queued', currentJob: 'JOB-002', batchQty: 50 },
-    { id: 'ASSY01', name: '装配线1', status: 'running', currentJob: 'JOB-003', batchQty: 75 },
-    { id: 'CUT01', name: '切线机1', status: 'maintenance' },
-    { id: 'CH01', name: '冷镦机1', status: 'running', currentJob: 'JOB-004', batchQty: 200 }
-  ];
-
-  const displayEquipment = equipment.length > 0 ? equipment : defaultEquipment;
-
-  return (
-    <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-4">
-      {displayEquipment.map((equip) => (
-        <Card key={equip.id} className="relative">
-          <div className={`absolute top-0 right-0 w-3 h-3 rounded-full m-2 ${statusColors[equip.status]}`} />
-          <CardHeader>
-            <CardTitle className="text-base">{equip.name}</CardTitle>
-            <Badge variant="outline">{statusLabels[equip.status]}</Badge>
-          </CardHeader>
-          <CardContent className="text-sm">
-            {equip.currentJob && (
-              <div>
-                <p className="font-medium">当前任务: {equip.currentJob}</p>
-                {equip.batchQty && <p>批量: {equip.batchQty}</p>}
-              </div>
-            )}
-            {!equip.currentJob && equip.status === 'idle' && (
-              <p className="text-muted-foreground">等待任务分配</p>
-            )}
-          </CardContent>
-        </Card>
-      ))}
-    </div>
-  );
-};'''
-
-    def _generate_alerts_panel(self) -> str:
-        """Generate Alerts Panel component"""
-        return '''import React from 'react';
-import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
-import { Alert, AlertDescription, AlertTitle } from './ui/alert';
-import { AlertCircle, AlertTriangle, Info } from 'lucide-react';
-
-interface AlertItem {
-  id: string;
-  timestamp: Date;
-  severity: 'critical' | 'warning' | 'info';
-  station: string;
-  description: string;
-  acknowledged: boolean;
-}
-
-const severityIcons = {
-  critical: AlertCircle,
-  warning: AlertTriangle,
-  info: Info
-};
-
-const severityColors = {
-  critical: 'border-red-500',
-  warning: 'border-yellow-500',
-  info: 'border-blue-500'
-};
-
-export const AlertsPanel: React.FC<{ alerts?: AlertItem[] }> = ({ alerts = [] }) => {
-  const defaultAlerts: AlertItem[] = [
-    {
-      id: '1',
-      timestamp: new Date(),
-      severity: 'critical',
-      station: 'COAT01',
-      description: '需要换色清洗',
-      acknowledged: false
-    },
-    {
-      id: '2',
-      timestamp: new Date(Date.now() - 600000),
-      severity: 'warning',
-      station: 'CH02',
-      description: '模具寿命接近上限',
-      acknowledged: false
-    },
-    {
-      id: '3',
-      timestamp: new Date(Date.now() - 1200000),
-      severity: 'info',
-      station: 'LASER01',
-      description: '计划维护提醒',
-      acknowledged: true
-    }
-  ];
-
-  const displayAlerts = alerts.length > 0 ? alerts : defaultAlerts;
-
-  return (
-    <Card>
-      <CardHeader>
-        <CardTitle>活动警报</CardTitle>
-      </CardHeader>
-      <CardContent className="space-y-2">
-        {displayAlerts.map((alert) => {
-          const Icon = severityIcons[alert.severity];
-          return (
-            <Alert key={alert.id} className={severityColors[alert.severity]}>
-              <Icon className="h-4 w-4" />
-              <AlertTitle>{alert.station}</AlertTitle>
-              <AlertDescription>
-                {alert.description}
-                <div className="text-xs text-muted-foreground mt-1">
-                  {alert.timestamp.toLocaleTimeString()}
-                </div>
-              </AlertDescription>
-            </Alert>
-          );
-        })}
-      </CardContent>
-    </Card>
-  );
-};'''
-
-    def _generate_schedule_view(self) -> str:
-        """Generate Schedule View component"""
-        return '''import React from 'react';
-import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
-import {
-  Table,
-  TableBody,
-  TableCell,
-  TableHead,
-  TableHeader,
-  TableRow,
-} from './ui/table';
-
-interface Job {
-  jobId: string;
-  orderId: string;
-  productId: string;
-  targetStation: string;
-  scheduledStart: Date;
-  scheduledEnd: Date;
-  batchQty: number;
-  changeover: boolean;
-}
-
-export const ScheduleView: React.FC<{ jobs?: Job[] }> = ({ jobs = [] }) => {
-  const defaultJobs: Job[] = [
-    {
-      jobId: 'JOB-001',
-      orderId: 'ORD-2024-001',
-      productId: 'P-PANEL1',
-      targetStation: 'LASER01',
-      scheduledStart: new Date(),
-      scheduledEnd: new Date(Date.now() + 3600000),
-      batchQty: 100,
-      changeover: false
-    },
-    {
-      jobId: 'JOB-002',
-      orderId: 'ORD-2024-002',
-      productId: 'P-M6',
-      targetStation: 'CH01',
-      scheduledStart: new Date(Date.now() + 3600000),
-      scheduledEnd: new Date(Date.now() + 7200000),
-      batchQty: 2000,
-      changeover: true
-    }
-  ];
-
-  const displayJobs = jobs.length > 0 ? jobs : defaultJobs;
-
-  return (
-    <Card>
-      <CardHeader>
-        <CardTitle>生产计划</CardTitle>
-      </CardHeader>
-      <CardContent>
-        <Table>
-          <TableHeader>
-            <TableRow>
-              <TableHead>任务ID</TableHead>
-              <TableHead>订单</TableHead>
-              <TableHead>产品</TableHead>
-              <TableHead>工站</TableHead>
-              <TableHead>计划开始</TableHead>
-              <TableHead>批量</TableHead>
-              <TableHead>换型</TableHead>
-            </TableRow>
-          </TableHeader>
-          <TableBody>
-            {displayJobs.map((job) => (
-              <TableRow key={job.jobId}>
-                <TableCell className="font-medium">{job.jobId}</TableCell>
-                <TableCell>{job.orderId}</TableCell>
-                <TableCell>{job.productId}</TableCell>
-                <TableCell>{job.targetStation}</TableCell>
-                <TableCell>{job.scheduledStart.toLocaleTimeString()}</TableCell>
-                <TableCell>{job.batchQty}</TableCell>
-                <TableCell>{job.changeover ? '是' : '否'}</TableCell>
-              </TableRow>
-            ))}
-          </TableBody>
-        </Table>
-      </CardContent>
-    </Card>
-  );
-};'''
-
-    def _generate_control_panel(self) -> str:
-        """Generate Control Panel component"""
-        return '''import React from 'react';
-import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
-import { Button } from './ui/button';
-import { Play, Send, RefreshCw, Settings } from 'lucide-react';
-
-interface ControlAction {
-  label: string;
-  action: string;
-  icon: React.ElementType;
-  variant?: 'default' | 'secondary' | 'destructive';
-}
-
-export const ControlPanel: React.FC<{ onAction?: (action: string) => void }> = ({ onAction }) => {
-  const actions: ControlAction[] = [
-    { label: '分派任务', action: 'dispatch', icon: Send, variant: 'default' },
-    { label: '开始任务', action: 'start', icon: Play, variant: 'default' },
-    { label: '换模', action: 'changeMold', icon: RefreshCw, variant: 'secondary' },
-    { label: '配置', action: 'configure', icon: Settings, variant: 'secondary' }
-  ];
-
-  const handleAction = (action: string) => {
-    console.log(`执行操作: ${action}`);
-    onAction?.(action);
-  };
-
-  return (
-    <Card>
-      <CardHeader>
-        <CardTitle>控制面板</CardTitle>
-      </CardHeader>
-      <CardContent className="grid grid-cols-2 gap-2">
-        {actions.map((action) => (
-          <Button
-            key={action.action}
-            variant={action.variant || 'default'}
-            onClick={() => handleAction(action.action)}
-            className="w-full"
-          >
-            <action.icon className="w-4 h-4 mr-2" />
-            {action.label}
-          </Button>
-        ))}
-      </CardContent>
-    </Card>
-  );
-};'''
-
-    def _generate_message_feed(self) -> str:
-        """Generate Message Feed component"""
-        return '''import React, { useState, useEffect } from 'react';
-import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
-import { ScrollArea } from './ui/scroll-area';
-import { Badge } from './ui/badge';
-
-interface Message {
-  id: string;
-  timestamp: Date;
-  topic: string;
-  payload: any;
-}
-
-export const MessageFeed: React.FC<{ messages?: Message[] }> = ({ messages = [] }) => {
-  const [displayMessages, setDisplayMessages] = useState<Message[]>([]);
-
-  useEffect(() => {
-    if (messages.length > 0) {
-      setDisplayMessages(messages.slice(-50)); // Keep last 50 messages
-    }
-  }, [messages]);
-
-  // Generate sample messages if none provided
-  useEffect(() => {
-    if (messages.length === 0) {
-      const sampleMessages: Message[] = [
-        {
-          id: '1',
-          timestamp: new Date(),
-          topic: 'v1/FY-Fab/sheet/LASER01/state/current-job',
-          payload: { job_id: 'JOB-001', status: 'running' }
-        },
-        {
-          id: '2',
-          timestamp: new Date(Date.now() - 1000),
-          topic: 'v1/FY-Fab/cold/CH01/metrics/count',
-          payload: { count: 150 }
-        },
-        {
-          id: '3',
-          timestamp: new Date(Date.now() - 2000),
-          topic: 'v1/FY-Fab/sched/state/queue-snapshot',
-          payload: { queued_jobs: 5, running_jobs: 3 }
-        }
-      ];
-      setDisplayMessages(sampleMessages);
-    }
-  }, [messages.length]);
-
-  return (
-    <Card className="h-[400px]">
-      <CardHeader>
-        <CardTitle>消息流</CardTitle>
-      </CardHeader>
-      <CardContent>
-        <ScrollArea className="h-[320px]">
-          <div className="space-y-2">
-            {displayMessages.map((msg) => (
-              <div key={msg.id} className="border rounded p-2 text-sm">
-                <div className="flex items-center justify-between mb-1">
-                  <Badge variant="outline" className="text-xs">
-                    {msg.timestamp.toLocaleTimeString()}
-                  </Badge>
-                  <span className="text-xs text-muted-foreground truncate ml-2">
-                    {msg.topic}
-                  </span>
-                </div>
-                <pre className="text-xs bg-muted p-1 rounded overflow-x-auto">
-                  {JSON.stringify(msg.payload, null, 2)}
-                </pre>
-              </div>
-            ))}
-          </div>
-        </ScrollArea>
-      </CardContent>
-    </Card>
-  );
-};'''
-
-    def _generate_mqtt_provider(self) -> str:
-        """Generate MQTT Provider component"""
-        return '''import React, { createContext, useContext, useState, useEffect, ReactNode } from 'react';
-import mqtt from 'mqtt';
-
-interface MqttContextType {
-  client: mqtt.MqttClient | null;
-  isConnected: boolean;
-  messages: any[];
-  subscribe: (topic: string) => void;
-  publish: (topic: string, message: any) => void;
-}
-
-const MqttContext = createContext<MqttContextType>({
-  client: null,
-  isConnected: false,
-  messages: [],
-  subscribe: () => {},
-  publish: () => {},
-});
-
-export const useMqtt = () => useContext(MqttContext);
-
-export const MqttProvider: React.FC<{ children: ReactNode }> = ({ children }) => {
-  const [client, setClient] = useState<mqtt.MqttClient | null>(null);
-  const [isConnected, setIsConnected] = useState(false);
-  const [messages, setMessages] = useState<any[]>([]);
-
-  useEffect(() => {
-    const mqttClient = mqtt.connect('ws://broker.hivemq.com:8884/mqtt', {
-      clientId: `dashboard-${Date.now()}`,
-      clean: true,
-      reconnectPeriod: 5000,
-    });
-
-    mqttClient.on('connect', () => {
-      console.log('MQTT Connected');
-      setIsConnected(true);
-
-      // Subscribe to default topics
-      mqttClient.subscribe('v1/FY-Fab/#', { qos: 0 });
-    });
-
-    mqttClient.on('message', (topic, payload) => {
-      const message = {
-        id: Date.now().toString(),
-        timestamp: new Date(),
-        topic,
-        payload: JSON.parse(payload.toString()),
-      };
-
-      setMessages((prev) => [...prev.slice(-49), message]);
-    });
-
-    mqttClient.on('error', (err) => {
-      console.error('MQTT Error:', err);
-    });
-
-    mqttClient.on('close', () => {
-      setIsConnected(false);
-    });
-
-    setClient(mqttClient);
-
-    return () => {
-      mqttClient.end();
-    };
-  }, []);
-
-  const subscribe = (topic: string) => {
-    if (client) {
-      client.subscribe(topic, { qos: 0 });
-    }
-  };
-
-  const publish = (topic: string, message: any) => {
-    if (client) {
-      client.publish(topic, JSON.stringify(message), { qos: 1 });
-    }
-  };
-
-  return (
-    <MqttContext.Provider value={{ client, isConnected, messages, subscribe, publish }}>
-      {children}
-    </MqttContext.Provider>
-  );
-};'''
-
-    def _generate_default_component(self, name: str) -> str:
-        """Generate a default component template"""
-        return f'''import React from 'react';
-
-export const {name}: React.FC = () => {{
-  return (
-    <div className="p-4 border rounded">
-      <h2 className="text-lg font-semibold">{name} Component</h2>
-      <p className="text-muted-foreground">Component implementation pending</p>
-    </div>
-  );
-}};'''
+        template = self.COMPONENT_TEMPLATES.get(component_name, self.DEFAULT_COMPONENT_TEMPLATE)
+        if params is None:
+            params = self.render_params({})
+        return self.templates.render(template, name=component_name, **params)
 
+    @tracer.traced()
     def create_app_structure(self, requirements: Dict, plan: List[Dict]) -> bool:
         """Create the complete app structure with all components"""
         self.logger.step("Creating application structure")
 
         try:
-            # Create directories
-            src_dir = os.path.join(self.app_dir, 'src')
-            components_dir = os.path.join(src_dir, 'components')
-            ui_dir = os.path.join(components_dir, 'ui')
-
-            os.makedirs(components_dir, exist_ok=True)
-            os.makedirs(ui_dir, exist_ok=True)
+            params = self.render_params(requirements)
 
             # Generate main components
-            components_to_generate = [
-                ('MqttProvider', 'provider', None),
-                ('KPICards', 'metrics', 'numeric_display'),
-                ('EquipmentGrid', 'grid', 'status_grid'),
-                ('AlertsPanel', 'alerts', 'list_with_severity'),
-                ('ScheduleView', 'schedule', 'data_table'),
-                ('ControlPanel', 'controls', None),
-                ('MessageFeed', 'feed', 'scrollable_feed')
-            ]
-
-            for comp_name, comp_type, visualization in components_to_generate:
-                code = self.generate_component(comp_name, comp_type, visualization)
-                file_path = os.path.join(components_dir, f'{comp_name}.tsx')
-
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(code)
-
-                self.logger.info(f"Created component: {comp_name}")
+            files = {}
+            for comp_name, comp_type, visualization in self.COMPONENTS:
+                code = self.generate_component(comp_name, comp_type, visualization, params)
+                files[f'src/components/{comp_name}.tsx'] = code
 
             # Create main App component
-            app_code = self._generate_main_app()
-            with open(os.path.join(src_dir, 'App.tsx'), 'w', encoding='utf-8') as f:
-                f.write(app_code)
+            files['src/App.tsx'] = self.templates.render('App.tsx', **params)
 
             # Create UI components (shadcn/ui style)
-            self._create_ui_components(ui_dir)
+            for filename in self.UI_COMPONENT_FILES:
+                files[f'src/components/ui/{filename}'] = self.templates.render(f'ui/{filename}')
+            for filename in self.LIB_FILES:
+                files[f'src/lib/{filename}'] = self.templates.render(f'lib/{filename}', **params)
+            self.logger.debug("Template renders", lambda: self.templates.stats())
+
+            # Only touch files whose content changed so build caches stay warm
+            manifest = FileManifest(self.app_dir)
+            stats = manifest.sync(files)
+            self.changed_files = manifest.written
+            self.logger.info("Synced generated files", {**stats, "changed": manifest.written})
 
             self.logger.success("Application structure created successfully")
             return True
@@ -896,389 +2051,198 @@ export const {name}: React.FC = () => {{
             self.logger.error(f"Failed to create app structure", {"error": str(e)})
             return False
 
-    def _generate_main_app(self) -> str:
-        """Generate the main App component"""
-        return '''import React from 'react';
-import { MqttProvider, useMqtt } from './components/MqttProvider';
-import { KPICards } from './components/KPICards';
-import { EquipmentGrid } from './components/EquipmentGrid';
-import { AlertsPanel } from './components/AlertsPanel';
-import { ScheduleView } from './components/ScheduleView';
-import { ControlPanel } from './components/ControlPanel';
-import { MessageFeed } from './components/MessageFeed';
-
-const DashboardContent: React.FC = () => {
-  const { isConnected, messages } = useMqtt();
-
-  return (
-    <div className="min-h-screen bg-gray-50">
-      {/* Header */}
-      <header className="bg-white shadow-sm border-b">
-        <div className="px-4 py-4 sm:px-6 lg:px-8">
-          <div className="flex items-center justify-between">
-            <h1 className="text-2xl font-bold text-gray-900">
-              FY-Fab 生产监控仪表板
-            </h1>
-            <div className="flex items-center gap-2">
-              <div className={`w-2 h-2 rounded-full ${isConnected ? 'bg-green-500' : 'bg-red-500'}`} />
-              <span className="text-sm text-gray-600">
-                {isConnected ? '已连接' : '未连接'}
-              </span>
-            </div>
-          </div>
-        </div>
-      </header>
-
-      {/* Main Content */}
-      <main className="p-4 sm:p-6 lg:p-8 space-y-6">
-        {/* KPI Cards */}
-        <section>
-          <h2 className="text-lg font-semibold mb-4">关键绩效指标</h2>
-          <KPICards />
-        </section>
-
-        {/* Equipment Grid and Alerts */}
-        <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
-          <div className="lg:col-span-2">
-            <h2 className="text-lg font-semibold mb-4">设备状态</h2>
-            <EquipmentGrid />
-          </div>
-          <div>
-            <h2 className="text-lg font-semibold mb-4">警报</h2>
-            <AlertsPanel />
-          </div>
-        </div>
-
-        {/* Schedule and Controls */}
-        <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
-          <div className="lg:col-span-2">
-            <ScheduleView />
-          </div>
-          <div>
-            <ControlPanel />
-          </div>
-        </div>
-
-        {/* Message Feed */}
-        <section>
-          <h2 className="text-lg font-semibold mb-4">实时消息</h2>
-          <MessageFeed messages={messages} />
-        </section>
-      </main>
-    </div>
-  );
-};
-
-function App() {
-  return (
-    <MqttProvider>
-      <DashboardContent />
-    </MqttProvider>
-  );
-}
-
-export default App;'''
-
-    def _create_ui_components(self, ui_dir: str):
-        """Create basic UI components (shadcn/ui style)"""
-        self.logger.info("Creating UI components")
-
-        # Card component
-        card_code = '''import React from 'react';
-
-export const Card = React.forwardRef<
-  HTMLDivElement,
-  React.HTMLAttributes<HTMLDivElement>
->(({ className = '', ...props }, ref) => (
-  <div
-    ref={ref}
-    className={`rounded-lg border bg-card text-card-foreground shadow-sm ${className}`}
-    {...props}
-  />
-));
-
-export const CardHeader = React.forwardRef<
-  HTMLDivElement,
-  React.HTMLAttributes<HTMLDivElement>
->(({ className = '', ...props }, ref) => (
-  <div
-    ref={ref}
-    className={`flex flex-col space-y-1.5 p-6 ${className}`}
-    {...props}
-  />
-));
-
-export const CardTitle = React.forwardRef<
-  HTMLParagraphElement,
-  React.HTMLAttributes<HTMLHeadingElement>
->(({ className = '', ...props }, ref) => (
-  <h3
-    ref={ref}
-    className={`text-2xl font-semibold leading-none tracking-tight ${className}`}
-    {...props}
-  />
-));
-
-export const CardContent = React.forwardRef<
-  HTMLDivElement,
-  React.HTMLAttributes<HTMLDivElement>
->(({ className = '', ...props }, ref) => (
-  <div ref={ref} className={`p-6 pt-0 ${className}`} {...props} />
-));'''
-
-        # Button component
-        button_code = '''import React from 'react';
-
-interface ButtonProps extends React.ButtonHTMLAttributes<HTMLButtonElement> {
-  variant?: 'default' | 'secondary' | 'destructive';
-}
-
-export const Button = React.forwardRef<HTMLButtonElement, ButtonProps>(
-  ({ className = '', variant = 'default', ...props }, ref) => {
-    const variants = {
-      default: 'bg-primary text-primary-foreground hover:bg-primary/90',
-      secondary: 'bg-secondary text-secondary-foreground hover:bg-secondary/80',
-      destructive: 'bg-destructive text-destructive-foreground hover:bg-destructive/90',
-    };
-
-    return (
-      <button
-        ref={ref}
-        className={`inline-flex items-center justify-center rounded-md text-sm font-medium ring-offset-background transition-colors focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-ring focus-visible:ring-offset-2 disabled:pointer-events-none disabled:opacity-50 h-10 px-4 py-2 ${variants[variant]} ${className}`}
-        {...props}
-      />
-    );
-  }
-);'''
-
-        # Badge component
-        badge_code = '''import React from 'react';
-
-interface BadgeProps extends React.HTMLAttributes<HTMLDivElement> {
-  variant?: 'default' | 'secondary' | 'destructive' | 'outline';
-}
-
-export const Badge: React.FC<BadgeProps> = ({
-  className = '',
-  variant = 'default',
-  ...props
-}) => {
-  const variants = {
-    default: 'border-transparent bg-primary text-primary-foreground',
-    secondary: 'border-transparent bg-secondary text-secondary-foreground',
-    destructive: 'border-transparent bg-destructive text-destructive-foreground',
-    outline: 'text-foreground',
-  };
-
-  return (
-    <div
-      className={`inline-flex items-center rounded-full border px-2.5 py-0.5 text-xs font-semibold transition-colors focus:outline-none focus:ring-2 focus:ring-ring focus:ring-offset-2 ${variants[variant]} ${className}`}
-      {...props}
-    />
-  );
-};'''
-
-        # Alert component
-        alert_code = '''import React from 'react';
-
-export const Alert = React.forwardRef<
-  HTMLDivElement,
-  React.HTMLAttributes<HTMLDivElement>
->(({ className = '', ...props }, ref) => (
-  <div
-    ref={ref}
-    role="alert"
-    className={`relative w-full rounded-lg border p-4 [&>svg]:absolute [&>svg]:left-4 [&>svg]:top-4 [&>svg+div]:translate-y-[-3px] [&:has(svg)]:pl-11 ${className}`}
-    {...props}
-  />
-));
-
-export const AlertTitle = React.forwardRef<
-  HTMLParagraphElement,
-  React.HTMLAttributes<HTMLHeadingElement>
->(({ className = '', ...props }, ref) => (
-  <h5
-    ref={ref}
-    className={`mb-1 font-medium leading-none tracking-tight ${className}`}
-    {...props}
-  />
-));
-
-export const AlertDescription = React.forwardRef<
-  HTMLParagraphElement,
-  React.HTMLAttributes<HTMLParagraphElement>
->(({ className = '', ...props }, ref) => (
-  <div
-    ref={ref}
-    className={`text-sm [&_p]:leading-relaxed ${className}`}
-    {...props}
-  />
-));'''
-
-        # Table component
-        table_code = '''import React from 'react';
-
-export const Table = React.forwardRef<
-  HTMLTableElement,
-  React.HTMLAttributes<HTMLTableElement>
->(({ className = '', ...props }, ref) => (
-  <div className="w-full overflow-auto">
-    <table
-      ref={ref}
-      className={`w-full caption-bottom text-sm ${className}`}
-      {...props}
-    />
-  </div>
-));
-
-export const TableHeader = React.forwardRef<
-  HTMLTableSectionElement,
-  React.HTMLAttributes<HTMLTableSectionElement>
->(({ className = '', ...props }, ref) => (
-  <thead ref={ref} className={`[&_tr]:border-b ${className}`} {...props} />
-));
-
-export const TableBody = React.forwardRef<
-  HTMLTableSectionElement,
-  React.HTMLAttributes<HTMLTableSectionElement>
->(({ className = '', ...props }, ref) => (
-  <tbody
-    ref={ref}
-    className={`[&_tr:last-child]:border-0 ${className}`}
-    {...props}
-  />
-));
-
-export const TableRow = React.forwardRef<
-  HTMLTableRowElement,
-  React.HTMLAttributes<HTMLTableRowElement>
->(({ className = '', ...props }, ref) => (
-  <tr
-    ref={ref}
-    className={`border-b transition-colors hover:bg-muted/50 data-[state=selected]:bg-muted ${className}`}
-    {...props}
-  />
-));
-
-export const TableHead = React.forwardRef<
-  HTMLTableCellElement,
-  React.ThHTMLAttributes<HTMLTableCellElement>
->(({ className = '', ...props }, ref) => (
-  <th
-    ref={ref}
-    className={`h-12 px-4 text-left align-middle font-medium text-muted-foreground [&:has([role=checkbox])]:pr-0 ${className}`}
-    {...props}
-  />
-));
-
-export const TableCell = React.forwardRef<
-  HTMLTableCellElement,
-  React.TdHTMLAttributes<HTMLTableCellElement>
->(({ className = '', ...props }, ref) => (
-  <td
-    ref={ref}
-    className={`p-4 align-middle [&:has([role=checkbox])]:pr-0 ${className}`}
-    {...props}
-  />
-));'''
-
-        # ScrollArea component
-        scroll_area_code = '''import React from 'react';
-
-export const ScrollArea: React.FC<React.HTMLAttributes<HTMLDivElement>> = ({
-  className = '',
-  children,
-  ...props
-}) => (
-  <div
-    className={`relative overflow-auto ${className}`}
-    {...props}
-  >
-    {children}
-  </div>
-);'''
-
-        # Write UI component files
-        ui_components = {
-            'card.tsx': card_code,
-            'button.tsx': button_code,
-            'badge.tsx': badge_code,
-            'alert.tsx': alert_code,
-            'table.tsx': table_code,
-            'scroll-area.tsx': scroll_area_code
-        }
-
-        for filename, code in ui_components.items():
-            file_path = os.path.join(ui_dir, filename)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(code)
-            self.logger.info(f"Created UI component: {filename}")
-
-    def test_application(self) -> bool:
-        """Run tests on the generated application"""
+    @tracer.traced()
+    def test_application(self, force_build: bool = False) -> bool:
+        """Validate the generated application: syntax, type-check, then build"""
         self.logger.step("Testing generated application")
 
+        validator = BuildValidator(self.logger, self.app_dir, generated_files=self.generated_paths())
         try:
-            os.chdir(self.app_dir)
-
-            # Run build to check for compilation errors
-            result = subprocess.run(['npm', 'run', 'build'],
-                                  capture_output=True,
-                                  text=True,
-                                  timeout=60)
-
-            if result.returncode == 0:
-                self.logger.success("Application built successfully")
-                os.chdir('..')
-                return True
-            else:
-                self.logger.error("Build failed", {
-                    "stdout": result.stdout[-1000:],
-                    "stderr": result.stderr[-1000:]
-                })
-                os.chdir('..')
-                return False
-
-        except subprocess.TimeoutExpired:
-            self.logger.error("Build timeout")
-            os.chdir('..')
+            passed = validator.run(self.changed_files, force_build=force_build)
+        except subprocess.TimeoutExpired as e:
+            self.logger.error("Validation stalled", {"cmd": str(e.cmd), "idle_seconds": e.timeout})
             return False
         except Exception as e:
             self.logger.error(f"Test failed", {"error": str(e)})
-            os.chdir('..')
             return False
+        finally:
+            validator.report()
 
-def main():
-    """Main workflow execution"""
-    logger = Logger()
-    logger.info("===== Starting Agent Workflow =====")
+        if passed:
+            self.logger.success("Application built successfully")
+        else:
+            failed = [tier for tier, r in validator.results.items() if r['status'] == 'failed']
+            self.logger.error("Validation failed", {
+                tier: validator.results[tier]['errors'] for tier in failed
+            })
+        return passed
+
+class StageScheduler:
+    """Runs workflow stages as a dependency graph with maximal safe concurrency"""
+
+    def __init__(self, logger: Logger, max_workers: int = None):
+        self.logger = logger
+        self.max_workers = max_workers
+        self.stages = {}
+        self.results = {}
+        self.status = {}
+        self.errors = {}
+        self.timings = {}
+
+    def add(self, name: str, func, deps: List[str] = None, required: bool = True,
+            failure_message: str = None):
+        """Register a stage. A stage fails when it raises or returns a falsy value.
+
+        Dependents of a failed required stage are skipped; dependents of a failed
+        optional stage still run.
+        """
+        for dep in deps or []:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self.stages[name] = {
+            'func': func,
+            'deps': list(deps or []),
+            'required': required,
+            'failure_message': failure_message
+        }
+
+    def _run_stage(self, name: str):
+        self.timings[name] = [time.perf_counter() - self._t0, None]
+        try:
+            with tracer.span(name, 'stage'):
+                return self.stages[name]['func']()
+        finally:
+            self.timings[name][1] = time.perf_counter() - self._t0
+
+    def _blocked(self, name: str) -> bool:
+        return any(self.status[dep] != 'ok' and self.stages[dep]['required']
+                   for dep in self.stages[name]['deps'])
+
+    def run(self) -> Dict[str, str]:
+        """Run all stages, starting each as soon as its dependencies have finished"""
+        self._t0 = time.perf_counter()
+        pending = dict.fromkeys(self.stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers or len(self.stages)) as pool:
+            while pending or running:
+                for name in list(pending):
+                    deps = self.stages[name]['deps']
+                    if not all(dep in self.status for dep in deps):
+                        continue
+                    del pending[name]
+                    if self._blocked(name):
+                        self.status[name] = 'skipped'
+                        continue
+                    running[pool.submit(self._run_stage, name)] = name
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                        ok = bool(self.results[name])
+                    except Exception as e:
+                        self.errors[name] = e
+                        ok = False
+                    self.status[name] = 'ok' if ok else 'failed'
+
+                    if not ok and not self.stages[name]['required']:
+                        self.logger.error(self.stages[name]['failure_message']
+                                          or f"Stage {name} failed, continuing anyway...")
+
+        return self.status
+
+    def critical_path(self) -> List[str]:
+        """Walk back from the last stage to finish through its latest-finishing dependency"""
+        finished = [name for name in self.timings if self.timings[name][1] is not None]
+        if not finished:
+            return []
+
+        path = [max(finished, key=lambda n: self.timings[n][1])]
+        while True:
+            deps = [d for d in self.stages[path[-1]]['deps'] if d in self.timings]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda n: self.timings[n][1]))
+        return list(reversed(path))
+
+    def report(self):
+        """Log per-stage timings and the critical path that bounded wall-clock time"""
+        path = self.critical_path()
+        wall = max((end for _, end in self.timings.values()), default=0.0)
+
+        lines = [f"{'stage':<12} {'status':<8} {'start':>8} {'end':>8} {'duration':>9}  critical"]
+        for name in self.stages:
+            start, end = self.timings.get(name, [None, None])
+            if start is None:
+                lines.append(f"{name:<12} {self.status.get(name, 'pending'):<8} {'-':>8} {'-':>8} {'-':>9}")
+                continue
+            marker = '*' if name in path else ''
+            lines.append(f"{name:<12} {self.status[name]:<8} {start:>7.2f}s {end:>7.2f}s "
+                         f"{end - start:>8.2f}s  {marker}")
+
+        bounding = max(path, key=lambda n: self.timings[n][1] - self.timings[n][0]) if path else None
+        self.logger.info("Stage timings\n" + "\n".join(lines), {
+            "wall_clock": round(wall, 2),
+            "critical_path": path,
+            "bounding_stage": bounding
+        })
+
+def run_pipeline(logger: Logger, artifacts_dir: str = 'artifacts', template_dir: str = 'template',
+                 app_dir: str = 'new-app', force_build: bool = False,
+                 generator_options: Dict[str, Any] = None, store_options: Dict[str, Any] = None) -> int:
+    """Analyze, generate, install and build one dashboard into app_dir
 
+    generator_options are extra AppGenerator keyword arguments (ingest mode etc.),
+    store_options extra DependencyStore ones (link mode, offline).
+    """
     try:
-        # Step 1: Analyze artifacts
-        analyzer = ArtifactsAnalyzer(logger)
-        specs = analyzer.read_artifacts('artifacts')
-        requirements = analyzer.analyze_requirements()
-        plan = analyzer.generate_implementation_plan(requirements)
-
-        # Step 2: Setup new app
-        generator = AppGenerator(logger)
-        app_dir = generator.setup_new_app()
-
-        # Step 3: Install dependencies
-        if not generator.install_dependencies():
-            logger.error("Failed to install dependencies, continuing anyway...")
-
-        # Step 4: Create app structure
-        if not generator.create_app_structure(requirements, plan):
+        analyzer = ArtifactsAnalyzer(logger, cache=AnalysisCache())
+        store = DependencyStore(**(store_options or {}))
+        generator = AppGenerator(logger, template_dir=template_dir, dependency_store=store,
+                                 target_dir=app_dir, **(generator_options or {}))
+        scheduler = StageScheduler(logger)
+
+        def analyze():
+            analyzer.read_artifacts(artifacts_dir)
+            requirements = analyzer.analyze_requirements()
+            plan = analyzer.generate_implementation_plan(requirements)
+            return requirements, plan
+
+        def create_structure():
+            requirements, plan = scheduler.results['analyze']
+            return generator.create_app_structure(requirements, plan)
+
+        # Dependency install and structure generation touch disjoint files
+        scheduler.add('analyze', analyze)
+        scheduler.add('setup', generator.setup_new_app)
+        scheduler.add('install', generator.install_dependencies, ['setup'], required=False,
+                      failure_message="Failed to install dependencies, continuing anyway...")
+        scheduler.add('structure', create_structure, ['analyze', 'setup'])
+        scheduler.add('build', functools.partial(generator.test_application, force_build=force_build),
+                      ['install', 'structure'])
+
+        status = scheduler.run()
+        scheduler.report()
+
+        if scheduler.errors:
+            name, error = next(iter(scheduler.errors.items()))
+            logger.error(f"Workflow failed: {str(error)}", {"stage": name})
+            return 1
+
+        if status['structure'] != 'ok':
             logger.error("Failed to create app structure")
             return 1
 
-        # Step 5: Test application
-        if generator.test_application():
+        if status['build'] == 'ok':
             logger.success("===== Workflow Completed Successfully =====")
-            logger.info("Application generated at: new-app/")
+            logger.info(f"Application generated at: {app_dir}/")
             logger.info("To start the application:")
-            logger.info("  cd new-app")
+            logger.info(f"  cd {app_dir}")
             logger.info("  npm run dev")
             return 0
         else:
@@ -1290,5 +2254,239 @@ def main():
         logger.error(f"Workflow failed: {str(e)}")
         return 1
 
+def run_batch_job(job: Dict[str, str]) -> Dict[str, Any]:
+    """Pool entry point: one dashboard, logged and built in its own directory
+
+    Uses only explicit paths, so any number of jobs can share one process.
+    """
+    started = time.time()
+    output_dir = job['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+    if job.get('trace'):
+        # Process pools run one job per worker at a time; drop the previous job's spans
+        tracer.spans.clear()
+
+    logger = Logger(log_file=os.path.join(output_dir, 'workflow.log'),
+                    level=os.environ.get('GEN_APP_LOG_LEVEL', 'INFO'),
+                    json_file=os.path.join(output_dir, 'workflow.jsonl'), console=False)
+    logger.info(f"===== Starting Agent Workflow: {job['name']} =====", job)
+    try:
+        exit_code = run_pipeline(logger, job['artifacts_dir'], job['template_dir'], job['app_dir'],
+                                 job.get('force_build', False), job.get('generator_options'),
+                                 job.get('store_options'))
+    finally:
+        if job.get('trace'):
+            tracer.export_chrome(job['trace'])
+        logger.close()
+
+    return {
+        'name': job['name'],
+        'exit_code': exit_code,
+        'seconds': round(time.time() - started, 2),
+        'app_dir': job['app_dir'],
+        'log': os.path.join(output_dir, 'workflow.log')
+    }
+
+class BatchRunner:
+    """Generates many dashboards at once from a pool of processes or threads
+
+    Thread mode keeps every generator in this process; all the heavy work is in
+    npm subprocesses and file I/O, so the GIL is rarely the bottleneck.
+    """
+
+    SUMMARY_FILE = 'batch-summary.json'
+    TRACE_FILE = 'batch-trace.json'
+    EXECUTORS = {'process': ProcessPoolExecutor, 'thread': ThreadPoolExecutor}
+
+    def __init__(self, logger: Logger, output_root: str, template_dir: str = 'template',
+                 max_workers: int = None, executor: str = 'process', force_build: bool = False,
+                 generator_options: Dict[str, Any] = None, store_options: Dict[str, Any] = None):
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}")
+        self.logger = logger
+        self.force_build = force_build
+        self.generator_options = generator_options or {}
+        self.store_options = store_options or {}
+        self.executor = executor
+        self.output_root = os.path.abspath(output_root)
+        self.template_dir = os.path.abspath(template_dir)
+        self.max_workers = max_workers or self.available_cores()
+        self.wall_clock = 0.0
+
+    @staticmethod
+    def available_cores() -> int:
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+
+    def jobs(self, artifact_dirs: List[str]) -> List[Dict[str, str]]:
+        """One job per artifacts directory, named after it and unique within the batch"""
+        jobs = []
+        names = Counter()
+        for artifacts_dir in artifact_dirs:
+            name = os.path.basename(os.path.normpath(os.path.abspath(artifacts_dir)))
+            names[name] += 1
+            if names[name] > 1:
+                name = f"{name}-{names[name]}"
+            output_dir = os.path.join(self.output_root, name)
+            jobs.append({
+                'name': name,
+                'artifacts_dir': os.path.abspath(artifacts_dir),
+                'template_dir': self.template_dir,
+                'output_dir': output_dir,
+                'app_dir': os.path.join(output_dir, 'new-app'),
+                'force_build': self.force_build,
+                'generator_options': self.generator_options,
+                'store_options': self.store_options,
+                # Threads share one tracer; their spans go to a single batch trace
+                'trace': os.path.join(output_dir, 'workflow-trace.json') if self.executor == 'process' else None
+            })
+        return jobs
+
+    def run(self, artifact_dirs: List[str]) -> List[Dict[str, Any]]:
+        jobs = self.jobs(artifact_dirs)
+        workers = max(1, min(self.max_workers, len(jobs)))
+        unit = 'processes' if self.executor == 'process' else 'threads'
+        self.logger.step(f"Generating {len(jobs)} dashboards with {workers} worker {unit}")
+
+        started = time.time()
+        results = []
+        with self.EXECUTORS[self.executor](max_workers=workers) as pool:
+            futures = {pool.submit(run_batch_job, job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Worker died or the job raised past run_pipeline; keep the rest going
+                    result = {'name': job['name'], 'exit_code': 1, 'error': str(e),
+                              'log': os.path.join(job['output_dir'], 'workflow.log')}
+                results.append(result)
+                if result['exit_code'] == 0:
+                    self.logger.success(f"{result['name']} built", {"seconds": result['seconds']})
+                else:
+                    self.logger.error(f"{result['name']} failed", {"log": result['log']})
+
+        self.wall_clock = time.time() - started
+        if self.executor == 'thread':
+            tracer.export_chrome(os.path.join(self.output_root, self.TRACE_FILE))
+        results.sort(key=lambda r: r['name'])
+        return results
+
+    def report(self, results: List[Dict[str, Any]]):
+        """Log a consolidated table and write it to the output root as JSON"""
+        width = max([len(r['name']) for r in results] + [3])
+        lines = [f"  {'job'.ljust(width)}  status  seconds"]
+        for r in results:
+            status = 'ok' if r['exit_code'] == 0 else 'failed'
+            seconds = f"{r['seconds']:7.2f}" if 'seconds' in r else '      -'
+            lines.append(f"  {r['name'].ljust(width)}  {status.ljust(6)}  {seconds}")
+
+        timed = [r['seconds'] for r in results if 'seconds' in r]
+        summary = {
+            'jobs': len(results),
+            'succeeded': sum(1 for r in results if r['exit_code'] == 0),
+            'failed': [r['name'] for r in results if r['exit_code'] != 0],
+            'wall_clock': round(self.wall_clock, 2),
+            'slowest_job': round(max(timed), 2) if timed else None,
+            'sum_of_jobs': round(sum(timed), 2)
+        }
+
+        os.makedirs(self.output_root, exist_ok=True)
+        with open(os.path.join(self.output_root, self.SUMMARY_FILE), 'w', encoding='utf-8') as f:
+            json.dump({**summary, 'results': results}, f, indent=2)
+
+        self.logger.info("Batch summary\n" + "\n".join(lines), summary)
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate dashboard applications from artifacts")
+    parser.add_argument('--batch', nargs='+', metavar='ARTIFACTS_DIR',
+                        help="generate one app per artifacts directory in a process pool")
+    parser.add_argument('--output', default='generated',
+                        help="batch output root; each job gets <output>/<artifacts dir name>/")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="workers for --batch (default: available cores)")
+    parser.add_argument('--executor', choices=sorted(BatchRunner.EXECUTORS), default='process',
+                        help="run --batch jobs in worker processes or in threads of this process")
+    parser.add_argument('--template', default='template', help="template app directory")
+    parser.add_argument('--setup-mode', choices=AppGenerator.SETUP_MODES, default='clone',
+                        help="create the app by cloning the template (reflinks where possible), "
+                             "by plain copies, or with setup-new-app.sh")
+    parser.add_argument('--full-build', action='store_true',
+                        help="run the production build even if syntax or type checks fail")
+    parser.add_argument('--link-mode', choices=DependencyStore.LINK_MODES, default='hardlink',
+                        help="how stored node_modules reach the app: hardlinked files or symlinked packages")
+    parser.add_argument('--offline', action='store_true',
+                        help="install only from the store's npm cache; fail instead of fetching")
+    parser.add_argument('--ingest', choices=AppGenerator.INGEST_MODES, default='simple',
+                        help="generated MqttProvider: per-message updates, ring buffer + coalesced flushes, "
+                             "or the same with connection and decoding in a Web Worker")
+    parser.add_argument('--flush-interval', type=int, default=0, metavar='MS',
+                        help="buffered/worker flush interval; 0 flushes once per animation frame")
+    parser.add_argument('--topic-history', type=int, default=0, metavar='N',
+                        help="values kept per topic in the generated store besides the latest")
+    parser.add_argument('--feed-retention', type=int, default=AppGenerator.MESSAGE_RETENTION, metavar='N',
+                        help="messages the generated feed keeps for troubleshooting")
+    parser.add_argument('--feed-max-mb', type=float, default=AppGenerator.FEED_MAX_BYTES / 2**20,
+                        metavar='MB', help="approximate memory budget of the feed; oldest evicted first")
+    parser.add_argument('--history-hours', type=float, default=AppGenerator.HISTORY_SECONDS / 3600,
+                        metavar='H', help="how far back the generated metric charts can look")
+    parser.add_argument('--history-points', type=int, default=AppGenerator.HISTORY_POINTS, metavar='N',
+                        help="points kept per metric series at most, whatever their age")
+    parser.add_argument('--instrument', action='store_true',
+                        help="record latency, decode, render and event-loop histograms in the generated app; "
+                             "Ctrl+Shift+D shows them and exports JSON")
+    return parser.parse_args(argv)
+
+def generator_options(args: argparse.Namespace) -> Dict[str, Any]:
+    return {'setup_mode': args.setup_mode, 'ingest_mode': args.ingest, 'flush_interval_ms': args.flush_interval,
+            'topic_history': args.topic_history, 'message_retention': args.feed_retention,
+            'feed_max_bytes': int(args.feed_max_mb * 2**20),
+            'history_seconds': int(args.history_hours * 3600), 'history_points': args.history_points,
+            'instrument': args.instrument}
+
+def store_options(args: argparse.Namespace) -> Dict[str, Any]:
+    return {'link_mode': args.link_mode, 'offline': args.offline}
+
+def batch_main(args: argparse.Namespace) -> int:
+    os.makedirs(args.output, exist_ok=True)
+    logger = Logger(log_file=os.path.join(args.output, 'batch.log'),
+                    level=os.environ.get('GEN_APP_LOG_LEVEL', 'INFO'))
+    logger.info("===== Starting Batch Workflow =====", {"artifacts": args.batch})
+
+    try:
+        runner = BatchRunner(logger, args.output, args.template, args.jobs, args.executor,
+                             args.full_build, generator_options(args), store_options(args))
+        results = runner.run(args.batch)
+        runner.report(results)
+        return 0 if all(r['exit_code'] == 0 for r in results) else 1
+    finally:
+        logger.close()
+
+def main(argv: List[str] = None):
+    """Main workflow execution"""
+    args = parse_args(argv)
+    try:
+        Logger.level_value(os.environ.get('GEN_APP_LOG_LEVEL', 'INFO'))
+    except ValueError as e:
+        sys.stderr.write(f"GEN_APP_LOG_LEVEL: {e}\n")
+        return 2
+    if args.batch:
+        return batch_main(args)
+
+    logger = Logger(level=os.environ.get('GEN_APP_LOG_LEVEL', 'INFO'), json_file='workflow.jsonl')
+    logger.info("===== Starting Agent Workflow =====")
+    tracemalloc.start()
+
+    try:
+        return run_pipeline(logger, template_dir=args.template, force_build=args.full_build,
+                            generator_options=generator_options(args), store_options=store_options(args))
+
+    finally:
+        tracemalloc.stop()
+        tracer.export_chrome('workflow-trace.json')
+        logger.info("Span summary (trace written to workflow-trace.json)\n" + tracer.summary())
+        logger.close()
+
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for the Agent Workflow
+Runs each stage of agent-workflow.py in isolation inside a throwaway workspace,
+with npm, node and setup-new-app.sh replaced by deterministic local stand-ins,
+and stores results as JSON baselines that later runs can be compared against.
+
+Usage:
+    python bench-workflow.py run [--repeat 5] [--filter analyze] [--output current.json]
+                                 [--baseline baseline.json] [--threshold 0.10]
+    python bench-workflow.py compare baseline.json current.json [--threshold 0.10]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import platform
+import importlib
+import statistics
+import contextlib
+from datetime import datetime
+from typing import Dict, List, Any, Callable
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVE_DIR = os.path.dirname(SCRIPT_DIR)
+
+sys.path.insert(0, SCRIPT_DIR)
+workflow = importlib.import_module('agent-workflow')
+
+RESULTS_VERSION = 1
+SPEC_SCALES = [1, 10, 100]
+
+# Stand-in for npm: installs a fixed fake package tree and "builds" by reading
+# every source file, so timings depend only on the generator's own work.
+NPM_STANDIN = '''#!{python}
+import json, os, sys
+
+FILES_PER_PACKAGE = 20
+
+def install(extra):
+    with open('package.json') as f:
+        manifest = json.load(f)
+    deps = manifest.setdefault('dependencies', {{}})
+    for name in extra:
+        deps.setdefault(name, '^1.0.0')
+    names = sorted(set(deps) | set(manifest.get('devDependencies', {{}})))
+    for name in names:
+        pkg_dir = os.path.join('node_modules', name)
+        os.makedirs(pkg_dir, exist_ok=True)
+        with open(os.path.join(pkg_dir, 'package.json'), 'w') as f:
+            json.dump({{'name': name, 'version': '1.0.0'}}, f)
+        for i in range(FILES_PER_PACKAGE):
+            with open(os.path.join(pkg_dir, f'file{{i}}.js'), 'w') as f:
+                f.write(f'module.exports = {{i}};\\n' * 32)
+    with open('package.json', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    with open('package-lock.json', 'w') as f:
+        json.dump({{'name': manifest.get('name'), 'lockfileVersion': 3,
+                   'packages': {{n: {{'version': '1.0.0'}} for n in names}}}}, f, indent=2)
+    print(f'added {{len(names)}} packages in 0s')
+
+def build():
+    modules = 0
+    chunks = []
+    for root, _, files in os.walk('src'):
+        for name in sorted(files):
+            if name.endswith(('.ts', '.tsx')):
+                with open(os.path.join(root, name), encoding='utf-8') as f:
+                    chunks.append(f.read())
+                modules += 1
+    os.makedirs(os.path.join('dist', 'assets'), exist_ok=True)
+    with open(os.path.join('dist', 'assets', 'index.js'), 'w', encoding='utf-8') as f:
+        f.write('\\n'.join(chunks))
+    print(f'\\u2713 {{modules}} modules transformed.')
+
+args = sys.argv[1:]
+if args[:1] == ['--version']:
+    print('10.8.2')
+elif args[:1] == ['install']:
+    install([a for a in args[1:] if not a.startswith('-') and not os.path.isabs(a)])
+elif args[:2] == ['run', 'build']:
+    build()
+'''
+
+NODE_STANDIN = '''#!/bin/sh
+echo "v20.0.0-bench"
+'''
+
+SETUP_STANDIN = '''#!/bin/sh
+cp -r template new-app
+cd new-app
+cp .env.example .env
+'''
+
+class BenchmarkWorkspace:
+    """Throwaway copy of the archive layout with stand-in tools on PATH"""
+
+    def __init__(self):
+        self.root = tempfile.mkdtemp(prefix='gen-app-bench-')
+        self.bin_dir = os.path.join(self.root, 'bin')
+        self._saved_env = {}
+
+        shutil.copytree(os.path.join(ARCHIVE_DIR, 'template'), os.path.join(self.root, 'template'),
+                        ignore=shutil.ignore_patterns('node_modules', 'dist'))
+        shutil.copytree(os.path.join(ARCHIVE_DIR, 'artifacts'), os.path.join(self.root, 'artifacts'))
+
+        os.makedirs(self.bin_dir)
+        self._write_exec(os.path.join(self.bin_dir, 'npm'), NPM_STANDIN.format(python=sys.executable))
+        self._write_exec(os.path.join(self.bin_dir, 'node'), NODE_STANDIN)
+        self._write_exec(os.path.join(self.root, 'setup-new-app.sh'), SETUP_STANDIN)
+
+    @staticmethod
+    def _write_exec(path: str, content: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(path, 0o755)
+
+    def scaled_artifacts(self, scale: int) -> str:
+        """Artifacts dir whose specs are the real dashboard spec repeated `scale` times"""
+        target = os.path.join(self.root, f'artifacts-x{scale}')
+        if os.path.isdir(target):
+            return target
+
+        os.makedirs(target)
+        with open(os.path.join(ARCHIVE_DIR, 'artifacts', 'dashboard_spec.md'), encoding='utf-8') as f:
+            spec = f.read()
+        for name in ['dashboard_spec.md', 'PRD.md', 'product_config_spec.md']:
+            with open(os.path.join(target, name), 'w', encoding='utf-8') as f:
+                for _ in range(scale):
+                    f.write(spec)
+                    f.write('\n')
+        uns = os.path.join(ARCHIVE_DIR, 'artifacts', 'uns.json')
+        if os.path.exists(uns):
+            shutil.copyfile(uns, os.path.join(target, 'uns.json'))
+        return target
+
+    def logger(self):
+        return workflow.Logger(os.path.join(self.root, 'bench.log'), console=False)
+
+    def __enter__(self):
+        self._saved_env = {k: os.environ.get(k) for k in ('PATH', 'GEN_APP_CACHE')}
+        self._saved_cwd = os.getcwd()
+        os.environ['PATH'] = self.bin_dir + os.pathsep + os.environ.get('PATH', '')
+        os.environ['GEN_APP_CACHE'] = os.path.join(self.root, 'cache')
+        os.chdir(self.root)
+        return self
+
+    def __exit__(self, *exc):
+        os.chdir(self._saved_cwd)
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(self.root, ignore_errors=True)
+
+def _bench_read_artifacts(ws: BenchmarkWorkspace, scale: int):
+    artifacts = ws.scaled_artifacts(scale)
+    logger = ws.logger()
+
+    def run():
+        workflow.ArtifactsAnalyzer(logger).read_artifacts(artifacts)
+    return None, run
+
+def _bench_analyze(ws: BenchmarkWorkspace, scale: int):
+    artifacts = ws.scaled_artifacts(scale)
+    logger = ws.logger()
+    analyzer = workflow.ArtifactsAnalyzer(logger)
+
+    def setup():
+        analyzer.read_artifacts(artifacts)
+
+    def run():
+        analyzer.analyze_requirements()
+    return setup, run
+
+def _bench_setup(ws: BenchmarkWorkspace, mode: str):
+    generator = workflow.AppGenerator(ws.logger(), setup_mode=mode)
+
+    def run():
+        generator.setup_new_app()
+    return None, run
+
+def _bench_create_structure(ws: BenchmarkWorkspace, incremental: bool):
+    logger = ws.logger()
+    analyzer = workflow.ArtifactsAnalyzer(logger)
+    analyzer.read_artifacts('artifacts')
+    requirements = analyzer.analyze_requirements()
+    plan = analyzer.generate_implementation_plan(requirements)
+    generator = workflow.AppGenerator(logger)
+    generator.setup_new_app()
+
+    def setup():
+        manifest = os.path.join(generator.app_dir, workflow.FileManifest.FILENAME)
+        if incremental:
+            generator.create_app_structure(requirements, plan)
+        elif os.path.exists(manifest):
+            shutil.rmtree(os.path.join(generator.app_dir, 'src', 'components'))
+            os.remove(manifest)
+
+    def run():
+        generator.create_app_structure(requirements, plan)
+    return setup, run
+
+def _bench_main(ws: BenchmarkWorkspace):
+    def setup():
+        # The tracer is module-global; keep spans from piling up across iterations
+        workflow.tracer.spans.clear()
+
+    def run():
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            if workflow.main([]) != 0:
+                raise RuntimeError('main() failed inside benchmark workspace')
+    return setup, run
+
+def benchmark_cases() -> Dict[str, Callable]:
+    cases = {}
+    for scale in SPEC_SCALES:
+        cases[f'read_artifacts[x{scale}]'] = lambda ws, s=scale: _bench_read_artifacts(ws, s)
+        cases[f'analyze_requirements[x{scale}]'] = lambda ws, s=scale: _bench_analyze(ws, s)
+    cases['setup_new_app[clone]'] = lambda ws: _bench_setup(ws, 'clone')
+    cases['setup_new_app[script]'] = lambda ws: _bench_setup(ws, 'script')
+    cases['create_app_structure[fresh]'] = lambda ws: _bench_create_structure(ws, False)
+    cases['create_app_structure[incremental]'] = lambda ws: _bench_create_structure(ws, True)
+    cases['main'] = _bench_main
+    return cases
+
+def run_case(factory: Callable, repeat: int, warmup: int) -> Dict[str, Any]:
+    """Time one case in its own workspace; setup runs untimed before every iteration"""
+    with BenchmarkWorkspace() as ws:
+        setup, run = factory(ws)
+        timings = []
+        for i in range(warmup + repeat):
+            if setup:
+                setup()
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            if i >= warmup:
+                timings.append(elapsed)
+
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'max': max(timings),
+        'mean': statistics.mean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'runs': timings
+    }
+
+def run_benchmarks(repeat: int, warmup: int, name_filter: str = None) -> Dict[str, Any]:
+    results = {}
+    for name, factory in benchmark_cases().items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = run_case(factory, repeat, warmup)
+        print(f"{name:<40} median {results[name]['median'] * 1000:>10.2f}ms  "
+              f"min {results[name]['min'] * 1000:>10.2f}ms", flush=True)
+
+    return {
+        'version': RESULTS_VERSION,
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': f"{sys.platform}-{platform.machine()}",
+        'repeat': repeat,
+        'results': results
+    }
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Print a median-vs-median comparison; return the names of regressed cases"""
+    regressions = []
+    print(f"{'case':<40} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"{name:<40} {'-':>12} {result['median'] * 1000:>10.2f}ms {'new':>9}")
+            continue
+
+        change = result['median'] / base['median'] - 1 if base['median'] else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<40} {base['median'] * 1000:>10.2f}ms {result['median'] * 1000:>10.2f}ms "
+              f"{change:>+8.1%}{flag}")
+    return regressions
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != RESULTS_VERSION:
+        raise SystemExit(f"{path}: unsupported results version {data.get('version')}")
+    return data
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help='run the benchmark suite')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--warmup', type=int, default=1)
+    run_parser.add_argument('--filter', help='only run cases whose name contains this')
+    run_parser.add_argument('--output', help='write results JSON here (use as a baseline)')
+    run_parser.add_argument('--baseline', help='compare against this results JSON')
+    run_parser.add_argument('--threshold', type=float, default=0.10)
+
+    compare_parser = sub.add_parser('compare', help='compare two results files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10)
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        current = run_benchmarks(args.repeat, args.warmup, args.filter)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(current, f, indent=2)
+        if not args.baseline:
+            return 0
+        baseline = _load(args.baseline)
+    else:
+        baseline = _load(args.baseline)
+        current = _load(args.current)
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
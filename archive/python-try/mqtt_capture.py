@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+MQTT Capture Reader
+Memory-maps a .mqcap log written by archive/mqtt-recorder.js (the layout is
+documented at the top of that file). Messages are read in place: payloads are
+memoryview slices of the map, and a time range is located through the index
+chain instead of by scanning from the start.
+
+Usage:
+    python mqtt_capture.py info capture.mqcap
+    python mqtt_capture.py dump capture.mqcap [--from +60] [--to +120] [--limit 20]
+"""
+
+import sys
+import mmap
+import time
+import bisect
+import struct
+import argparse
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+MAGIC = b'MQCAP\x00'
+TRAILER_MAGIC = b'MQCAPEND'
+VERSION = 1
+
+RECORD_MESSAGE = 1
+RECORD_TOPIC = 2
+RECORD_INDEX = 3
+
+HEADER = struct.Struct('<6sHQ')
+MESSAGE = struct.Struct('<BQII')
+TOPIC = struct.Struct('<BIH')
+INDEX = struct.Struct('<BI')
+INDEX_BODY = struct.Struct('<QQQQI')
+TRAILER = struct.Struct('<8sQQ')
+UINT32 = struct.Struct('<I')
+TOPIC_ENTRY = struct.Struct('<IH')
+COUNT_ENTRY = struct.Struct('<II')
+
+class CaptureError(Exception):
+    pass
+
+class Chunk:
+    """A run of records between two index blocks"""
+
+    __slots__ = ('start', 'end', 'first_ts', 'last_ts', 'count', 'topic_counts')
+
+    def __init__(self, start: int, end: int, first_ts: int, last_ts: int, count: int,
+                 topic_counts: Dict[int, int]):
+        self.start = start
+        self.end = end
+        self.first_ts = first_ts
+        self.last_ts = last_ts
+        self.count = count
+        self.topic_counts = topic_counts
+
+class CapturedMessage:
+    """One message; payload is a view into the map and is only valid while the reader is open"""
+
+    __slots__ = ('timestamp_us', 'topic_id', 'payload', '_topics')
+
+    def __init__(self, timestamp_us: int, topic_id: int, payload: memoryview, topics: List[str]):
+        self.timestamp_us = timestamp_us
+        self.topic_id = topic_id
+        self.payload = payload
+        self._topics = topics
+
+    @property
+    def topic(self) -> str:
+        return self._topics[self.topic_id]
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_us / 1e6, tz=timezone.utc)
+
+class CaptureReader:
+    """Random access and time-range replay over one capture file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise CaptureError(f"{path}: empty file")
+        self._view = memoryview(self._map)
+
+        if len(self._map) < HEADER.size:
+            raise CaptureError(f"{path}: truncated header")
+        magic, version, created = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise CaptureError(f"{path}: not an MQTT capture")
+        if version != VERSION:
+            raise CaptureError(f"{path}: unsupported capture version {version}")
+        self.created_us = created
+
+        self.topics: List[str] = []
+        self.chunks: List[Chunk] = []
+        # Set when the file had no trailer and was rebuilt by scanning
+        self.recovered = False
+        if not self._load_index_chain():
+            self._scan()
+        self._chunk_last = [chunk.last_ts for chunk in self.chunks]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # payload views still alive; the map goes with the last of them
+        self._file.close()
+
+    def __len__(self) -> int:
+        return sum(chunk.count for chunk in self.chunks)
+
+    @property
+    def first_ts(self) -> Optional[int]:
+        return self.chunks[0].first_ts if self.chunks else None
+
+    @property
+    def last_ts(self) -> Optional[int]:
+        return self.chunks[-1].last_ts if self.chunks else None
+
+    def _set_topic(self, topic_id: int, name: str):
+        if topic_id >= len(self.topics):
+            self.topics.extend([''] * (topic_id + 1 - len(self.topics)))
+        self.topics[topic_id] = name
+
+    def _read_index(self, offset: int) -> Tuple[int, Chunk]:
+        """Parse the index block at offset; returns (previous index offset, chunk)"""
+        _, length = INDEX.unpack_from(self._map, offset)
+        body = offset + INDEX.size
+        previous, start, first_ts, last_ts, count = INDEX_BODY.unpack_from(self._map, body)
+        pos = body + INDEX_BODY.size
+
+        (topic_count,) = UINT32.unpack_from(self._map, pos)
+        pos += UINT32.size
+        for _ in range(topic_count):
+            topic_id, name_length = TOPIC_ENTRY.unpack_from(self._map, pos)
+            pos += TOPIC_ENTRY.size
+            self._set_topic(topic_id, bytes(self._view[pos:pos + name_length]).decode('utf-8'))
+            pos += name_length
+
+        (count_entries,) = UINT32.unpack_from(self._map, pos)
+        pos += UINT32.size
+        topic_counts = {}
+        for _ in range(count_entries):
+            topic_id, topic_messages = COUNT_ENTRY.unpack_from(self._map, pos)
+            topic_counts[topic_id] = topic_messages
+            pos += COUNT_ENTRY.size
+
+        if pos != body + length:
+            raise CaptureError(f"{self.path}: index block at {offset} is inconsistent")
+        return previous, Chunk(start, offset, first_ts, last_ts, count, topic_counts)
+
+    def _load_index_chain(self) -> bool:
+        """Walk index blocks backwards from the trailer; False if there is no usable trailer"""
+        size = len(self._map)
+        if size < HEADER.size + TRAILER.size:
+            return False
+        magic, last_index, _ = TRAILER.unpack_from(self._map, size - TRAILER.size)
+        if magic != TRAILER_MAGIC:
+            return False
+
+        offset = last_index
+        while offset:
+            offset, chunk = self._read_index(offset)
+            self.chunks.append(chunk)
+        self.chunks.reverse()
+        return True
+
+    def _scan(self):
+        """Rebuild the chunk list record by record, e.g. after the recorder crashed"""
+        self.recovered = True
+        size = len(self._map)
+        pos = HEADER.size
+        start = pos
+        first_ts = last_ts = count = 0
+        counts: Dict[int, int] = {}
+
+        while pos < size:
+            kind = self._map[pos]
+            if kind == RECORD_MESSAGE:
+                if pos + MESSAGE.size > size:
+                    break
+                _, timestamp, topic_id, length = MESSAGE.unpack_from(self._map, pos)
+                if pos + MESSAGE.size + length > size:
+                    break
+                if count == 0:
+                    first_ts = timestamp
+                last_ts = timestamp
+                count += 1
+                counts[topic_id] = counts.get(topic_id, 0) + 1
+                pos += MESSAGE.size + length
+            elif kind == RECORD_TOPIC:
+                if pos + TOPIC.size > size:
+                    break
+                _, topic_id, length = TOPIC.unpack_from(self._map, pos)
+                if pos + TOPIC.size + length > size:
+                    break
+                name = bytes(self._view[pos + TOPIC.size:pos + TOPIC.size + length])
+                self._set_topic(topic_id, name.decode('utf-8'))
+                pos += TOPIC.size + length
+            elif kind == RECORD_INDEX:
+                if pos + INDEX.size > size:
+                    break
+                _, length = INDEX.unpack_from(self._map, pos)
+                if pos + INDEX.size + length > size:
+                    break
+                _, chunk = self._read_index(pos)
+                self.chunks.append(chunk)
+                pos += INDEX.size + length
+                start = pos
+                count = 0
+                counts = {}
+            else:
+                break  # trailer or a torn write
+
+        if count:
+            self.chunks.append(Chunk(start, pos, first_ts, last_ts, count, counts))
+
+    def _records(self, chunk: Chunk) -> Iterator[CapturedMessage]:
+        pos = chunk.start
+        while pos < chunk.end:
+            kind = self._map[pos]
+            if kind == RECORD_MESSAGE:
+                _, timestamp, topic_id, length = MESSAGE.unpack_from(self._map, pos)
+                payload_start = pos + MESSAGE.size
+                pos = payload_start + length
+                yield CapturedMessage(timestamp, topic_id, self._view[payload_start:pos], self.topics)
+            elif kind == RECORD_TOPIC:
+                _, _, length = TOPIC.unpack_from(self._map, pos)
+                pos += TOPIC.size + length
+            else:
+                raise CaptureError(f"{self.path}: unexpected record {kind} at {pos}")
+
+    def messages(self, start_us: int = None, end_us: int = None) -> Iterator[CapturedMessage]:
+        """Messages with start_us <= timestamp < end_us, in file order"""
+        first = bisect.bisect_left(self._chunk_last, start_us) if start_us is not None else 0
+        for chunk in self.chunks[first:]:
+            if end_us is not None and chunk.first_ts >= end_us:
+                return
+            for message in self._records(chunk):
+                if start_us is not None and message.timestamp_us < start_us:
+                    continue
+                if end_us is not None and message.timestamp_us >= end_us:
+                    return
+                yield message
+
+    def timeline(self, start_us: int = None, end_us: int = None,
+                 speed: float = 1.0) -> Iterator[Tuple[float, CapturedMessage]]:
+        """(seconds after replay start when it is due, message); speed <= 0 means no pacing"""
+        origin = None
+        for message in self.messages(start_us, end_us):
+            if origin is None:
+                origin = message.timestamp_us
+            due = (message.timestamp_us - origin) / 1e6 / speed if speed > 0 else 0.0
+            yield due, message
+
+    def replay(self, start_us: int = None, end_us: int = None, speed: float = 1.0,
+               clock=time.monotonic, sleep=time.sleep) -> Iterator[CapturedMessage]:
+        """Yield messages at their recorded pace, sped up by `speed`"""
+        started = clock()
+        for due, message in self.timeline(start_us, end_us, speed):
+            delay = started + due - clock()
+            if delay > 0:
+                sleep(delay)
+            yield message
+
+    def topic_stats(self) -> List[Dict[str, Any]]:
+        """Per-topic message counts and average rates, from the index alone"""
+        totals: Dict[int, int] = {}
+        for chunk in self.chunks:
+            for topic_id, count in chunk.topic_counts.items():
+                totals[topic_id] = totals.get(topic_id, 0) + count
+        duration = (self.last_ts - self.first_ts) / 1e6 if self.chunks else 0.0
+        return sorted(
+            ({'topic': self.topics[topic_id], 'messages': count,
+              'mps': round(count / duration, 4) if duration > 0 else None}
+             for topic_id, count in totals.items()),
+            key=lambda item: item['messages'], reverse=True)
+
+    def parse_time(self, value: str) -> int:
+        """'+90' is seconds after the first message; anything else is an ISO timestamp"""
+        if value.startswith('+'):
+            return (self.first_ts or 0) + int(float(value[1:]) * 1e6)
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if moment.tzinfo is None:
+            moment = moment.astimezone()
+        return int(moment.timestamp() * 1e6)
+
+def _format_ts(timestamp_us: Optional[int]) -> str:
+    if timestamp_us is None:
+        return '-'
+    return datetime.fromtimestamp(timestamp_us / 1e6, tz=timezone.utc).isoformat(timespec='milliseconds')
+
+def info(reader: CaptureReader):
+    duration = (reader.last_ts - reader.first_ts) / 1e6 if reader.chunks else 0.0
+    print(f"{reader.path}: {len(reader)} messages, {len(reader.topics)} topics, {len(reader.chunks)} chunks"
+          f"{' (recovered, no trailer)' if reader.recovered else ''}")
+    print(f"  {_format_ts(reader.first_ts)} .. {_format_ts(reader.last_ts)} ({duration:.1f}s)")
+    print(f"\n{'topic':<60} {'messages':>10} {'msg/s':>10}")
+    for item in reader.topic_stats():
+        mps = f"{item['mps']:.3f}" if item['mps'] is not None else '-'
+        print(f"{item['topic']:<60} {item['messages']:>10} {mps:>10}")
+
+def dump(reader: CaptureReader, start_us: int, end_us: int, limit: int):
+    for i, message in enumerate(reader.messages(start_us, end_us)):
+        if limit and i >= limit:
+            break
+        print(f"{_format_ts(message.timestamp_us)} {message.topic} "
+              f"{bytes(message.payload).decode('utf-8', errors='replace')}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+    info_parser = sub.add_parser('info', help='counts, time span and per-topic rates')
+    info_parser.add_argument('capture')
+    dump_parser = sub.add_parser('dump', help='print messages in a time range')
+    dump_parser.add_argument('capture')
+    dump_parser.add_argument('--from', dest='start', help="ISO time or +seconds from the first message")
+    dump_parser.add_argument('--to', dest='end', help="ISO time or +seconds from the first message")
+    dump_parser.add_argument('--limit', type=int, default=0)
+    args = parser.parse_args()
+
+    with CaptureReader(args.capture) as reader:
+        if args.command == 'info':
+            info(reader)
+        else:
+            start = reader.parse_time(args.start) if args.start else None
+            end = reader.parse_time(args.end) if args.end else None
+            dump(reader, start, end, args.limit)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+import React from 'react';
+
+export const {{ name }}: React.FC = () => {
+  return (
+    <div className="p-4 border rounded">
+      <h2 className="text-lg font-semibold">{{ name }} Component</h2>
+      <p className="text-muted-foreground">Component implementation pending</p>
+    </div>
+  );
+};
@@ -0,0 +1,119 @@
+import React, { useEffect, useState } from 'react';
+import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
+import { Button } from './ui/button';
+import { INSTRUMENT, type HistogramSummary, diagnostics } from '../lib/diagnostics';
+
+// Hidden until Ctrl+Shift+D, or opened directly with #diagnostics in the URL
+const TOGGLE_KEY = 'D';
+const REFRESH_MS = 1000;
+
+type Snapshot = ReturnType<typeof diagnostics.snapshot>;
+
+const formatMs = (ms: number): string => (ms >= 100 ? ms.toFixed(0) : ms.toFixed(2));
+
+const HistogramRow: React.FC<{ label: string; h: HistogramSummary }> = ({ label, h }) => (
+  <tr className="border-t">
+    <td className="pr-3 py-1 font-medium">{label}</td>
+    <td className="px-2 text-right">{h.count}</td>
+    <td className="px-2 text-right">{formatMs(h.p50)}</td>
+    <td className="px-2 text-right">{formatMs(h.p90)}</td>
+    <td className="px-2 text-right">{formatMs(h.p99)}</td>
+    <td className="px-2 text-right">{formatMs(h.max)}</td>
+  </tr>
+);
+
+const exportJson = () => {
+  const blob = new Blob([JSON.stringify(diagnostics.snapshot(true), null, 2)], { type: 'application/json' });
+  const link = document.createElement('a');
+  link.href = URL.createObjectURL(blob);
+  link.download = `dashboard-diagnostics-${Date.now()}.json`;
+  link.click();
+  URL.revokeObjectURL(link.href);
+};
+
+const Panel: React.FC<{ onClose: () => void }> = ({ onClose }) => {
+  const [snapshot, setSnapshot] = useState<Snapshot>(() => diagnostics.snapshot());
+
+  useEffect(() => {
+    const timer = setInterval(() => setSnapshot(diagnostics.snapshot()), REFRESH_MS);
+    return () => clearInterval(timer);
+  }, []);
+
+  const renders = Object.entries(snapshot.renders).sort(([a], [b]) => a.localeCompare(b));
+
+  return (
+    <Card className="fixed bottom-4 right-4 z-50 w-[34rem] max-h-[80vh] overflow-auto shadow-lg">
+      <CardHeader>
+        <CardTitle className="flex items-center justify-between text-base">
+          <span>诊断 (ms)</span>
+          <div className="flex gap-2">
+            <Button variant="secondary" onClick={exportJson}>
+              导出 JSON
+            </Button>
+            <Button variant="secondary" onClick={() => diagnostics.reset()}>
+              重置
+            </Button>
+            <Button variant="secondary" onClick={onClose}>
+              关闭
+            </Button>
+          </div>
+        </CardTitle>
+      </CardHeader>
+      <CardContent className="text-xs space-y-4">
+        <table className="w-full">
+          <thead>
+            <tr className="text-muted-foreground">
+              <th className="text-left" />
+              <th className="px-2 text-right">n</th>
+              <th className="px-2 text-right">p50</th>
+              <th className="px-2 text-right">p90</th>
+              <th className="px-2 text-right">p99</th>
+              <th className="px-2 text-right">max</th>
+            </tr>
+          </thead>
+          <tbody>
+            <HistogramRow label="接收→提交" h={snapshot.latency} />
+            <HistogramRow label="解码" h={snapshot.decode} />
+            <HistogramRow label="事件循环延迟" h={snapshot.eventLoopLag} />
+            {renders.map(([id, h]) => (
+              <HistogramRow key={id} label={`渲染 ${id}`} h={h} />
+            ))}
+          </tbody>
+        </table>
+        {renders.length === 0 && (
+          // React only calls Profiler callbacks in development and profiling builds
+          <p className="text-muted-foreground">暂无渲染数据（生产构建需使用 react-dom/profiling）</p>
+        )}
+        {snapshot.ingest && (
+          <div className="grid grid-cols-4 gap-2">
+            {Object.entries(snapshot.ingest).map(([name, value]) => (
+              <div key={name}>
+                <p className="text-muted-foreground">{name}</p>
+                <p className="font-medium">{value}</p>
+              </div>
+            ))}
+          </div>
+        )}
+      </CardContent>
+    </Card>
+  );
+};
+
+export const DiagnosticsPanel: React.FC = () => {
+  const [open, setOpen] = useState(() => INSTRUMENT && window.location.hash === '#diagnostics');
+
+  useEffect(() => {
+    if (!INSTRUMENT) return;
+    const onKey = (event: KeyboardEvent) => {
+      if (event.ctrlKey && event.shiftKey && event.key.toUpperCase() === TOGGLE_KEY) {
+        event.preventDefault();
+        setOpen((value) => !value);
+      }
+    };
+    window.addEventListener('keydown', onKey);
+    return () => window.removeEventListener('keydown', onKey);
+  }, []);
+
+  if (!INSTRUMENT || !open) return null;
+  return <Panel onClose={() => setOpen(false)} />;
+};
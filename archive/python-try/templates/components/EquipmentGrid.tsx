@@ -0,0 +1,196 @@
+import React, { useCallback, useLayoutEffect, useMemo, useRef, useState } from 'react';
+import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
+import { Badge } from './ui/badge';
+import { TopicEntry, useTopicSelector } from '../lib/topicStore';
+import { topicsFor } from '../lib/subscriptions';
+
+const GRID_TOPICS = topicsFor('EquipmentGrid');
+// Station id's position in a topic: <prefix>/<area>/<station>/state/<field>
+const STATION_LEVEL = {{ station_level }};
+
+// Above this many stations only the rows in view (plus a little overscan) are rendered
+const WINDOW_THRESHOLD = 60;
+const ROW_HEIGHT = 176;
+const VIEWPORT_HEIGHT = 720;
+const MIN_CELL_WIDTH = 240;
+const GAP = 16;
+const OVERSCAN_ROWS = 2;
+
+interface Equipment {
+  id: string;
+  name: string;
+  status: 'idle' | 'running' | 'queued' | 'maintenance' | 'error';
+  currentJob?: string;
+  batchQty?: number;
+  operator?: string;
+}
+
+const statusColors = {
+  idle: 'bg-gray-200',
+  running: 'bg-green-500',
+  queued: 'bg-yellow-500',
+  maintenance: 'bg-orange-500',
+  error: 'bg-red-500'
+};
+
+const statusLabels = {
+  idle: '空闲',
+  running: '运行中',
+  queued: '排队中',
+  maintenance: '维护中',
+  error: '故障'
+};
+
+type StationState = Partial<Equipment>;
+
+const DEFAULT_EQUIPMENT: Equipment[] = {{ equipment|ts }};
+const NO_EQUIPMENT: Equipment[] = [];
+
+// Live job state per station, merged from current-job and batch-status topics
+const liveByStation = (entries: TopicEntry[]): Record<string, StationState> => {
+  const byStation: Record<string, StationState> = {};
+  for (const entry of entries) {
+    const station = entry.topic.split('/')[STATION_LEVEL];
+    const value = entry.value !== null && typeof entry.value === 'object' ? entry.value : {};
+    const live: StationState = { ...byStation[station] };
+    if (value.status in statusLabels) live.status = value.status;
+    if (value.job_id) live.currentJob = value.job_id;
+    if (value.batch_qty) live.batchQty = value.batch_qty;
+    byStation[station] = live;
+  }
+  return byStation;
+};
+
+const sameState = (a: StationState | undefined, b: StationState): boolean =>
+  a !== undefined && a.status === b.status && a.currentJob === b.currentJob && a.batchQty === b.batchQty;
+
+// Stations whose fields did not change keep their previous object, so their cells skip rendering
+const useStationStates = (): Record<string, StationState> => {
+  const previous = useRef<Record<string, StationState>>({});
+  const select = useCallback((entries: TopicEntry[]) => {
+    const next = liveByStation(entries);
+    for (const id in next) {
+      if (sameState(previous.current[id], next[id])) next[id] = previous.current[id];
+    }
+    previous.current = next;
+    return next;
+  }, []);
+  return useTopicSelector(GRID_TOPICS, select);
+};
+
+interface Merged {
+  base: Equipment;
+  live?: StationState;
+  value: Equipment;
+}
+
+// Base equipment overlaid with live state; unchanged stations reuse last render's object
+const useMergedStations = (base: Equipment[], live: Record<string, StationState>): Equipment[] => {
+  const merged = useRef(new Map<string, Merged>());
+  return useMemo(() => {
+    const next = new Map<string, Merged>();
+    const stations = base.map((equip) => {
+      const state = live[equip.id];
+      const hit = merged.current.get(equip.id);
+      const value =
+        hit && hit.base === equip && hit.live === state ? hit.value : state ? { ...equip, ...state } : equip;
+      next.set(equip.id, { base: equip, live: state, value });
+      return value;
+    });
+    merged.current = next;
+    return stations;
+  }, [base, live]);
+};
+
+const StationCell = React.memo(function StationCell({ equip }: { equip: Equipment }) {
+  return (
+    <Card className="relative h-full overflow-hidden">
+      <div className={`absolute top-0 right-0 w-3 h-3 rounded-full m-2 ${statusColors[equip.status]}`} />
+      <CardHeader>
+        <CardTitle className="text-base">{equip.name}</CardTitle>
+        <Badge variant="outline">{statusLabels[equip.status]}</Badge>
+      </CardHeader>
+      <CardContent className="text-sm">
+        {equip.currentJob && (
+          <div>
+            <p className="font-medium">当前任务: {equip.currentJob}</p>
+            {equip.batchQty && <p>批量: {equip.batchQty}</p>}
+          </div>
+        )}
+        {!equip.currentJob && equip.status === 'idle' && (
+          <p className="text-muted-foreground">等待任务分配</p>
+        )}
+      </CardContent>
+    </Card>
+  );
+});
+
+const WindowedGrid: React.FC<{ stations: Equipment[] }> = ({ stations }) => {
+  const viewport = useRef<HTMLDivElement>(null);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [columns, setColumns] = useState(4);
+
+  useLayoutEffect(() => {
+    const el = viewport.current;
+    if (!el) return;
+    const measure = () =>
+      setColumns(Math.max(1, Math.floor((el.clientWidth + GAP) / (MIN_CELL_WIDTH + GAP))));
+    measure();
+    const observer = new ResizeObserver(measure);
+    observer.observe(el);
+    return () => observer.disconnect();
+  }, []);
+
+  const rowCount = Math.ceil(stations.length / columns);
+  const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN_ROWS);
+  const last = Math.min(rowCount, Math.ceil((scrollTop + VIEWPORT_HEIGHT) / ROW_HEIGHT) + OVERSCAN_ROWS);
+
+  const rows: React.ReactNode[] = [];
+  for (let row = first; row < last; row++) {
+    rows.push(
+      <div
+        key={row}
+        className="absolute left-0 right-0 grid gap-4"
+        style={{
+          top: row * ROW_HEIGHT,
+          height: ROW_HEIGHT - GAP,
+          gridTemplateColumns: `repeat(${columns}, minmax(0, 1fr))`
+        }}
+      >
+        {stations.slice(row * columns, (row + 1) * columns).map((equip) => (
+          <StationCell key={equip.id} equip={equip} />
+        ))}
+      </div>
+    );
+  }
+
+  return (
+    <div
+      ref={viewport}
+      className="relative overflow-auto"
+      style={{ height: VIEWPORT_HEIGHT }}
+      onScroll={(event) => setScrollTop(event.currentTarget.scrollTop)}
+    >
+      <div className="relative" style={{ height: rowCount * ROW_HEIGHT }}>
+        {rows}
+      </div>
+    </div>
+  );
+};
+
+export const EquipmentGrid: React.FC<{ equipment?: Equipment[] }> = ({ equipment = NO_EQUIPMENT }) => {
+  const live = useStationStates();
+  const stations = useMergedStations(equipment.length > 0 ? equipment : DEFAULT_EQUIPMENT, live);
+
+  if (stations.length > WINDOW_THRESHOLD) {
+    return <WindowedGrid stations={stations} />;
+  }
+
+  return (
+    <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-4">
+      {stations.map((equip) => (
+        <StationCell key={equip.id} equip={equip} />
+      ))}
+    </div>
+  );
+};
@@ -0,0 +1,98 @@
+import React from 'react';
+import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
+import { TrendingUp, Activity, Package } from 'lucide-react';
+import { useTopicSelector } from '../lib/topicStore';
+import { topicsFor } from '../lib/subscriptions';
+import { type MetricChange, useMetricChange } from '../lib/metricHistory';
+
+const KPI_TOPICS = topicsFor('KPICards');
+// Trends compare against the oldest value recorded within this window
+const TREND_WINDOW_MS = 24 * 60 * 60 * 1000;
+const RUNNING_JOBS_METRIC = `${KPI_TOPICS[0] ?? ''}:running_jobs`;
+
+const HOUR_MS = 60 * 60 * 1000;
+
+// Labelled with the real age of the reference point, which is short right after startup
+const formatChange = (trend: MetricChange | null): string => {
+  if (trend === null) return '—';
+  // From a zero base a percentage means nothing; show the absolute change instead
+  const amount =
+    trend.change === null
+      ? `${trend.delta >= 0 ? '+' : ''}${Number(trend.delta.toFixed(2))}`
+      : `${trend.change >= 0 ? '+' : ''}${(trend.change * 100).toFixed(1)}%`;
+  if (trend.sinceMs >= TREND_WINDOW_MS - HOUR_MS) return `${amount} 较昨日`;
+  if (trend.sinceMs >= HOUR_MS) return `${amount} 较${Math.floor(trend.sinceMs / HOUR_MS)}小时前`;
+  return `${amount} 较${Math.max(1, Math.round(trend.sinceMs / 60000))}分钟前`;
+};
+
+interface KPIData {
+  activeJobs: number;
+  oee: number;
+  productionRate: number;
+  qualityRate: number;
+}
+
+export const KPICards: React.FC<{ data?: KPIData }> = ({ data }) => {
+  // The queue snapshot supplies a live running-job count; other updates are ignored
+  const runningJobs = useTopicSelector(
+    KPI_TOPICS,
+    (entries) => entries[0]?.value?.running_jobs as number | undefined
+  );
+  const runningJobsChange = useMetricChange(RUNNING_JOBS_METRIC, TREND_WINDOW_MS);
+
+  const kpis = [
+    {
+      title: '活跃任务',
+      value: data?.activeJobs || runningJobs || 0,
+      icon: Activity,
+      change: runningJobsChange
+    },
+    {
+      title: 'OEE',
+      value: `${data?.oee || 0}%`,
+      icon: TrendingUp,
+      change: null
+    },
+    {
+      title: '生产率',
+      value: `${data?.productionRate || 0}/h`,
+      icon: Package,
+      change: null
+    },
+    {
+      title: '质量率',
+      value: `${data?.qualityRate || 0}%`,
+      icon: TrendingUp,
+      change: null
+    }
+  ];
+
+  return (
+    <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-4">
+      {kpis.map((kpi, index) => (
+        <Card key={index}>
+          <CardHeader className="flex flex-row items-center justify-between pb-2 space-y-0">
+            <CardTitle className="text-sm font-medium">
+              {kpi.title}
+            </CardTitle>
+            <kpi.icon className="w-4 h-4 text-muted-foreground" />
+          </CardHeader>
+          <CardContent>
+            <div className="text-2xl font-bold">{kpi.value}</div>
+            <p
+              className={`text-xs ${
+                kpi.change === null
+                  ? 'text-muted-foreground'
+                  : kpi.change.delta >= 0
+                    ? 'text-green-600'
+                    : 'text-red-600'
+              }`}
+            >
+              {formatChange(kpi.change)}
+            </p>
+          </CardContent>
+        </Card>
+      ))}
+    </div>
+  );
+};
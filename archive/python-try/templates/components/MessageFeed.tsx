@@ -0,0 +1,175 @@
+import React, { useCallback, useLayoutEffect, useMemo, useRef, useState } from 'react';
+import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
+import { Badge } from './ui/badge';
+
+export interface Message {
+  id: string;
+  timestamp: Date;
+  topic: string;
+  payload: any;
+  raw?: string;
+}
+
+/** Read-only, oldest-first view of retained messages (the provider's ring) */
+export interface MessageSource {
+  size: number;
+  /** Sequence number of at(0); grows as old messages are evicted */
+  first: number;
+  version: number;
+  at(index: number): Message;
+}
+
+// Only the rows in view (plus a small overscan) exist in the DOM
+const ROW_HEIGHT = 48;
+const VIEWPORT_HEIGHT = 320;
+const OVERSCAN = 6;
+const PREVIEW_CHARS = 160;
+// Rows are placed by sequence number relative to a base that moves in steps
+// this big, so evictions shift one container instead of restyling every row
+const REBASE_ROWS = 4096;
+
+const sampleMessages: Message[] = [
+  {
+    id: '1',
+    timestamp: new Date(),
+    topic: '{{ topic_prefix }}/sheet/LASER01/state/current-job',
+    payload: { job_id: 'JOB-001', status: 'running' }
+  },
+  {
+    id: '2',
+    timestamp: new Date(Date.now() - 1000),
+    topic: '{{ topic_prefix }}/cold/CH01/metrics/count',
+    payload: { count: 150 }
+  },
+  {
+    id: '3',
+    timestamp: new Date(Date.now() - 2000),
+    topic: '{{ topic_prefix }}/sched/state/queue-snapshot',
+    payload: { queued_jobs: 5, running_jobs: 3 }
+  }
+];
+
+const sampleSource: MessageSource = {
+  size: sampleMessages.length,
+  first: 0,
+  version: 0,
+  at: (index) => sampleMessages[index]
+};
+
+// Rows show a cheap one-line preview; pretty-printing waits until a row is opened
+const preview = (msg: Message): string =>
+  (msg.raw ?? JSON.stringify(msg.payload) ?? '').slice(0, PREVIEW_CHARS);
+
+interface FeedRowProps {
+  msg: Message;
+  top: number;
+  selected: boolean;
+  onSelect: (msg: Message) => void;
+}
+
+const FeedRow = React.memo(function FeedRow({ msg, top, selected, onSelect }: FeedRowProps) {
+  return (
+    <div
+      className={`absolute left-0 right-0 border rounded px-2 py-1 text-sm cursor-pointer ${selected ? 'bg-muted' : ''}`}
+      style={{ top, height: ROW_HEIGHT - 4 }}
+      onClick={() => onSelect(msg)}
+    >
+      <div className="flex items-center justify-between">
+        <Badge variant="outline" className="text-xs">
+          {msg.timestamp.toLocaleTimeString()}
+        </Badge>
+        <span className="text-xs text-muted-foreground truncate ml-2">
+          {msg.topic}
+        </span>
+      </div>
+      <div className="text-xs font-mono truncate">{preview(msg)}</div>
+    </div>
+  );
+});
+
+export const MessageFeed: React.FC<{ messages?: MessageSource }> = ({ messages }) => {
+  const source = messages && messages.size > 0 ? messages : sampleSource;
+  const viewport = useRef<HTMLDivElement>(null);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [follow, setFollow] = useState(true);
+  const [selected, setSelected] = useState<Message | null>(null);
+
+  const totalHeight = source.size * ROW_HEIGHT;
+  // While following, the window is pinned to the newest rows without a scroll round-trip
+  const top = follow ? Math.max(0, totalHeight - VIEWPORT_HEIGHT) : scrollTop;
+  const first = Math.max(0, Math.floor(top / ROW_HEIGHT) - OVERSCAN);
+  const last = Math.min(source.size, Math.ceil((top + VIEWPORT_HEIGHT) / ROW_HEIGHT) + OVERSCAN);
+
+  useLayoutEffect(() => {
+    if (follow && viewport.current) viewport.current.scrollTop = totalHeight;
+  }, [follow, totalHeight, source.version]);
+
+  const onScroll = useCallback(() => {
+    const el = viewport.current;
+    if (!el) return;
+    const atBottom = el.scrollTop + el.clientHeight >= el.scrollHeight - ROW_HEIGHT;
+    setFollow(atBottom);
+    if (!atBottom) setScrollTop(el.scrollTop);
+  }, []);
+
+  const onSelect = useCallback(
+    (msg: Message) => setSelected((current) => (current?.id === msg.id ? null : msg)),
+    []
+  );
+
+  const detail = useMemo(
+    () => (selected ? JSON.stringify(selected.payload, null, 2) : ''),
+    [selected]
+  );
+
+  // A row's top depends only on its sequence number and the base, so it stays
+  // fixed while the ring evicts; the shift is applied once, to the container
+  const base = source.first - (source.first % REBASE_ROWS);
+  const shift = (base - source.first) * ROW_HEIGHT;
+
+  const rows: React.ReactNode[] = [];
+  for (let i = first; i < last; i++) {
+    const msg = source.at(i);
+    rows.push(
+      <FeedRow
+        key={msg.id}
+        msg={msg}
+        top={(source.first + i - base) * ROW_HEIGHT}
+        selected={selected?.id === msg.id}
+        onSelect={onSelect}
+      />
+    );
+  }
+
+  return (
+    <Card>
+      <CardHeader>
+        <CardTitle className="flex items-center justify-between">
+          <span>消息流</span>
+          <Badge variant="outline" className="text-xs">{source.size}</Badge>
+        </CardTitle>
+      </CardHeader>
+      <CardContent>
+        <div
+          ref={viewport}
+          className="relative overflow-auto"
+          style={{ height: VIEWPORT_HEIGHT }}
+          onScroll={onScroll}
+        >
+          <div className="relative" style={{ height: totalHeight }}>
+            <div className="absolute left-0 right-0 top-0" style={{ transform: `translateY(${shift}px)` }}>
+              {rows}
+            </div>
+          </div>
+        </div>
+        {selected && (
+          <pre className="mt-2 max-h-64 text-xs bg-muted p-2 rounded overflow-auto">
+            {selected.topic}
+            {'\n'}
+            {detail}
+          </pre>
+        )}
+      </CardContent>
+    </Card>
+  );
+};
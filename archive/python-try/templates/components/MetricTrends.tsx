@@ -0,0 +1,106 @@
+import React, { useLayoutEffect, useRef, useState } from 'react';
+import { LineChart, Line, XAxis, YAxis, Tooltip, CartesianGrid } from 'recharts';
+import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
+import { DownsampleMethod, useMetricKeys, useMetricSeries } from '../lib/metricHistory';
+
+const CHART_HEIGHT = 240;
+const WINDOWS: Array<{ label: string; ms: number }> = [
+  { label: '15分钟', ms: 15 * 60 * 1000 },
+  { label: '1小时', ms: 60 * 60 * 1000 },
+  { label: '24小时', ms: 24 * 60 * 60 * 1000 }
+];
+
+// 'v1/FY-Fab/cold/CH01/metrics/good-count:count' -> 'CH01 good-count.count'
+const metricLabel = (key: string): string => {
+  const [topic, field] = key.split(':');
+  const levels = topic.split('/');
+  return `${levels[levels.length - 3] ?? ''} ${levels[levels.length - 1]}.${field}`;
+};
+
+const formatTime = (t: number): string => new Date(t).toLocaleTimeString();
+
+const useWidth = (ref: React.RefObject<HTMLDivElement>): number => {
+  const [width, setWidth] = useState(0);
+  useLayoutEffect(() => {
+    const el = ref.current;
+    if (!el) return;
+    const measure = () => setWidth(el.clientWidth);
+    measure();
+    const observer = new ResizeObserver(measure);
+    observer.observe(el);
+    return () => observer.disconnect();
+  }, [ref]);
+  return width;
+};
+
+export const MetricTrends: React.FC = () => {
+  const keys = useMetricKeys();
+  const [selected, setSelected] = useState<string | null>(null);
+  const [windowMs, setWindowMs] = useState(WINDOWS[1].ms);
+  const [method, setMethod] = useState<DownsampleMethod>('lttb');
+  const container = useRef<HTMLDivElement>(null);
+  const width = useWidth(container);
+
+  const key = selected ?? keys[0] ?? '';
+  // About one point per horizontal pixel, however long the window is
+  const points = useMetricSeries(key, windowMs, width, method);
+
+  return (
+    <Card>
+      <CardHeader>
+        <CardTitle className="flex flex-wrap items-center justify-between gap-2">
+          <span>指标趋势</span>
+          <div className="flex gap-2 text-sm font-normal">
+            <select
+              className="border rounded px-1"
+              value={key}
+              onChange={(event) => setSelected(event.target.value)}
+            >
+              {keys.map((k) => (
+                <option key={k} value={k}>
+                  {metricLabel(k)}
+                </option>
+              ))}
+            </select>
+            <select
+              className="border rounded px-1"
+              value={windowMs}
+              onChange={(event) => setWindowMs(Number(event.target.value))}
+            >
+              {WINDOWS.map((w) => (
+                <option key={w.ms} value={w.ms}>
+                  {w.label}
+                </option>
+              ))}
+            </select>
+            <select
+              className="border rounded px-1"
+              value={method}
+              onChange={(event) => setMethod(event.target.value as DownsampleMethod)}
+            >
+              <option value="lttb">LTTB</option>
+              <option value="minmax">最小/最大</option>
+            </select>
+          </div>
+        </CardTitle>
+      </CardHeader>
+      <CardContent>
+        <div ref={container} style={{ height: CHART_HEIGHT }}>
+          {keys.length === 0 ? (
+            <p className="text-sm text-muted-foreground">等待指标数据</p>
+          ) : (
+            width > 0 && (
+              <LineChart width={width} height={CHART_HEIGHT} data={points}>
+                <CartesianGrid strokeDasharray="3 3" />
+                <XAxis dataKey="t" type="number" domain={['dataMin', 'dataMax']} tickFormatter={formatTime} />
+                <YAxis width={48} />
+                <Tooltip labelFormatter={(t) => formatTime(Number(t))} />
+                <Line type="linear" dataKey="v" dot={false} isAnimationActive={false} stroke="#2563eb" />
+              </LineChart>
+            )
+          )}
+        </div>
+      </CardContent>
+    </Card>
+  );
+};
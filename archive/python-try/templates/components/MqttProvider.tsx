@@ -0,0 +1,225 @@
+import React, { createContext, useContext, useState, useEffect, useLayoutEffect, useMemo, useRef, ReactNode } from 'react';
+import mqtt from 'mqtt';
+import { MessageRing, IngestStats, createFlushScheduler } from '../lib/messageRing';
+import type { Message, MessageSource } from './MessageFeed';
+import { topicStore } from '../lib/topicStore';
+import { metricHistory } from '../lib/metricHistory';
+import { BROKER_FILTERS } from '../lib/subscriptions';
+import { INSTRUMENT, diagnostics } from '../lib/diagnostics';
+import type { WorkerEvent, WorkerRequest } from '../lib/mqttWorker';
+
+// 'simple' updates React per message; 'buffered' appends into a ring and
+// flushes one state update per animation frame (or per flushIntervalMs);
+// 'worker' also moves the connection and JSON decoding into a Web Worker
+const INGEST: { mode: 'simple' | 'buffered' | 'worker'; flushIntervalMs: number } = {{ ingest|ts }};
+const BROKER_URL = {{ broker_url|ts }};
+// How often the worker posts a batch when no flush interval is configured
+const WORKER_BATCH_MS = 16;
+// Feed retention: a message count and an approximate memory budget, whichever binds first
+const RETENTION = {{ message_retention }};
+const MAX_FEED_BYTES = {{ feed_max_bytes }};
+// Rough cost of one payload character: the raw string plus its parsed copy
+const BYTES_PER_CHAR = 4;
+
+interface MqttContextType {
+  client: mqtt.MqttClient | null;
+  isConnected: boolean;
+  feed: MessageSource;
+  stats: IngestStats;
+  subscribe: (topic: string) => void;
+  publish: (topic: string, message: any) => void;
+}
+
+const emptyStats: IngestStats = { received: 0, malformed: 0, dropped: 0, coalesced: 0, evicted: 0, flushes: 0 };
+
+const MqttContext = createContext<MqttContextType>({
+  client: null,
+  isConnected: false,
+  feed: { size: 0, first: 0, version: 0, at: () => undefined as never },
+  stats: emptyStats,
+  subscribe: () => {},
+  publish: () => {},
+});
+
+export const useMqtt = () => useContext(MqttContext);
+
+export const MqttProvider: React.FC<{ children: ReactNode }> = ({ children }) => {
+  const [client, setClient] = useState<mqtt.MqttClient | null>(null);
+  const [isConnected, setIsConnected] = useState(false);
+  const [feedVersion, setFeedVersion] = useState(0);
+  const [stats, setStats] = useState<IngestStats>(emptyStats);
+  const worker = useRef<Worker | null>(null);
+  const ring = useMemo(() => new MessageRing<Message>(RETENTION, MAX_FEED_BYTES), []);
+
+  // The feed reads rows straight out of the ring; version tells it something changed
+  const feed = useMemo<MessageSource>(
+    () => ({ size: ring.size, first: ring.first, version: feedVersion, at: (index) => ring.at(index) }),
+    [ring, feedVersion]
+  );
+
+  // Layout effects run in the commit that puts this flush on screen
+  useLayoutEffect(() => diagnostics.committed(), [feedVersion]);
+
+  useEffect(() => {
+    const flush = () => {
+      topicStore.notify();
+      metricHistory.notify();
+      ring.commit();
+      setFeedVersion(ring.version);
+      setStats({ ...ring.stats });
+    };
+    const flusher = createFlushScheduler(flush, INGEST.flushIntervalMs);
+    // Buffered mode wakes store subscribers once per flush, not once per message
+    topicStore.autoNotify = INGEST.mode === 'simple';
+    diagnostics.watchIngest(ring.stats);
+    const stopLagProbe = diagnostics.startLagProbe();
+    let seq = 0;
+
+    if (INGEST.mode === 'worker') {
+      const ingest = new Worker(new URL('../lib/mqttWorker.ts', import.meta.url), { type: 'module' });
+      const request = (message: WorkerRequest) => ingest.postMessage(message);
+
+      ingest.onmessage = (event: MessageEvent<WorkerEvent>) => {
+        const data = event.data;
+        if (data.type === 'status') {
+          setIsConnected(data.connected);
+          if (data.error) console.error('MQTT Error:', data.error);
+          return;
+        }
+        if (data.type === 'stats') {
+          ring.stats.malformed = data.stats.malformed;
+          flusher.schedule();
+          return;
+        }
+        // Already parsed; the main thread only files each message
+        for (let i = 0; i < data.topics.length; i++) {
+          const timestamp = data.timestamps[i];
+          topicStore.set(data.topics[i], data.values[i], timestamp);
+          metricHistory.record(data.topics[i], data.values[i], timestamp);
+          diagnostics.received(timestamp);
+          ring.push(
+            {
+              id: String(++seq),
+              timestamp: new Date(timestamp),
+              topic: data.topics[i],
+              payload: data.values[i],
+              raw: data.previews[i],
+            },
+            data.sizes[i]
+          );
+        }
+        for (const ms of data.decodeMs) diagnostics.decoded(ms);
+        ring.stats.malformed = data.stats.malformed;
+        flusher.schedule();
+      };
+
+      request({
+        type: 'connect',
+        url: BROKER_URL,
+        clientId: `dashboard-${Date.now()}`,
+        filters: BROKER_FILTERS,
+        batchMs: INGEST.flushIntervalMs > 0 ? INGEST.flushIntervalMs : WORKER_BATCH_MS,
+        keepaliveSeconds: 60,
+        instrument: INSTRUMENT,
+      });
+      worker.current = ingest;
+
+      return () => {
+        flusher.cancel();
+        stopLagProbe();
+        request({ type: 'end' });
+        ingest.terminate();
+        worker.current = null;
+      };
+    }
+
+    const mqttClient = mqtt.connect(BROKER_URL, {
+      clientId: `dashboard-${Date.now()}`,
+      clean: true,
+      reconnectPeriod: 5000,
+    });
+
+    mqttClient.on('connect', () => {
+      console.log('MQTT Connected');
+      setIsConnected(true);
+
+      // Only the filters some component reads
+      mqttClient.subscribe(BROKER_FILTERS, { qos: 0 });
+    });
+
+    mqttClient.on('message', (topic, payload) => {
+      const receivedAt = Date.now();
+      const started = INSTRUMENT ? performance.now() : 0;
+      const raw = payload.toString();
+      let value: any;
+      try {
+        value = raw.trim() === '' ? null : JSON.parse(raw);
+      } catch {
+        ring.stats.malformed++;
+        return;
+      } finally {
+        if (INSTRUMENT) diagnostics.decoded(performance.now() - started);
+      }
+      diagnostics.received(receivedAt);
+      const message: Message = {
+        id: String(++seq),
+        timestamp: new Date(receivedAt),
+        topic,
+        payload: value,
+        raw,
+      };
+      topicStore.set(topic, message.payload, message.timestamp.getTime());
+      metricHistory.record(topic, message.payload, message.timestamp.getTime());
+      ring.push(message, (raw.length + topic.length) * BYTES_PER_CHAR);
+
+      if (INGEST.mode === 'simple') {
+        flush();
+      } else {
+        flusher.schedule();
+      }
+    });
+
+    mqttClient.on('error', (err) => {
+      console.error('MQTT Error:', err);
+    });
+
+    mqttClient.on('close', () => {
+      setIsConnected(false);
+    });
+
+    setClient(mqttClient);
+
+    return () => {
+      flusher.cancel();
+      stopLagProbe();
+      mqttClient.end();
+    };
+  }, [ring]);
+
+  const subscribe = (topic: string) => {
+    if (worker.current) {
+      worker.current.postMessage({ type: 'subscribe', filters: [topic] } satisfies WorkerRequest);
+    } else if (client) {
+      client.subscribe(topic, { qos: 0 });
+    }
+  };
+
+  const publish = (topic: string, message: any) => {
+    if (worker.current) {
+      worker.current.postMessage({
+        type: 'publish',
+        topic,
+        payload: JSON.stringify(message),
+        qos: 1,
+      } satisfies WorkerRequest);
+    } else if (client) {
+      client.publish(topic, JSON.stringify(message), { qos: 1 });
+    }
+  };
+
+  return (
+    <MqttContext.Provider value={{ client, isConnected, feed, stats, subscribe, publish }}>
+      {children}
+    </MqttContext.Provider>
+  );
+};
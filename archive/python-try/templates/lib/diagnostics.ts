@@ -0,0 +1,194 @@
+// Opt-in runtime instrumentation (generated with --instrument). Durations go
+// into fixed log-scale histograms, so recording is a log2 and an array
+// increment and memory stays constant however long the dashboard runs. When
+// the option is off every record call returns on its first line.
+import React, { Profiler, ReactNode, createElement } from 'react';
+import type { IngestStats } from './messageRing';
+
+export const INSTRUMENT: boolean = {{ instrument|ts }};
+
+// Buckets: SUBBUCKETS per doubling from MIN_MS up to about MIN_MS * 2^OCTAVES (~170 s)
+const MIN_MS = 0.01;
+const SUBBUCKETS = 8;
+const OCTAVES = 24;
+const BUCKETS = SUBBUCKETS * OCTAVES + 1;
+// How often the event-loop probe fires; lag is how late it fires
+const LAG_PROBE_MS = 100;
+// Receive times waiting for a React commit; messages beyond this are counted, not timed
+const MAX_PENDING = 65536;
+
+export interface HistogramSummary {
+  count: number;
+  mean: number;
+  min: number;
+  p50: number;
+  p90: number;
+  p99: number;
+  max: number;
+}
+
+export class Histogram {
+  private readonly counts = new Uint32Array(BUCKETS);
+  count = 0;
+  sum = 0;
+  min = Infinity;
+  max = 0;
+
+  record(ms: number): void {
+    if (!(ms >= 0)) return;
+    const bucket = ms <= MIN_MS ? 0 : Math.min(BUCKETS - 1, Math.ceil(Math.log2(ms / MIN_MS) * SUBBUCKETS));
+    this.counts[bucket]++;
+    this.count++;
+    this.sum += ms;
+    if (ms < this.min) this.min = ms;
+    if (ms > this.max) this.max = ms;
+  }
+
+  /** Upper bound of the bucket holding quantile q, clamped to the observed range */
+  quantile(q: number): number {
+    if (this.count === 0) return 0;
+    const rank = Math.ceil(q * this.count);
+    let seen = 0;
+    for (let i = 0; i < BUCKETS; i++) {
+      seen += this.counts[i];
+      if (seen >= rank) return Math.min(this.max, Math.max(this.min, MIN_MS * 2 ** (i / SUBBUCKETS)));
+    }
+    return this.max;
+  }
+
+  summary(): HistogramSummary {
+    return {
+      count: this.count,
+      mean: this.count ? this.sum / this.count : 0,
+      min: this.count ? this.min : 0,
+      p50: this.quantile(0.5),
+      p90: this.quantile(0.9),
+      p99: this.quantile(0.99),
+      max: this.max,
+    };
+  }
+
+  /** Non-empty buckets as [upper bound ms, count], for export */
+  buckets(): Array<[number, number]> {
+    const out: Array<[number, number]> = [];
+    this.counts.forEach((n, i) => {
+      if (n > 0) out.push([MIN_MS * 2 ** (i / SUBBUCKETS), n]);
+    });
+    return out;
+  }
+
+  reset(): void {
+    this.counts.fill(0);
+    this.count = 0;
+    this.sum = 0;
+    this.min = Infinity;
+    this.max = 0;
+  }
+}
+
+export class Diagnostics {
+  /** MQTT receive to the React commit that shows it */
+  readonly latency = new Histogram();
+  /** Payload decode and JSON parse, per message */
+  readonly decode = new Histogram();
+  /** How late a LAG_PROBE_MS timer fires */
+  readonly eventLoopLag = new Histogram();
+  /** Profiler actualDuration per instrumented subtree */
+  readonly renders = new Map<string, Histogram>();
+  private ingest: IngestStats | null = null;
+  private pending: number[] = [];
+  private unmeasured = 0;
+  private probe: ReturnType<typeof setTimeout> | null = null;
+  private readonly startedAt = Date.now();
+
+  constructor(readonly enabled: boolean) {}
+
+  /** The provider's live counters (received, dropped, coalesced, ...) */
+  watchIngest(stats: IngestStats): void {
+    this.ingest = stats;
+  }
+
+  received(timestamp: number): void {
+    if (!this.enabled) return;
+    if (this.pending.length < MAX_PENDING) this.pending.push(timestamp);
+    else this.unmeasured++;
+  }
+
+  /** Called from a layout effect: everything received so far is now on screen */
+  committed(): void {
+    if (!this.enabled || this.pending.length === 0) return;
+    const now = Date.now();
+    for (const timestamp of this.pending) this.latency.record(now - timestamp);
+    this.pending = [];
+  }
+
+  decoded(ms: number): void {
+    if (this.enabled) this.decode.record(ms);
+  }
+
+  /** React.Profiler onRender callback */
+  readonly rendered = (id: string, _phase: string, actualDuration: number): void => {
+    if (!this.enabled) return;
+    let histogram = this.renders.get(id);
+    if (!histogram) {
+      histogram = new Histogram();
+      this.renders.set(id, histogram);
+    }
+    histogram.record(actualDuration);
+  };
+
+  startLagProbe(): () => void {
+    if (!this.enabled || this.probe !== null) return () => {};
+    let expected = performance.now() + LAG_PROBE_MS;
+    const tick = () => {
+      const now = performance.now();
+      this.eventLoopLag.record(Math.max(0, now - expected));
+      expected = now + LAG_PROBE_MS;
+      this.probe = setTimeout(tick, LAG_PROBE_MS);
+    };
+    this.probe = setTimeout(tick, LAG_PROBE_MS);
+    return () => {
+      if (this.probe !== null) clearTimeout(this.probe);
+      this.probe = null;
+    };
+  }
+
+  reset(): void {
+    this.latency.reset();
+    this.decode.reset();
+    this.eventLoopLag.reset();
+    this.renders.clear();
+    this.pending = [];
+    this.unmeasured = 0;
+  }
+
+  /** Everything above as plain JSON; what the panel shows and exports */
+  snapshot(withBuckets = false) {
+    const histogram = (h: Histogram) => (withBuckets ? { ...h.summary(), buckets: h.buckets() } : h.summary());
+    const renders: Record<string, ReturnType<typeof histogram>> = {};
+    for (const [id, h] of this.renders) renders[id] = histogram(h);
+    return {
+      takenAt: new Date().toISOString(),
+      uptimeMs: Date.now() - this.startedAt,
+      unit: 'ms',
+      latency: histogram(this.latency),
+      decode: histogram(this.decode),
+      eventLoopLag: histogram(this.eventLoopLag),
+      renders,
+      ingest: this.ingest ? { ...this.ingest, unmeasured: this.unmeasured } : null,
+    };
+  }
+}
+
+export const diagnostics = new Diagnostics(INSTRUMENT);
+
+// Headless benchmarks read the same numbers the panel shows
+if (INSTRUMENT && typeof window !== 'undefined') {
+  (window as any).__dashboardDiagnostics = diagnostics;
+}
+
+/** Profiles its children when instrumentation is on; a no-op wrapper otherwise */
+export const Instrumented: React.FC<{ id: string; children: ReactNode }> = ({ id, children }) =>
+  INSTRUMENT
+    ? createElement(Profiler, { id, onRender: diagnostics.rendered }, children)
+    : createElement(React.Fragment, null, children);
@@ -0,0 +1,125 @@
+// Preallocated ring buffer of recent MQTT messages. Writes overwrite the oldest
+// slot in place; readers index into it directly instead of copying it, and
+// React only learns about new messages once per flush.
+
+export interface IngestStats {
+  received: number;
+  /** Payloads that failed to decode; counted, never thrown */
+  malformed: number;
+  dropped: number;
+  coalesced: number;
+  evicted: number;
+  flushes: number;
+}
+
+export class MessageRing<T> {
+  private readonly slots: Array<T | undefined>;
+  private readonly sizes: Float64Array;
+  private head = 0;
+  private count = 0;
+  private pending = 0;
+  private bytes = 0;
+  private pushed = 0;
+  /** Bumped on every write, so a reader can tell the contents changed */
+  version = 0;
+  readonly stats: IngestStats = { received: 0, malformed: 0, dropped: 0, coalesced: 0, evicted: 0, flushes: 0 };
+
+  /** Holds at most capacity items and, approximately, maxBytes of payload */
+  constructor(readonly capacity: number, readonly maxBytes = Infinity) {
+    this.slots = new Array<T | undefined>(capacity).fill(undefined);
+    this.sizes = new Float64Array(capacity);
+  }
+
+  get size(): number {
+    return this.count;
+  }
+
+  /** Sequence number of at(0): how many items were ever pushed before it */
+  get first(): number {
+    return this.pushed - this.count;
+  }
+
+  get retainedBytes(): number {
+    return this.bytes;
+  }
+
+  get hasPending(): boolean {
+    return this.pending > 0;
+  }
+
+  private evictOldest(): void {
+    const tail = (this.head - this.count + this.capacity) % this.capacity;
+    this.bytes -= this.sizes[tail];
+    this.slots[tail] = undefined;
+    this.sizes[tail] = 0;
+    this.count--;
+    if (this.pending > this.count) {
+      // The evicted message had not been delivered yet
+      this.pending = this.count;
+      this.stats.dropped++;
+    }
+  }
+
+  push(item: T, bytes = 0): void {
+    if (this.count === this.capacity) this.evictOldest();
+    this.slots[this.head] = item;
+    this.sizes[this.head] = bytes;
+    this.head = (this.head + 1) % this.capacity;
+    this.count++;
+    this.pushed++;
+    this.pending++;
+    this.bytes += bytes;
+    this.stats.received++;
+    this.version++;
+
+    // Memory bound: drop the oldest until we fit, always keeping the newest
+    while (this.bytes > this.maxBytes && this.count > 1) {
+      this.evictOldest();
+      this.stats.evicted++;
+    }
+  }
+
+  /** index 0 is the oldest retained item */
+  at(index: number): T {
+    const start = (this.head - this.count + this.capacity) % this.capacity;
+    return this.slots[(start + index) % this.capacity] as T;
+  }
+
+  /** Mark everything pending as delivered and count what this flush coalesced */
+  commit(): void {
+    if (this.pending === 0) return;
+    this.stats.flushes++;
+    this.stats.coalesced += this.pending - 1;
+    this.pending = 0;
+  }
+
+  toArray(): T[] {
+    const out = new Array<T>(this.count);
+    for (let i = 0; i < this.count; i++) out[i] = this.at(i);
+    return out;
+  }
+}
+
+/** Calls flush at most once per animation frame, or once per intervalMs when it is > 0 */
+export function createFlushScheduler(flush: () => void, intervalMs: number) {
+  const useFrames = intervalMs <= 0 && typeof requestAnimationFrame === 'function';
+  let handle: number | null = null;
+
+  const run = () => {
+    handle = null;
+    flush();
+  };
+
+  return {
+    schedule() {
+      if (handle !== null) return;
+      handle = useFrames ? requestAnimationFrame(run) : window.setTimeout(run, intervalMs);
+    },
+    cancel() {
+      if (handle === null) return;
+      if (useFrames) cancelAnimationFrame(handle);
+      else window.clearTimeout(handle);
+      handle = null;
+    },
+  };
+}
@@ -0,0 +1,314 @@
+// Per-metric history in columnar Float64Array rings (time, value), bounded by
+// age and point count. Charts never see the raw points: a window is reduced to
+// about one point per pixel (LTTB or min/max buckets) before it is rendered.
+import { useCallback, useMemo, useSyncExternalStore } from 'react';
+import { topicMatches } from './topicStore';
+
+export interface MetricSource {
+  pattern: string;
+  /** Numeric payload fields to keep; null keeps every top-level number */
+  fields: string[] | null;
+}
+
+export interface Point {
+  t: number;
+  v: number;
+}
+
+export type DownsampleMethod = 'lttb' | 'minmax';
+
+const SOURCES: MetricSource[] = {{ metric_sources|ts }};
+const HISTORY: { retentionMs: number; maxPoints: number } = {{ history|ts }};
+
+// Rings start small and double up to maxPoints, so idle metrics stay cheap
+const INITIAL_CAPACITY = 256;
+// Listeners hear about new points at most this often
+const NOTIFY_MS = 500;
+
+export class SeriesRing {
+  private t: Float64Array;
+  private v: Float64Array;
+  private head = 0;
+  private count = 0;
+  version = 0;
+
+  constructor(readonly maxPoints: number, readonly retentionMs: number) {
+    const capacity = Math.min(INITIAL_CAPACITY, maxPoints);
+    this.t = new Float64Array(capacity);
+    this.v = new Float64Array(capacity);
+  }
+
+  get size(): number {
+    return this.count;
+  }
+
+  private index(i: number): number {
+    return (this.head - this.count + i + this.t.length) % this.t.length;
+  }
+
+  timeAt(i: number): number {
+    return this.t[this.index(i)];
+  }
+
+  valueAt(i: number): number {
+    return this.v[this.index(i)];
+  }
+
+  private grow(): void {
+    const capacity = Math.min(this.t.length * 2, this.maxPoints);
+    const t = new Float64Array(capacity);
+    const v = new Float64Array(capacity);
+    const view = this.view(0, this.count);
+    t.set(view.t);
+    v.set(view.v);
+    this.t = t;
+    this.v = v;
+    this.head = this.count;
+  }
+
+  push(time: number, value: number): void {
+    if (this.count === this.t.length && this.t.length < this.maxPoints) this.grow();
+    this.t[this.head] = time;
+    this.v[this.head] = value;
+    this.head = (this.head + 1) % this.t.length;
+    if (this.count < this.t.length) this.count++;
+
+    // Age out from the oldest end
+    const cutoff = time - this.retentionMs;
+    while (this.count > 1 && this.timeAt(0) < cutoff) this.count--;
+    this.version++;
+  }
+
+  /** First index with time >= t (times are appended in order) */
+  lowerBound(time: number): number {
+    let lo = 0;
+    let hi = this.count;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (this.timeAt(mid) < time) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  }
+
+  /** Columns for [from, to); subarrays when contiguous, a copy when the range wraps */
+  view(from: number, to: number): { t: Float64Array; v: Float64Array } {
+    const start = this.index(from);
+    const length = to - from;
+    if (start + length <= this.t.length) {
+      return { t: this.t.subarray(start, start + length), v: this.v.subarray(start, start + length) };
+    }
+    const split = this.t.length - start;
+    const t = new Float64Array(length);
+    const v = new Float64Array(length);
+    t.set(this.t.subarray(start));
+    t.set(this.t.subarray(0, length - split), split);
+    v.set(this.v.subarray(start));
+    v.set(this.v.subarray(0, length - split), split);
+    return { t, v };
+  }
+}
+
+/** Largest-Triangle-Three-Buckets: keeps the shape of a line in `threshold` points */
+export function lttb(t: Float64Array, v: Float64Array, threshold: number): Point[] {
+  const n = t.length;
+  if (threshold >= n || threshold < 3) {
+    const out: Point[] = new Array(n);
+    for (let i = 0; i < n; i++) out[i] = { t: t[i], v: v[i] };
+    return out;
+  }
+
+  const out: Point[] = [{ t: t[0], v: v[0] }];
+  const every = (n - 2) / (threshold - 2);
+  let a = 0;
+  for (let i = 0; i < threshold - 2; i++) {
+    // Average of the next bucket is the third triangle corner
+    const nextStart = Math.floor((i + 1) * every) + 1;
+    const nextEnd = Math.min(Math.floor((i + 2) * every) + 1, n);
+    let avgT = 0;
+    let avgV = 0;
+    for (let j = nextStart; j < nextEnd; j++) {
+      avgT += t[j];
+      avgV += v[j];
+    }
+    const span = nextEnd - nextStart || 1;
+    avgT /= span;
+    avgV /= span;
+
+    const start = Math.floor(i * every) + 1;
+    const end = Math.floor((i + 1) * every) + 1;
+    let best = start;
+    let bestArea = -1;
+    for (let j = start; j < end; j++) {
+      const area = Math.abs((t[a] - avgT) * (v[j] - v[a]) - (t[a] - t[j]) * (avgV - v[a]));
+      if (area > bestArea) {
+        bestArea = area;
+        best = j;
+      }
+    }
+    out.push({ t: t[best], v: v[best] });
+    a = best;
+  }
+  out.push({ t: t[n - 1], v: v[n - 1] });
+  return out;
+}
+
+/** Min and max of each bucket, in time order; spikes survive, two points per bucket */
+export function minMax(t: Float64Array, v: Float64Array, buckets: number): Point[] {
+  const n = t.length;
+  if (n <= buckets * 2) return lttb(t, v, n);
+
+  const out: Point[] = [];
+  const every = n / buckets;
+  for (let b = 0; b < buckets; b++) {
+    const start = Math.floor(b * every);
+    const end = Math.min(Math.floor((b + 1) * every), n);
+    let lo = start;
+    let hi = start;
+    for (let j = start + 1; j < end; j++) {
+      if (v[j] < v[lo]) lo = j;
+      if (v[j] > v[hi]) hi = j;
+    }
+    const first = Math.min(lo, hi);
+    const second = Math.max(lo, hi);
+    out.push({ t: t[first], v: v[first] });
+    if (second !== first) out.push({ t: t[second], v: v[second] });
+  }
+  return out;
+}
+
+type Listener = () => void;
+
+export class MetricHistory {
+  private series = new Map<string, SeriesRing>();
+  // topic -> fields to record (null: every number); undefined topics are not metrics
+  private routes = new Map<string, string[] | null | false>();
+  private listeners = new Set<Listener>();
+  private dirty = false;
+  private lastNotify = 0;
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  /** Bumped when a series is added */
+  keysVersion = 0;
+
+  constructor(readonly sources: MetricSource[], readonly retentionMs: number, readonly maxPoints: number) {}
+
+  private route(topic: string): string[] | null | false {
+    let fields = this.routes.get(topic);
+    if (fields === undefined) {
+      const source = this.sources.find((s) => topicMatches(s.pattern, topic));
+      fields = source ? source.fields : false;
+      this.routes.set(topic, fields);
+    }
+    return fields;
+  }
+
+  record(topic: string, value: any, timestamp: number): void {
+    const fields = this.route(topic);
+    if (fields === false || value === null || typeof value !== 'object') return;
+
+    for (const field of fields ?? Object.keys(value)) {
+      const number = value[field];
+      if (typeof number !== 'number' || !Number.isFinite(number)) continue;
+      const key = `${topic}:${field}`;
+      let ring = this.series.get(key);
+      if (!ring) {
+        ring = new SeriesRing(this.maxPoints, this.retentionMs);
+        this.series.set(key, ring);
+        this.keysVersion++;
+      }
+      ring.push(timestamp, number);
+      this.dirty = true;
+    }
+  }
+
+  get(key: string): SeriesRing | undefined {
+    return this.series.get(key);
+  }
+
+  keys(): string[] {
+    return Array.from(this.series.keys()).sort();
+  }
+
+  /** Called after each ingest flush; wakes charts at most every NOTIFY_MS */
+  notify(): void {
+    if (!this.dirty || this.timer !== null) return;
+    const wait = this.lastNotify + NOTIFY_MS - Date.now();
+    const run = () => {
+      this.timer = null;
+      this.dirty = false;
+      this.lastNotify = Date.now();
+      this.listeners.forEach((listener) => listener());
+    };
+    if (wait <= 0) run();
+    else this.timer = setTimeout(run, wait);
+  }
+
+  subscribe(listener: Listener): () => void {
+    this.listeners.add(listener);
+    return () => {
+      this.listeners.delete(listener);
+    };
+  }
+}
+
+export const metricHistory = new MetricHistory(SOURCES, HISTORY.retentionMs, HISTORY.maxPoints);
+
+const subscribe = (listener: Listener) => metricHistory.subscribe(listener);
+
+/** Keys of every series seen so far, as `${topic}:${field}` */
+export function useMetricKeys(): string[] {
+  const version = useSyncExternalStore(subscribe, () => metricHistory.keysVersion);
+  // eslint-disable-next-line react-hooks/exhaustive-deps
+  return useMemo(() => metricHistory.keys(), [version]);
+}
+
+/**
+ * The last windowMs of one series reduced to about `width` points. Recomputed
+ * only when the series has new points.
+ */
+export function useMetricSeries(
+  key: string,
+  windowMs: number,
+  width: number,
+  method: DownsampleMethod = 'lttb'
+): Point[] {
+  const getVersion = useCallback(() => metricHistory.get(key)?.version ?? -1, [key]);
+  const version = useSyncExternalStore(subscribe, getVersion);
+
+  return useMemo(() => {
+    const ring = metricHistory.get(key);
+    if (!ring || ring.size === 0 || version < 0) return [];
+    const from = ring.lowerBound(ring.timeAt(ring.size - 1) - windowMs);
+    const { t, v } = ring.view(from, ring.size);
+    const target = Math.max(3, Math.floor(width));
+    return method === 'minmax' ? minMax(t, v, Math.floor(target / 2)) : lttb(t, v, target);
+  }, [key, version, windowMs, width, method]);
+}
+
+export interface MetricChange {
+  /** Absolute change, in the metric's own unit */
+  delta: number;
+  /** Relative change, e.g. 0.12 for +12%; null when the reference value is 0 */
+  change: number | null;
+  /** Age of the value compared against; shorter than the window until history fills it */
+  sinceMs: number;
+}
+
+/** Change against the oldest point within the window; null with fewer than two points */
+export function useMetricChange(key: string, windowMs: number): MetricChange | null {
+  const getVersion = useCallback(() => metricHistory.get(key)?.version ?? -1, [key]);
+  const version = useSyncExternalStore(subscribe, getVersion);
+  return useMemo(() => {
+    const ring = metricHistory.get(key);
+    if (!ring || ring.size < 2 || version < 0) return null;
+    const last = ring.size - 1;
+    const first = Math.min(ring.lowerBound(ring.timeAt(last) - windowMs), last - 1);
+    const before = ring.valueAt(first);
+    const delta = ring.valueAt(last) - before;
+    return {
+      delta,
+      change: before === 0 ? null : delta / Math.abs(before),
+      sinceMs: ring.timeAt(last) - ring.timeAt(first),
+    };
+  }, [key, version, windowMs]);
+}
@@ -0,0 +1,143 @@
+// Just enough MQTT 3.1.1 framing for the ingest worker: connect, subscribe,
+// publish at QoS 0/1, keepalive. Dependency-free, so the worker bundle needs
+// none of the Node polyfills mqtt.js relies on.
+
+export const PacketType = {
+  CONNECT: 1,
+  CONNACK: 2,
+  PUBLISH: 3,
+  PUBACK: 4,
+  SUBSCRIBE: 8,
+  SUBACK: 9,
+  PINGREQ: 12,
+  PINGRESP: 13,
+  DISCONNECT: 14,
+} as const;
+
+export interface Packet {
+  type: number;
+  flags: number;
+  body: Uint8Array;
+}
+
+export interface Publish {
+  topic: string;
+  qos: number;
+  packetId: number;
+  payload: Uint8Array;
+}
+
+const encoder = new TextEncoder();
+const decoder = new TextDecoder();
+
+function packet(type: number, flags: number, parts: Uint8Array[]): Uint8Array {
+  let length = 0;
+  for (const part of parts) length += part.length;
+
+  const header = [(type << 4) | flags];
+  let remaining = length;
+  do {
+    let byte = remaining % 128;
+    remaining = Math.floor(remaining / 128);
+    if (remaining > 0) byte |= 128;
+    header.push(byte);
+  } while (remaining > 0);
+
+  const out = new Uint8Array(header.length + length);
+  out.set(header);
+  let offset = header.length;
+  for (const part of parts) {
+    out.set(part, offset);
+    offset += part.length;
+  }
+  return out;
+}
+
+const uint16 = (value: number) => new Uint8Array([value >> 8, value & 255]);
+
+function string(value: string): Uint8Array {
+  const bytes = encoder.encode(value);
+  const out = new Uint8Array(bytes.length + 2);
+  out.set(uint16(bytes.length));
+  out.set(bytes, 2);
+  return out;
+}
+
+export function encodeConnect(clientId: string, keepaliveSeconds: number): Uint8Array {
+  // Protocol name, level 4, clean session
+  return packet(PacketType.CONNECT, 0, [
+    string('MQTT'),
+    new Uint8Array([4, 0x02]),
+    uint16(keepaliveSeconds),
+    string(clientId),
+  ]);
+}
+
+export function encodeSubscribe(packetId: number, filters: string[], qos = 0): Uint8Array {
+  const parts = [uint16(packetId)];
+  for (const filter of filters) parts.push(string(filter), new Uint8Array([qos]));
+  return packet(PacketType.SUBSCRIBE, 0x02, parts);
+}
+
+export function encodePublish(topic: string, payload: Uint8Array, qos = 0, packetId = 0): Uint8Array {
+  const parts = [string(topic)];
+  if (qos > 0) parts.push(uint16(packetId));
+  parts.push(payload);
+  return packet(PacketType.PUBLISH, qos << 1, parts);
+}
+
+export const encodePuback = (packetId: number) => packet(PacketType.PUBACK, 0, [uint16(packetId)]);
+export const PINGREQ = packet(PacketType.PINGREQ, 0, []);
+export const DISCONNECT = packet(PacketType.DISCONNECT, 0, []);
+
+export function decodePublish(p: Packet): Publish {
+  const topicLength = (p.body[0] << 8) | p.body[1];
+  let offset = 2 + topicLength;
+  const topic = decoder.decode(p.body.subarray(2, offset));
+  const qos = (p.flags >> 1) & 3;
+  let packetId = 0;
+  if (qos > 0) {
+    packetId = (p.body[offset] << 8) | p.body[offset + 1];
+    offset += 2;
+  }
+  return { topic, qos, packetId, payload: p.body.subarray(offset) };
+}
+
+/** Splits a byte stream into packets; WebSocket frames need not align with them */
+export class PacketReader {
+  private buffer = new Uint8Array(0);
+
+  push(chunk: Uint8Array): Packet[] {
+    let data = chunk;
+    if (this.buffer.length > 0) {
+      data = new Uint8Array(this.buffer.length + chunk.length);
+      data.set(this.buffer);
+      data.set(chunk, this.buffer.length);
+    }
+
+    const packets: Packet[] = [];
+    let offset = 0;
+    while (offset + 2 <= data.length) {
+      let length = 0;
+      let multiplier = 1;
+      let pos = offset + 1;
+      let complete = false;
+      while (pos < data.length && pos - offset <= 4) {
+        const byte = data[pos++];
+        length += (byte & 127) * multiplier;
+        multiplier *= 128;
+        if ((byte & 128) === 0) {
+          complete = true;
+          break;
+        }
+      }
+      if (!complete || pos + length > data.length) break;
+      packets.push({ type: data[offset] >> 4, flags: data[offset] & 15, body: data.subarray(pos, pos + length) });
+      offset = pos + length;
+    }
+
+    // Keep only the unfinished tail; packets above still view the old array
+    this.buffer = data.slice(offset);
+    return packets;
+  }
+}
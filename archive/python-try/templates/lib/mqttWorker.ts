@@ -0,0 +1,218 @@
+// Ingest worker: owns the broker connection, decodes and parses payloads off
+// the UI thread, and posts them in batches. Numeric columns travel as
+// transferred buffers; a malformed payload is counted and skipped.
+import {
+  DISCONNECT,
+  PINGREQ,
+  type Packet,
+  PacketReader,
+  PacketType,
+  decodePublish,
+  encodeConnect,
+  encodePuback,
+  encodePublish,
+  encodeSubscribe,
+} from './mqttWire';
+
+export type WorkerRequest =
+  | {
+      type: 'connect';
+      url: string;
+      clientId: string;
+      filters: string[];
+      batchMs: number;
+      keepaliveSeconds: number;
+      /** Time each decode and send the durations with the batch */
+      instrument: boolean;
+    }
+  | { type: 'subscribe'; filters: string[] }
+  | { type: 'publish'; topic: string; payload: string; qos: number }
+  | { type: 'end' };
+
+export interface WorkerStats {
+  received: number;
+  malformed: number;
+  batches: number;
+}
+
+export interface IngestBatch {
+  type: 'batch';
+  topics: string[];
+  values: any[];
+  previews: string[];
+  timestamps: Float64Array;
+  sizes: Uint32Array;
+  /** Per-message decode time in ms; empty unless instrumenting */
+  decodeMs: Float64Array;
+  stats: WorkerStats;
+}
+
+export type WorkerEvent =
+  | IngestBatch
+  | { type: 'status'; connected: boolean; error?: string }
+  /** Counters changed but nothing decoded, e.g. a window of only malformed payloads */
+  | { type: 'stats'; stats: WorkerStats };
+
+const RECONNECT_MS = 5000;
+const PREVIEW_CHARS = 160;
+// Matches the provider's estimate: the raw string plus its parsed copy
+const BYTES_PER_CHAR = 4;
+
+const decoder = new TextDecoder();
+const encoder = new TextEncoder();
+const stats: WorkerStats = { received: 0, malformed: 0, batches: 0 };
+// stats.received as of the last post, to tell whether there is anything new to report
+let reportedReceived = 0;
+
+let options: Extract<WorkerRequest, { type: 'connect' }> | null = null;
+let socket: WebSocket | null = null;
+let reader = new PacketReader();
+let packetId = 0;
+let ended = false;
+let batchTimer: ReturnType<typeof setInterval> | null = null;
+let pingTimer: ReturnType<typeof setInterval> | null = null;
+
+let topics: string[] = [];
+let values: any[] = [];
+let previews: string[] = [];
+let timestamps: number[] = [];
+let sizes: number[] = [];
+let decodeMs: number[] = [];
+
+const nextPacketId = () => (packetId = (packetId % 65535) + 1);
+
+const post = (event: WorkerEvent, transfer: Transferable[] = []) => self.postMessage(event, { transfer });
+
+function send(bytes: Uint8Array): void {
+  if (socket?.readyState === WebSocket.OPEN) socket.send(bytes);
+}
+
+/** UTF-8 decode and JSON parse; undefined means the payload was unusable */
+function normalize(payload: Uint8Array): { raw: string; value: any } | undefined {
+  let raw = decoder.decode(payload);
+  if (raw.charCodeAt(0) === 0xfeff) raw = raw.slice(1);
+  if (raw.trim() === '') return { raw, value: null };
+  try {
+    return { raw, value: JSON.parse(raw) };
+  } catch {
+    return undefined;
+  }
+}
+
+function flushBatch(): void {
+  if (topics.length === 0) {
+    if (stats.received !== reportedReceived) {
+      reportedReceived = stats.received;
+      post({ type: 'stats', stats: { ...stats } });
+    }
+    return;
+  }
+  reportedReceived = stats.received;
+  stats.batches++;
+  const batch: IngestBatch = {
+    type: 'batch',
+    topics,
+    values,
+    previews,
+    timestamps: Float64Array.from(timestamps),
+    sizes: Uint32Array.from(sizes),
+    decodeMs: Float64Array.from(decodeMs),
+    stats: { ...stats },
+  };
+  topics = [];
+  values = [];
+  previews = [];
+  timestamps = [];
+  sizes = [];
+  decodeMs = [];
+  post(batch, [batch.timestamps.buffer, batch.sizes.buffer, batch.decodeMs.buffer]);
+}
+
+function onPublish(p: Packet): void {
+  const message = decodePublish(p);
+  if (message.qos === 1) send(encodePuback(message.packetId));
+  stats.received++;
+
+  const started = options?.instrument ? performance.now() : 0;
+  const decoded = normalize(message.payload);
+  if (options?.instrument) decodeMs.push(performance.now() - started);
+  if (!decoded) {
+    stats.malformed++;
+    return;
+  }
+  topics.push(message.topic);
+  values.push(decoded.value);
+  previews.push(decoded.raw.slice(0, PREVIEW_CHARS));
+  timestamps.push(Date.now());
+  sizes.push((decoded.raw.length + message.topic.length) * BYTES_PER_CHAR);
+}
+
+function stopTimers(): void {
+  if (batchTimer !== null) clearInterval(batchTimer);
+  if (pingTimer !== null) clearInterval(pingTimer);
+  batchTimer = pingTimer = null;
+}
+
+function connect(): void {
+  if (!options || ended) return;
+  const { url, clientId, filters, batchMs, keepaliveSeconds } = options;
+  const ws = new WebSocket(url, 'mqtt');
+  ws.binaryType = 'arraybuffer';
+  socket = ws;
+  reader = new PacketReader();
+
+  ws.onopen = () => ws.send(encodeConnect(clientId, keepaliveSeconds));
+
+  ws.onmessage = (event: MessageEvent<ArrayBuffer>) => {
+    for (const p of reader.push(new Uint8Array(event.data))) {
+      switch (p.type) {
+        case PacketType.PUBLISH:
+          onPublish(p);
+          break;
+        case PacketType.CONNACK:
+          if (p.body[1] !== 0) {
+            post({ type: 'status', connected: false, error: `connection refused (${p.body[1]})` });
+            ws.close();
+            return;
+          }
+          post({ type: 'status', connected: true });
+          if (filters.length > 0) send(encodeSubscribe(nextPacketId(), filters));
+          batchTimer = setInterval(flushBatch, batchMs);
+          pingTimer = setInterval(() => send(PINGREQ), (keepaliveSeconds * 1000) / 2);
+          break;
+      }
+    }
+  };
+
+  ws.onerror = () => post({ type: 'status', connected: false, error: 'socket error' });
+
+  ws.onclose = () => {
+    flushBatch();
+    stopTimers();
+    post({ type: 'status', connected: false });
+    if (!ended) setTimeout(connect, RECONNECT_MS);
+  };
+}
+
+self.onmessage = (event: MessageEvent<WorkerRequest>) => {
+  const request = event.data;
+  switch (request.type) {
+    case 'connect':
+      options = request;
+      connect();
+      break;
+    case 'subscribe':
+      options?.filters.push(...request.filters);
+      send(encodeSubscribe(nextPacketId(), request.filters));
+      break;
+    case 'publish':
+      send(encodePublish(request.topic, encoder.encode(request.payload), request.qos, nextPacketId()));
+      break;
+    case 'end':
+      ended = true;
+      send(DISCONNECT);
+      socket?.close();
+      stopTimers();
+      break;
+  }
+};
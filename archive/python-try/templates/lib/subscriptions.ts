@@ -0,0 +1,8 @@
+// Topic filters each dashboard component reads, decided from the UNS catalogue.
+// The provider subscribes to BROKER_FILTERS only, never to the whole site.
+
+export const COMPONENT_TOPICS: Record<string, string[]> = {{ component_topics|ts }};
+
+export const BROKER_FILTERS: string[] = {{ broker_filters|ts }};
+
+export const topicsFor = (component: string): string[] => COMPONENT_TOPICS[component] ?? [];
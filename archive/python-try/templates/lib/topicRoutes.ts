@@ -0,0 +1,72 @@
+// Topic routing table compiled from the UNS catalogue at generation time.
+// A catalogue topic resolves to its slot, and from there to the ids of the
+// component patterns it feeds, with one Map lookup. Other topics walk a trie
+// of those patterns once and the result is remembered.
+
+interface RouteNode {
+  next?: Record<string, RouteNode>;
+  any?: RouteNode;
+  rest?: number[];
+  end?: number[];
+}
+
+export const PATTERNS: string[] = {{ route_patterns|ts }};
+
+const GROUPS: Array<{ patterns: number[]; topics: string[] }> = {{ route_groups|ts }};
+
+const TRIE: RouteNode = {{ route_trie|ts }};
+
+// Slot ids are positions in TOPICS; topics sharing a pattern list share its array
+export const TOPICS: string[] = [];
+export const SLOT_PATTERNS: number[][] = [];
+for (const group of GROUPS) {
+  for (const topic of group.topics) {
+    TOPICS.push(topic);
+    SLOT_PATTERNS.push(group.patterns);
+  }
+}
+
+const SLOTS = new Map(TOPICS.map((topic, slot) => [topic, slot]));
+export const PATTERN_IDS = new Map(PATTERNS.map((pattern, id) => [pattern, id]));
+
+export const slotOf = (topic: string): number | undefined => SLOTS.get(topic);
+
+const NONE: number[] = [];
+const MAX_REMEMBERED = 10000;
+const remembered = new Map<string, number[]>();
+const hasOwn = Object.prototype.hasOwnProperty;
+
+function walk(topic: string): number[] {
+  const levels = topic.split('/');
+  const out: number[] = [];
+  let frontier: RouteNode[] = [TRIE];
+  for (let i = 0; i <= levels.length && frontier.length > 0; i++) {
+    const next: RouteNode[] = [];
+    for (const node of frontier) {
+      // '#' also matches the parent level, so it applies before and at the end
+      if (node.rest) out.push(...node.rest);
+      if (i === levels.length) {
+        if (node.end) out.push(...node.end);
+        continue;
+      }
+      if (node.next && hasOwn.call(node.next, levels[i])) next.push(node.next[levels[i]]);
+      if (node.any) next.push(node.any);
+    }
+    frontier = next;
+  }
+  return out.length > 0 ? out.sort((a, b) => a - b) : NONE;
+}
+
+/** Ids (into PATTERNS) of the patterns a topic matches */
+export function routeOf(topic: string): number[] {
+  const slot = SLOTS.get(topic);
+  if (slot !== undefined) return SLOT_PATTERNS[slot];
+
+  let ids = remembered.get(topic);
+  if (ids === undefined) {
+    if (remembered.size >= MAX_REMEMBERED) remembered.clear();
+    ids = walk(topic);
+    remembered.set(topic, ids);
+  }
+  return ids;
+}
@@ -0,0 +1,182 @@
+// Latest value per MQTT topic, with optional bounded history, read through
+// selector hooks. A component re-renders only when the topics it selected change,
+// not on every message the dashboard receives.
+import { useCallback, useRef, useSyncExternalStore } from 'react';
+import { PATTERN_IDS, routeOf } from './topicRoutes';
+
+export interface TopicEntry {
+  topic: string;
+  value: any;
+  timestamp: number;
+}
+
+type Listener = () => void;
+
+interface Selection {
+  patterns: string[];
+  listeners: Set<Listener>;
+  /** Latest entry per matching topic, kept current as messages arrive */
+  matched: Map<string, TopicEntry>;
+  entries: TopicEntry[];
+  stale: boolean;
+}
+
+/** MQTT filter match: '+' is one level, a trailing '#' is any number of levels */
+export function topicMatches(filter: string, topic: string): boolean {
+  const f = filter.split('/');
+  const t = topic.split('/');
+  for (let i = 0; i < f.length; i++) {
+    if (f[i] === '#') return true;
+    if (i >= t.length || (f[i] !== '+' && f[i] !== t[i])) return false;
+  }
+  return f.length === t.length;
+}
+
+export class TopicStore {
+  private latest = new Map<string, TopicEntry>();
+  private history = new Map<string, TopicEntry[]>();
+  private selections = new Map<string, Selection>();
+  // Selections built only from routed patterns are found by pattern id;
+  // the rest (e.g. one exact topic from useTopic) are matched the slow way
+  private byPattern: Array<Set<Selection> | undefined> = [];
+  private adhoc: Selection[] = [];
+  private dirty = new Set<Selection>();
+
+  /** autoNotify=false defers listener calls until notify(), e.g. once per frame */
+  constructor(readonly historyLimit = 0, public autoNotify = true) {}
+
+  set(topic: string, value: any, timestamp = Date.now()): void {
+    const entry = { topic, value, timestamp };
+    this.latest.set(topic, entry);
+
+    if (this.historyLimit > 0) {
+      const list = this.history.get(topic) ?? [];
+      list.push(entry);
+      if (list.length > this.historyLimit) list.splice(0, list.length - this.historyLimit);
+      this.history.set(topic, list);
+    }
+
+    for (const id of routeOf(topic)) {
+      this.byPattern[id]?.forEach((selection) => this.mark(selection, entry));
+    }
+    for (const selection of this.adhoc) {
+      if (selection.patterns.some((pattern) => topicMatches(pattern, topic))) {
+        this.mark(selection, entry);
+      }
+    }
+    if (this.autoNotify) this.notify();
+  }
+
+  private mark(selection: Selection, entry: TopicEntry): void {
+    selection.matched.set(entry.topic, entry);
+    selection.stale = true;
+    this.dirty.add(selection);
+  }
+
+  notify(): void {
+    if (this.dirty.size === 0) return;
+    const pending = [...this.dirty];
+    this.dirty.clear();
+    for (const selection of pending) {
+      selection.listeners.forEach((listener) => listener());
+    }
+  }
+
+  get(topic: string): TopicEntry | undefined {
+    return this.latest.get(topic);
+  }
+
+  getHistory(topic: string): TopicEntry[] {
+    return this.history.get(topic) ?? [];
+  }
+
+  private selection(patterns: string[]): Selection {
+    const key = patterns.join('\n');
+    let selection = this.selections.get(key);
+    if (!selection) {
+      selection = { patterns, listeners: new Set(), matched: new Map(), entries: [], stale: true };
+      this.selections.set(key, selection);
+
+      const ids = patterns.map((pattern) => PATTERN_IDS.get(pattern));
+      if (ids.every((id) => id !== undefined)) {
+        for (const id of ids as number[]) {
+          const set = this.byPattern[id] ?? new Set<Selection>();
+          set.add(selection);
+          this.byPattern[id] = set;
+        }
+      } else {
+        this.adhoc.push(selection);
+      }
+      for (const entry of this.latest.values()) {
+        if (patterns.some((pattern) => topicMatches(pattern, entry.topic))) {
+          selection.matched.set(entry.topic, entry);
+        }
+      }
+    }
+    return selection;
+  }
+
+  /** Entries matching any pattern; the same array until one of them changes */
+  select(patterns: string[]): TopicEntry[] {
+    const selection = this.selection(patterns);
+    if (selection.stale) {
+      selection.entries = Array.from(selection.matched.values());
+      selection.stale = false;
+    }
+    return selection.entries;
+  }
+
+  subscribe(patterns: string[], listener: Listener): () => void {
+    const selection = this.selection(patterns);
+    selection.listeners.add(listener);
+    return () => {
+      selection.listeners.delete(listener);
+    };
+  }
+}
+
+export const topicStore = new TopicStore({{ topic_history }});
+
+/** Latest entry for one exact topic */
+export function useTopic(topic: string): TopicEntry | undefined {
+  return useTopicSelector([topic], (entries) => entries[0]);
+}
+
+/** All latest entries matching the patterns */
+export function useTopics(patterns: string[]): TopicEntry[] {
+  return useTopicSelector(patterns, (entries) => entries);
+}
+
+/**
+ * Derived value from the matching entries. Re-renders only when the selector's
+ * result changes under isEqual, so e.g. a count survives unrelated updates.
+ */
+export function useTopicSelector<T>(
+  patterns: string[],
+  selector: (entries: TopicEntry[]) => T,
+  isEqual: (a: T, b: T) => boolean = Object.is
+): T {
+  const cache = useRef<{ entries: TopicEntry[]; value: T } | null>(null);
+  const key = patterns.join('\n');
+
+  const subscribe = useCallback(
+    (listener: Listener) => topicStore.subscribe(patterns, listener),
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+    [key]
+  );
+
+  const getSnapshot = () => {
+    const entries = topicStore.select(patterns);
+    const cached = cache.current;
+    if (cached && cached.entries === entries) return cached.value;
+    const value = selector(entries);
+    if (cached && isEqual(cached.value, value)) {
+      cache.current = { entries, value: cached.value };
+      return cached.value;
+    }
+    cache.current = { entries, value };
+    return value;
+  };
+
+  return useSyncExternalStore(subscribe, getSnapshot);
+}
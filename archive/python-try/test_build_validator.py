@@ -0,0 +1,80 @@
+"""
+BuildValidator against stub node tools
+
+Usage:
+    python -m pytest -q test_build_validator.py
+"""
+
+import os
+import sys
+import stat
+import tempfile
+import importlib
+import unittest
+from contextlib import contextmanager
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+workflow = importlib.import_module('agent-workflow')
+
+# Prints whatever TSC_OUTPUT holds and exits 1 if it is not empty, like tsc
+TSC_STUB = '''#!{python}
+import os, sys
+out = os.environ.get('TSC_OUTPUT', '')
+sys.stdout.write(out)
+sys.exit(1 if out else 0)
+'''
+
+
+@contextmanager
+def chdir(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+class BuildValidatorTest(unittest.TestCase):
+    def setUp(self):
+        self.workspace = tempfile.TemporaryDirectory()
+        self.root = self.workspace.name
+        bin_dir = os.path.join(self.root, 'new-app', 'node_modules', '.bin')
+        os.makedirs(bin_dir)
+        tsc = os.path.join(bin_dir, 'tsc')
+        with open(tsc, 'w') as f:
+            f.write(TSC_STUB.format(python=sys.executable))
+        os.chmod(tsc, os.stat(tsc).st_mode | stat.S_IXUSR)
+        self.logger = workflow.Logger(log_file=os.path.join(self.root, 'test.log'), console=False)
+        self.addCleanup(self.logger.close)
+        self.addCleanup(self.workspace.cleanup)
+        self.addCleanup(os.environ.pop, 'TSC_OUTPUT', None)
+
+    def validator(self, **kwargs):
+        return workflow.BuildValidator(self.logger, 'new-app', cache_root=os.path.join(self.root, 'cache'),
+                                       **kwargs)
+
+    def test_relative_app_dir_runs_tools(self):
+        with chdir(self.root):
+            validator = self.validator()
+            self.assertTrue(validator.typecheck())
+        self.assertEqual(validator.results['typecheck']['status'], 'ok')
+
+    def test_template_type_errors_only_warn(self):
+        os.environ['TSC_OUTPUT'] = "src/main.tsx(3,1): error TS2304: Cannot find name 'x'.\n"
+        with chdir(self.root):
+            validator = self.validator(generated_files=['src/App.tsx'])
+            self.assertTrue(validator.typecheck())
+        self.assertEqual(validator.results['typecheck']['status'], 'warning')
+
+    def test_generated_type_errors_fail(self):
+        os.environ['TSC_OUTPUT'] = "src/App.tsx(3,1): error TS2304: Cannot find name 'x'.\n"
+        with chdir(self.root):
+            validator = self.validator(generated_files=['src/App.tsx'])
+            self.assertFalse(validator.typecheck())
+        self.assertEqual(validator.results['typecheck']['status'], 'failed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Logger level handling
+
+Usage:
+    python -m pytest -q test_logger.py
+"""
+
+import os
+import sys
+import tempfile
+import importlib
+import unittest
+from unittest import mock
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+workflow = importlib.import_module('agent-workflow')
+
+
+class LoggerLevelTest(unittest.TestCase):
+    def setUp(self):
+        self.workspace = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workspace.cleanup)
+        self.log_file = os.path.join(self.workspace.name, 'test.log')
+
+    def test_warning_and_alias(self):
+        for name in ('WARNING', 'warn', 'Warn'):
+            logger = workflow.Logger(log_file=self.log_file, level=name, console=False)
+            logger.info("hidden")
+            logger.warning("shown")
+            logger.close()
+        with open(self.log_file, encoding='utf-8') as f:
+            text = f.read()
+        self.assertNotIn('hidden', text)
+        self.assertEqual(text.count('[WARNING]'), 3)
+
+    def test_unknown_level_names_choices(self):
+        with self.assertRaisesRegex(ValueError, "Unknown log level 'verbose', expected one of .*WARNING"):
+            workflow.Logger(log_file=self.log_file, level='verbose', console=False)
+
+    def test_main_rejects_unknown_env_level(self):
+        with mock.patch.dict(os.environ, {'GEN_APP_LOG_LEVEL': 'verbose'}), \
+                mock.patch.object(sys, 'stderr') as stderr:
+            self.assertEqual(workflow.main([]), 2)
+        self.assertIn('Unknown log level', ''.join(c.args[0] for c in stderr.write.call_args_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+SpecScanner chunking against a single-pass scan of the whole file
+
+Usage:
+    python -m pytest -q test_spec_scanner.py
+"""
+
+import os
+import sys
+import tempfile
+import importlib
+import unittest
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+workflow = importlib.import_module('agent-workflow')
+
+ENTITIES = ' LASER01 v1/FY-Fab/sheet/LASER01/state/current-job wss://broker.example.com:8084/mqtt '
+FILLER = '设备状态 '
+
+
+class SpecScannerTest(unittest.TestCase):
+    def setUp(self):
+        self.scanner = workflow.SpecScanner(['LASER', 'BEND', 'CH'])
+        self.workspace = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workspace.cleanup)
+
+    def expected(self, data: bytes):
+        found = {'broker_url': set(), 'topic': set(), 'equipment': set()}
+        for match in self.scanner.pattern.finditer(data):
+            found[match.lastgroup].add(match.group().decode('ascii'))
+            if match.lastgroup == 'topic':
+                found['equipment'].update(
+                    v.decode('ascii') for v in self.scanner.equipment_pattern.findall(match.group()))
+        return {'equipment': sorted(found['equipment']), 'broker_urls': sorted(found['broker_url']),
+                'topics': sorted(found['topic'])}
+
+    def test_line_longer_than_chunk(self):
+        chunk = self.scanner.CHUNK_SIZE
+        entities = ENTITIES.encode('utf-8')
+        filler = FILLER.encode('utf-8')
+        path = os.path.join(self.workspace.name, 'spec.md')
+        # Put the entities across the overlap cut and across the chunk boundary itself
+        for boundary in (chunk - self.scanner.OVERLAP, chunk):
+            for shift in range(1, len(entities), 7):
+                start = boundary - shift
+                head = (filler * (start // len(filler) + 1))[:start]
+                data = head + entities + filler * 64
+                with self.subTest(boundary=boundary, shift=shift):
+                    self.assertNotIn(b'\n', data)
+                    self.assertGreater(len(data), chunk)
+                    with open(path, 'wb') as f:
+                        f.write(data)
+                    result = self.scanner.scan(path)
+                    expected = self.expected(data)
+                    self.assertEqual({k: result[k] for k in expected}, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
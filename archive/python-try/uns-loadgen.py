@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+"""
+UNS Load Generator
+Replays the uns.json topic catalogue against a local MQTT 3.1.1 broker stand-in
+(TCP and WebSocket), synthesizing payloads from each topic's template and
+publishing at estMps times a multiplier. `ramp` raises the multiplier step by
+step until a connected dashboard falls behind, i.e. the broker's write buffer
+towards it keeps growing.
+
+Point a generated app at ws://localhost:<ws-port>/mqtt (mqtt_config in the
+specs) and open it before starting a ramp.
+
+Usage:
+    python uns-loadgen.py serve [--multiplier 1] [--station-scale 1]
+    python uns-loadgen.py ramp [--start 1] [--factor 2] [--max 4096] [--step-seconds 10]
+                               [--lag-kb 1024] [--subscribers 1] [--output ramp.json]
+    python uns-loadgen.py replay capture.mqcap [--from +60] [--to +3600] [--speed 10]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import base64
+import random
+import asyncio
+import hashlib
+import argparse
+import importlib
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Callable
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVE_DIR = os.path.dirname(SCRIPT_DIR)
+
+sys.path.insert(0, SCRIPT_DIR)
+workflow = importlib.import_module('agent-workflow')
+from mqtt_capture import CaptureReader
+
+REPORT_VERSION = 1
+DEFAULT_UNS = os.path.join(ARCHIVE_DIR, 'artifacts', 'uns.json')
+
+# MQTT 3.1.1 control packet types
+CONNECT, CONNACK, PUBLISH, PUBACK = 1, 2, 3, 4
+SUBSCRIBE, SUBACK, UNSUBSCRIBE, UNSUBACK = 8, 9, 10, 11
+PINGREQ, PINGRESP, DISCONNECT = 12, 13, 14
+
+WS_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+# Generator scheduling granularity and how often subscriber buffers are sampled
+TICK_SECONDS = 0.01
+SAMPLE_SECONDS = 0.25
+# Past this much unsent data a subscriber gets no more messages, only drop counts
+MAX_BUFFERED = 64 * 1024 * 1024
+
+class ProtocolError(Exception):
+    pass
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """MQTT filter match: '+' is one level, a trailing '#' is any number of levels"""
+    f = pattern.split('/')
+    t = topic.split('/')
+    for i, segment in enumerate(f):
+        if segment == '#':
+            return True
+        if i >= len(t) or (segment != '+' and segment != t[i]):
+            return False
+    return len(f) == len(t)
+
+def encode_length(length: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = length % 128
+        length //= 128
+        if length:
+            byte |= 128
+        out.append(byte)
+        if not length:
+            return bytes(out)
+
+def encode_packet(packet_type: int, flags: int, body: bytes) -> bytes:
+    return bytes([(packet_type << 4) | flags]) + encode_length(len(body)) + body
+
+def encode_string(value: str) -> bytes:
+    data = value.encode('utf-8')
+    return len(data).to_bytes(2, 'big') + data
+
+def decode_string(body: bytes, offset: int):
+    length = int.from_bytes(body[offset:offset + 2], 'big')
+    end = offset + 2 + length
+    return body[offset + 2:end].decode('utf-8'), end
+
+def encode_publish(topic: str, payload: bytes) -> bytes:
+    """QoS 0 PUBLISH; every delivery from the stand-in is at most once"""
+    return encode_packet(PUBLISH, 0, encode_string(topic) + payload)
+
+def ws_frame(payload: bytes, opcode: int = 0x2) -> bytes:
+    """Unmasked server-to-client WebSocket frame"""
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x80 | opcode, length])
+    elif length < 65536:
+        header = bytes([0x80 | opcode, 126]) + length.to_bytes(2, 'big')
+    else:
+        header = bytes([0x80 | opcode, 127]) + length.to_bytes(8, 'big')
+    return header + payload
+
+class WebSocketStream:
+    """Byte stream over the binary messages of a server-side WebSocket"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.buffer = bytearray()
+
+    async def handshake(self):
+        request = await self.reader.readuntil(b'\r\n\r\n')
+        headers = {}
+        for line in request.decode('latin-1').split('\r\n')[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        key = headers.get('sec-websocket-key')
+        if not key:
+            raise ProtocolError('not a WebSocket upgrade')
+
+        accept = base64.b64encode(hashlib.sha1(key.encode() + WS_GUID).digest()).decode()
+        response = ['HTTP/1.1 101 Switching Protocols', 'Upgrade: websocket', 'Connection: Upgrade',
+                    f'Sec-WebSocket-Accept: {accept}']
+        # Browsers drop the connection unless the requested subprotocol is echoed
+        protocols = [p.strip() for p in headers.get('sec-websocket-protocol', '').split(',')]
+        if 'mqtt' in protocols:
+            response.append('Sec-WebSocket-Protocol: mqtt')
+        self.writer.write(('\r\n'.join(response) + '\r\n\r\n').encode())
+
+    async def _read_frame(self):
+        first, second = await self.reader.readexactly(2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = int.from_bytes(await self.reader.readexactly(2), 'big')
+        elif length == 127:
+            length = int.from_bytes(await self.reader.readexactly(8), 'big')
+        mask = await self.reader.readexactly(4) if second & 0x80 else None
+        payload = await self.reader.readexactly(length)
+        if mask:
+            # XOR as one big integer instead of byte by byte
+            repeated = (mask * (length // 4 + 1))[:length]
+            payload = (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(length, 'big')
+        return opcode, payload
+
+    async def readexactly(self, n: int) -> bytes:
+        while len(self.buffer) < n:
+            opcode, payload = await self._read_frame()
+            if opcode in (0x0, 0x1, 0x2):
+                self.buffer.extend(payload)
+            elif opcode == 0x8:
+                raise asyncio.IncompleteReadError(bytes(self.buffer), n)
+            elif opcode == 0x9:
+                self.writer.write(ws_frame(payload, 0xA))
+        data = bytes(self.buffer[:n])
+        del self.buffer[:n]
+        return data
+
+class Session:
+    """One connected client; deliveries are written without waiting so backlog stays measurable"""
+
+    def __init__(self, broker: 'MiniBroker', reader, writer: asyncio.StreamWriter, websocket: bool):
+        self.broker = broker
+        self.stream = reader
+        self.writer = writer
+        self.websocket = websocket
+        self.client_id = ''
+        self.filters = set()
+        self.delivered = 0
+        self.dropped = 0
+        self.peer = writer.get_extra_info('peername')
+
+    @property
+    def buffered(self) -> int:
+        return self.writer.transport.get_write_buffer_size()
+
+    def write(self, packet: bytes):
+        self.writer.write(ws_frame(packet) if self.websocket else packet)
+
+    def deliver(self, packet: bytes, frame: bytes):
+        if self.writer.is_closing():
+            return
+        if self.buffered > MAX_BUFFERED:
+            self.dropped += 1
+            return
+        self.writer.write(frame if self.websocket else packet)
+        self.delivered += 1
+
+    async def read_packet(self):
+        first = (await self.stream.readexactly(1))[0]
+        length, multiplier = 0, 1
+        for _ in range(4):
+            byte = (await self.stream.readexactly(1))[0]
+            length += (byte & 127) * multiplier
+            if not byte & 128:
+                break
+            multiplier *= 128
+        else:
+            raise ProtocolError('malformed remaining length')
+        body = await self.stream.readexactly(length) if length else b''
+        return first >> 4, first & 0x0F, body
+
+    async def serve(self):
+        packet_type, _, body = await self.read_packet()
+        if packet_type != CONNECT:
+            raise ProtocolError('expected CONNECT')
+        _, offset = decode_string(body, 0)
+        offset += 4  # protocol level, connect flags, keepalive
+        self.client_id, _ = decode_string(body, offset)
+        self.write(encode_packet(CONNACK, 0, b'\x00\x00'))
+        self.broker.sessions.add(self)
+
+        while True:
+            packet_type, flags, body = await self.read_packet()
+            if packet_type == PUBLISH:
+                topic, offset = decode_string(body, 0)
+                qos = (flags >> 1) & 3
+                if qos:
+                    self.write(encode_packet(PUBACK, 0, body[offset:offset + 2]))
+                    offset += 2
+                self.broker.publish(topic, body[offset:])
+            elif packet_type == SUBSCRIBE:
+                packet_id, offset, granted = body[:2], 2, bytearray()
+                while offset < len(body):
+                    pattern, offset = decode_string(body, offset)
+                    offset += 1
+                    self.filters.add(pattern)
+                    granted.append(0)
+                self.broker.routes.clear()
+                self.write(encode_packet(SUBACK, 0, packet_id + bytes(granted)))
+            elif packet_type == UNSUBSCRIBE:
+                packet_id, offset = body[:2], 2
+                while offset < len(body):
+                    pattern, offset = decode_string(body, offset)
+                    self.filters.discard(pattern)
+                self.broker.routes.clear()
+                self.write(encode_packet(UNSUBACK, 0, packet_id))
+            elif packet_type == PINGREQ:
+                self.write(encode_packet(PINGRESP, 0, b''))
+            elif packet_type == DISCONNECT:
+                return
+
+class MiniBroker:
+    """Just enough of an MQTT broker to feed dashboards: QoS 0 fan-out, no retain, no sessions"""
+
+    def __init__(self, host: str = '127.0.0.1', tcp_port: int = 1883, ws_port: int = 8083):
+        self.host = host
+        self.tcp_port = tcp_port
+        self.ws_port = ws_port
+        self.sessions = set()
+        # topic -> subscribed sessions; cleared whenever a subscription changes
+        self.routes: Dict[str, List[Session]] = {}
+        self.published = 0
+        self.disconnects = 0
+        self.servers = []
+        self.handlers = set()
+
+    async def start(self):
+        self.servers = [
+            await asyncio.start_server(lambda r, w: self._accept(r, w, False), self.host, self.tcp_port),
+            await asyncio.start_server(lambda r, w: self._accept(r, w, True), self.host, self.ws_port),
+        ]
+        print(f"broker listening on mqtt://{self.host}:{self.tcp_port} and ws://{self.host}:{self.ws_port}/mqtt",
+              flush=True)
+
+    async def stop(self):
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        for session in list(self.sessions):
+            session.writer.close()
+        # Closed transports end each handler with EOF; let them finish rather than cancel them
+        if self.handlers:
+            await asyncio.wait(self.handlers, timeout=2)
+
+    async def _accept(self, reader, writer, websocket: bool):
+        session = None
+        handler = asyncio.current_task()
+        self.handlers.add(handler)
+        try:
+            stream = reader
+            if websocket:
+                stream = WebSocketStream(reader, writer)
+                await stream.handshake()
+            session = Session(self, stream, writer, websocket)
+            await session.serve()
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError, UnicodeDecodeError):
+            pass
+        finally:
+            if session and session in self.sessions:
+                self.sessions.discard(session)
+                self.routes.clear()
+                self.disconnects += 1
+                print(f"client {session.client_id or session.peer} disconnected", flush=True)
+            writer.close()
+            self.handlers.discard(handler)
+
+    def subscribers(self) -> List[Session]:
+        return [session for session in self.sessions if session.filters]
+
+    def _route(self, topic: str) -> List[Session]:
+        route = self.routes.get(topic)
+        if route is None:
+            route = self.routes[topic] = [
+                session for session in self.sessions
+                if any(topic_matches(pattern, topic) for pattern in session.filters)
+            ]
+        return route
+
+    def publish(self, topic: str, payload: bytes):
+        self.published += 1
+        route = self._route(topic)
+        if not route:
+            return
+        packet = encode_publish(topic, payload)
+        frame = ws_frame(packet) if any(session.websocket for session in route) else packet
+        for session in route:
+            session.deliver(packet, frame)
+
+class PayloadSynthesizer:
+    """Per-topic payload factories compiled once from the catalogue templates
+
+    Numbers jitter around the template value, ISO timestamps become "now",
+    ids with a 3+ digit suffix count up, and short strings cycle through the
+    values the same field takes anywhere in the catalogue (e.g. status).
+    """
+
+    TIMESTAMP = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?')
+    SEQUENCE = re.compile(r'(.*?)(\d{3,})')
+    JITTER = 0.1
+    MAX_ENUM_LENGTH = 24
+
+    def __init__(self, topics: List[Dict[str, Any]], seed: int = None):
+        self.random = random.Random(seed)
+        self.field_values: Dict[str, List[str]] = {}
+        for topic in topics:
+            self._collect(topic.get('template'))
+
+    def _collect(self, value: Any, field: str = None):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                self._collect(item, key)
+        elif isinstance(value, list):
+            for item in value:
+                self._collect(item, field)
+        elif isinstance(value, str) and field and len(value) <= self.MAX_ENUM_LENGTH:
+            values = self.field_values.setdefault(field, [])
+            if value not in values:
+                values.append(value)
+
+    def compile(self, template: Any, field: str = None) -> Callable[[], Any]:
+        rnd = self.random
+        if isinstance(template, dict):
+            parts = [(key, self.compile(value, key)) for key, value in template.items()]
+            return lambda: {key: make() for key, make in parts}
+        if isinstance(template, list):
+            items = [self.compile(value, field) for value in template]
+            return lambda: [make() for make in items]
+        if isinstance(template, bool) or template is None:
+            return lambda: template
+        if isinstance(template, int):
+            low = int(template * (1 - self.JITTER))
+            high = int(template * (1 + self.JITTER)) if template else 10
+            return lambda: rnd.randint(min(low, high), max(low, high))
+        if isinstance(template, float):
+            text = repr(template)
+            digits = len(text.split('.')[1]) if '.' in text and 'e' not in text else 3
+            return lambda: round(template * rnd.uniform(1 - self.JITTER, 1 + self.JITTER), digits)
+        if isinstance(template, str):
+            if self.TIMESTAMP.fullmatch(template):
+                return lambda: datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+            sequence = self.SEQUENCE.fullmatch(template)
+            if sequence:
+                stem, digits = sequence.groups()
+                counter = [int(digits)]
+
+                def next_id():
+                    counter[0] += 1
+                    return f'{stem}{counter[0]:0{len(digits)}d}'
+                return next_id
+            choices = self.field_values.get(field, [])
+            if len(choices) > 1:
+                return lambda: rnd.choice(choices)
+        return lambda: template
+
+class LoadGenerator:
+    """Publishes every catalogue topic at estMps x multiplier into the broker"""
+
+    def __init__(self, broker: MiniBroker, topics: List[Dict[str, Any]], seed: int = None):
+        self.broker = broker
+        self.topics = topics
+        synthesizer = PayloadSynthesizer(topics, seed)
+        self.factories = [synthesizer.compile(topic.get('template', {})) for topic in topics]
+        self.rates = [float(topic.get('estMps', 0) or 0) for topic in topics]
+        self.credit = [0.0] * len(topics)
+        self.multiplier = 1.0
+        self.sent = 0
+        self.bytes = 0
+
+    @property
+    def target_mps(self) -> float:
+        return sum(self.rates) * self.multiplier
+
+    def tick(self, elapsed: float):
+        """Emit whole messages owed since the last tick; fractions carry over"""
+        for i, rate in enumerate(self.rates):
+            self.credit[i] += rate * self.multiplier * elapsed
+            if self.credit[i] < 1:
+                continue
+            count = int(self.credit[i])
+            self.credit[i] -= count
+            path = self.topics[i]['path']
+            for _ in range(count):
+                payload = json.dumps(self.factories[i](), ensure_ascii=False, separators=(',', ':')).encode()
+                self.broker.publish(path, payload)
+                self.bytes += len(payload)
+            self.sent += count
+
+    async def run(self):
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(TICK_SECONDS)
+            now = time.perf_counter()
+            self.tick(now - last)
+            last = now
+
+def scale_stations(topics: List[Dict[str, Any]], scale: int) -> List[Dict[str, Any]]:
+    """Add scale-1 copies of every station's topics under new station ids (LASER01 -> LASER02...)"""
+    if scale <= 1:
+        return list(topics)
+
+    index = workflow.TopicIndex()
+    for topic in topics:
+        index.add(topic)
+
+    next_number = {}
+    for station in index.stations():
+        prefix, number = re.fullmatch(r'([A-Z]+)(\d+)', station).groups()
+        next_number[prefix] = max(next_number.get(prefix, 0), int(number) + 1)
+
+    scaled = list(topics)
+    for station in index.stations():
+        prefix, number = re.fullmatch(r'([A-Z]+)(\d+)', station).groups()
+        for _ in range(scale - 1):
+            clone_id = f'{prefix}{next_number[prefix]:0{len(number)}d}'
+            next_number[prefix] += 1
+            for topic_id in sorted(index.by_station[station]):
+                topic = index.topics[topic_id]
+                segments = topic['path'].split('/')
+                segments[3] = clone_id
+                template = json.loads(json.dumps(topic.get('template', {})).replace(f'"{station}"', f'"{clone_id}"'))
+                scaled.append({**topic, 'path': '/'.join(segments), 'template': template})
+    return scaled
+
+def load_topics(path: str, station_scale: int) -> List[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        catalogue = json.load(f)
+    topics = [topic for topic in catalogue.get('topics', []) if topic.get('path')]
+    return scale_stations(topics, station_scale)
+
+async def wait_for_subscribers(broker: MiniBroker, count: int):
+    if count <= 0:
+        return
+    print(f"waiting for {count} subscriber(s)...", flush=True)
+    while len(broker.subscribers()) < count:
+        await asyncio.sleep(0.2)
+
+async def run_step(broker: MiniBroker, generator: LoadGenerator, multiplier: float,
+                   seconds: float, lag_bytes: int) -> Dict[str, Any]:
+    """Hold one multiplier for a while and judge whether subscribers kept up"""
+    generator.multiplier = multiplier
+    subscribers = broker.subscribers()
+    start_buffered = {id(s): s.buffered for s in subscribers}
+    start_dropped = sum(s.dropped for s in subscribers)
+    start_delivered = sum(s.delivered for s in subscribers)
+    start_disconnects = broker.disconnects
+    sent, sent_bytes = generator.sent, generator.bytes
+    peak = 0
+
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        await asyncio.sleep(SAMPLE_SECONDS)
+        peak = max([peak] + [s.buffered for s in subscribers])
+    elapsed = time.perf_counter() - started
+
+    # Growing backlog (or losses) means the dashboard reads slower than we publish
+    growing = [s for s in subscribers
+               if s.buffered > lag_bytes and s.buffered > start_buffered.get(id(s), 0)]
+    dropped = sum(s.dropped for s in subscribers) - start_dropped
+    disconnects = broker.disconnects - start_disconnects
+    achieved = (generator.sent - sent) / elapsed
+    return {
+        'multiplier': multiplier,
+        'target_mps': round(generator.target_mps, 2),
+        'achieved_mps': round(achieved, 2),
+        'mbps': round((generator.bytes - sent_bytes) * 8 / elapsed / 1e6, 3),
+        'delivered': sum(s.delivered for s in subscribers) - start_delivered,
+        'peak_buffered': peak,
+        'end_buffered': max([0] + [s.buffered for s in subscribers]),
+        'dropped': dropped,
+        'disconnects': disconnects,
+        # The generator itself could not keep the rate; results above here say nothing about the app
+        'generator_bound': achieved < generator.target_mps * 0.9,
+        'behind': bool(growing) or dropped > 0 or disconnects > 0,
+    }
+
+def _print_step(step: Dict[str, Any]):
+    flag = 'BEHIND' if step['behind'] else ('GEN-BOUND' if step['generator_bound'] else 'ok')
+    print(f"x{step['multiplier']:<8g} {step['target_mps']:>10.1f} {step['achieved_mps']:>10.1f} "
+          f"{step['mbps']:>8.2f} {step['peak_buffered'] / 1024:>10.0f}KB {step['dropped']:>8} {flag:>10}",
+          flush=True)
+
+async def serve(args: argparse.Namespace) -> int:
+    topics = load_topics(args.uns, args.station_scale)
+    broker = MiniBroker(args.host, args.tcp_port, args.ws_port)
+    await broker.start()
+    generator = LoadGenerator(broker, topics, args.seed)
+    generator.multiplier = args.multiplier
+    print(f"{len(topics)} topics, {generator.target_mps:.1f} msg/s", flush=True)
+    try:
+        await generator.run()
+    finally:
+        await broker.stop()
+    return 0
+
+async def replay(args: argparse.Namespace) -> int:
+    """Publish recorded traffic (mqtt-recorder.js) instead of synthesized payloads"""
+    broker = MiniBroker(args.host, args.tcp_port, args.ws_port)
+    await broker.start()
+    try:
+        with CaptureReader(args.capture) as reader:
+            start = reader.parse_time(args.start) if args.start else None
+            end = reader.parse_time(args.end) if args.end else None
+            await wait_for_subscribers(broker, args.subscribers)
+            print(f"replaying {args.capture} at {args.speed:g}x", flush=True)
+
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            sent = 0
+            for due, message in reader.timeline(start, end, args.speed):
+                delay = started + due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif sent % 1000 == 0:
+                    await asyncio.sleep(0)  # unpaced or late: still let clients read
+                broker.publish(message.topic, bytes(message.payload))
+                sent += 1
+            elapsed = loop.time() - started
+            print(f"replayed {sent} messages in {elapsed:.1f}s ({sent / max(elapsed, 1e-9):.0f} msg/s)")
+    finally:
+        await broker.stop()
+    return 0
+
+async def ramp(args: argparse.Namespace) -> int:
+    topics = load_topics(args.uns, args.station_scale)
+    broker = MiniBroker(args.host, args.tcp_port, args.ws_port)
+    await broker.start()
+    generator = LoadGenerator(broker, topics, args.seed)
+    await wait_for_subscribers(broker, args.subscribers)
+
+    runner = asyncio.ensure_future(generator.run())
+    steps = []
+    print(f"{'step':<9} {'target/s':>10} {'sent/s':>10} {'Mbit/s':>8} {'peak buf':>12} {'dropped':>8} {'':>10}")
+    try:
+        multiplier = args.start
+        while multiplier <= args.max:
+            step = await run_step(broker, generator, multiplier, args.step_seconds, args.lag_kb * 1024)
+            steps.append(step)
+            _print_step(step)
+            if step['behind']:
+                break
+            multiplier *= args.factor
+    finally:
+        runner.cancel()
+        await broker.stop()
+
+    sustained = [step for step in steps if not step['behind']]
+    report = {
+        'version': REPORT_VERSION,
+        'created': datetime.now().isoformat(),
+        'uns': os.path.abspath(args.uns),
+        'topics': len(topics),
+        'station_scale': args.station_scale,
+        'step_seconds': args.step_seconds,
+        'max_sustained_multiplier': sustained[-1]['multiplier'] if sustained else None,
+        'max_sustained_mps': sustained[-1]['achieved_mps'] if sustained else None,
+        'fell_behind': len(sustained) < len(steps),
+        'steps': steps,
+    }
+    if report['fell_behind']:
+        print(f"\nfell behind at x{steps[-1]['multiplier']:g}; "
+              f"sustained {report['max_sustained_mps']} msg/s at x{report['max_sustained_multiplier']}")
+    else:
+        print("\nkept up through the whole ramp")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--uns', default=DEFAULT_UNS, help='topic catalogue to replay')
+    common.add_argument('--host', default='127.0.0.1')
+    common.add_argument('--tcp-port', type=int, default=1883)
+    common.add_argument('--ws-port', type=int, default=8083)
+    common.add_argument('--station-scale', type=int, default=1,
+                        help='replicate every station this many times (1 = catalogue as is)')
+    common.add_argument('--seed', type=int, default=None, help='fix payload randomness for repeatable runs')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = sub.add_parser('serve', parents=[common], help='publish at a fixed rate until interrupted')
+    serve_parser.add_argument('--multiplier', type=float, default=1.0)
+
+    ramp_parser = sub.add_parser('ramp', parents=[common], help='raise the rate until subscribers fall behind')
+    ramp_parser.add_argument('--start', type=float, default=1.0)
+    ramp_parser.add_argument('--factor', type=float, default=2.0)
+    ramp_parser.add_argument('--max', type=float, default=4096.0)
+    ramp_parser.add_argument('--step-seconds', type=float, default=10.0)
+    ramp_parser.add_argument('--lag-kb', type=int, default=1024,
+                             help='unsent backlog to one subscriber that counts as falling behind')
+    ramp_parser.add_argument('--subscribers', type=int, default=1,
+                             help='wait for this many subscribed clients before ramping')
+    ramp_parser.add_argument('--output', help='write the ramp report JSON here')
+
+    replay_parser = sub.add_parser('replay', parents=[common], help='publish a recorded .mqcap capture')
+    replay_parser.add_argument('capture')
+    replay_parser.add_argument('--from', dest='start', help='ISO time or +seconds from the first message')
+    replay_parser.add_argument('--to', dest='end', help='ISO time or +seconds from the first message')
+    replay_parser.add_argument('--speed', type=float, default=1.0, help='1 = recorded pace; 0 = as fast as possible')
+    replay_parser.add_argument('--subscribers', type=int, default=1,
+                               help='wait for this many subscribed clients before replaying')
+
+    args = parser.parse_args()
+    try:
+        commands = {'serve': serve, 'ramp': ramp, 'replay': replay}
+        return asyncio.run(commands[args.command](args))
+    except KeyboardInterrupt:
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())